@@ -1,17 +1,40 @@
 #!/usr/bin/env python3
 
 import customtkinter as ctk
-import subprocess
 import time
-import multiprocessing.shared_memory as shm
-import json
-from PIL import Image, ImageTk # ImageTk is included
+from PIL import ImageTk
 from config import (
-    SHM_NAME, SHM_SIZE, TIMEOUT_THRESHOLD,
-    DRONE_IMAGE_PATH, DRONE_GIF_PATH,
-    CARD_WIDTH_SMALL, CARD_HEIGHT_SMALL, FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL,
-    COLORS, COLORS_DARK, COLORS_LIGHT, FONTS, COMMANDS 
+    SHM_NAME, SHM_SIZE, TIMEOUT_THRESHOLD, TELEMETRY_POLL_INTERVAL, GUI_REFRESH_MS,
+    DRONE_IMAGE_PATH, DRONE_GIF_PATH, SWARM_CONFIG_DIR, SWARM_CONFIG_PATTERN,
+    CARD_WIDTH_SMALL, CARD_HEIGHT_SMALL, FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL, TELEMETRY_CARD_HEIGHT,
+    FEED_RESIZE_DEBOUNCE_MS, FEED_REFRESH_MS, LIVE_FEED_MAX_FPS, HISTORY_SECONDS, PLOT_WINDOW_SECONDS, PLOT_REFRESH_MS,
+    MAP_TILE_DIR, MAP_TRAIL_LENGTH, MAP_RING_DISTANCES,
+    COLORS, COLORS_DARK, COLORS_LIGHT, FONTS, COMMANDS, DRONE_COMMAND_TEMPLATE, DRONE_SCRIPT_TEMPLATE
 )
+from telemetry_reader import TelemetryReader
+from swarm_manifest import load_swarm_manifest, command_drone_ids
+from drone_grid import VirtualCardGrid, DroneTable
+from image_cache import frame_cache
+from video_feed import LiveFeedWorker
+from process_control import ProcessExecutor
+from command_bus import CommandRingWriter, BROADCAST
+from frame_bus import attach_segment
+from telemetry_plots import TelemetryHistory, Sparkline, PLOT_FIELDS
+from swarm_map import SwarmTracks, SwarmMapView
+
+TELEMETRY_FIELDS = {
+    "latitude": "Latitude", "longitude": "Longitude", "altitude": "Altitude",
+    "speed": "Speed", "battery": "Battery", "mode": "Flight Mode",
+    "pitch": "Pitch Angle", "roll": "Roll Angle", "yaw": "Yaw Angle"
+}
+DEFAULT_TELEMETRY_TEXTS = {
+    "latitude": "-", "longitude": "-", "altitude": "- m", "speed": "- m/s",
+    "battery": "-%", "mode": "-", "pitch": "-°", "roll": "-°", "yaw": "-°"
+}
+# Compact table mode columns: (key, heading, width)
+TABLE_COLUMNS = [("drone", "Drone", 80), ("status", "Status", 120)] + [
+    (key, name, 90) for key, name in TELEMETRY_FIELDS.items()
+] + [("process", "Last Command", 240)]
 
 class DroneControlCenter:
     def __init__(self):
@@ -29,50 +52,77 @@ class DroneControlCenter:
         self.app.grid_columnconfigure(1, weight=1) # Main content area expands (was column 2)
         self.app.grid_rowconfigure(0, weight=1) # Main row expands
 
-        # State variables
-        self.last_telemetry_update_time = {1: 0.0, 2: 0.0}
-        self.drone_process_commanded_active = {1: False, 2: False}
-        self.is_drone_connected_via_telemetry = {1: False, 2: False}
-
-        # UI element references for dashboard drone cards
-        self.dash_drone1_card_ref = None
-        self.dash_drone2_card_ref = None
-        self.drone1_dashboard_status_light = None
-        self.drone1_dashboard_status_label = None
-        self.drone2_dashboard_status_light = None
-        self.drone2_dashboard_status_label = None
-        self.drone_image_labels = {1: None, 2: None} # For image/GIF display
-
-        # GIF Animation properties
-        self.drone_gif_ctk_frames = {1: [], 2: []} # Store CTkImage objects
-        self.drone_gif_durations = {1: [], 2: []}
-        self.drone_gif_current_frame_index = {1: 0, 2: 0}
-        self.drone_gif_animation_job_id = {1: None, 2: None}
-        self.gif_loaded_successfully = {1: False, 2: False}
-
-        # UI element references for telemetry view
-        self.drone1_telemetry_connection_label = None
-        self.drone2_telemetry_connection_label = None
-        self.drone1_card_ref = None # Telemetry view card
-        self.drone2_card_ref = None # Telemetry view card
-        self.drone1_data = {} # Labels for drone 1 telemetry values
-        self.drone2_data = {} # Labels for drone 2 telemetry values
-
-        self.static_placeholder_ctkimage = None # Initialize as None
+        frame_cache.attach(self.app)
+        # Start/stop shells run on worker threads; step timings come back through process_status
+        self.process_executor = ProcessExecutor()
+        self.process_executor.attach(self.app)
+        self.process_batch = None # Progress of the last Start All / Stop All
+        # Operator commands (hold / land / emergency stop) go straight to the drone controllers
+        try:
+            self.command_ring = CommandRingWriter()
+        except Exception as e:
+            print(f"ERROR: Could not open the command ring: {e}")
+            self.command_ring = None
+        self.command_batch = None # Acknowledgement progress of the last operator command
+        self.command_ack_job_id = None
+
+        # Drones come from the swarm manifest; new IDs seen on the telemetry bus are added at runtime
+        self.swarm_manifest = load_swarm_manifest(SWARM_CONFIG_DIR, SWARM_CONFIG_PATTERN)
+        self.drone_ids = []
+
+        # State variables (keyed by drone id, filled by _register_drone)
+        self.last_telemetry_update_time = {}
+        self.drone_process_commanded_active = {}
+        self.is_drone_connected_via_telemetry = {}
+        self.telemetry_cache = {} # Latest merged telemetry per drone, built from reader diffs
+        self.process_status = {} # Last start/stop job per drone with per-step timings
+        self._widget_config_cache = {} # widget -> last applied configure kwargs
+
+        # GIF Animation properties (frames themselves live in the shared frame_cache)
+        self.drone_gif_current_frame_index = {}
+        self.drone_gif_animation_job_id = {}
+
+        self.current_view = "dashboard"
+        self.plot_job_id = None # Sparkline redraw loop; only scheduled while the plots are on screen
+        self.map_job_id = None # Map redraw loop; only scheduled while the map is on screen
+        self.feed_job_id = None # Live camera feed loop; only scheduled while dashboard cards are on screen
+        self.live_feed = LiveFeedWorker(max_fps=LIVE_FEED_MAX_FPS)
+        self.swarm_tracks = SwarmTracks(trail_length=MAP_TRAIL_LENGTH)
+        self.layout_mode = "cards" # "cards" or "table" (compact mode for large swarms)
+
+        for drone_id in sorted(set(self.swarm_manifest) | command_drone_ids(COMMANDS)):
+            self._register_drone(drone_id, refresh_views=False)
         
         self.setup_ui()
+
+        # Shared memory is mapped and decoded on a background thread; the UI only drains diffs
+        self.telemetry_reader = TelemetryReader(SHM_NAME, SHM_SIZE, interval=TELEMETRY_POLL_INTERVAL)
+        # History is recorded on the reader thread, independent of which view is shown
+        self.telemetry_history = TelemetryHistory(max_points=int(HISTORY_SECONDS / TELEMETRY_POLL_INTERVAL))
+        self.telemetry_reader.add_listener(self.telemetry_history.record)
+        self.telemetry_reader.add_listener(self.swarm_tracks.record)
+        self.telemetry_reader.start()
+        self.live_feed.start()
         self.update_telemetry()
 
-    def _load_static_placeholder_images(self, target_width, target_height):
-        """Pre-loads the static placeholder CTkImage with dynamic sizing."""
-        try:
-            pil_image = Image.open(DRONE_IMAGE_PATH)
-            pil_image_resized = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-            self.static_placeholder_ctkimage = ImageTk.PhotoImage(pil_image_resized)
-            print(f"INFO: Static placeholder image loaded and resized to {target_width}x{target_height}.")
-        except Exception as e:
-            print(f"ERROR: Could not load static placeholder image '{DRONE_IMAGE_PATH}': {e}")
-            self.static_placeholder_ctkimage = None
+    def _register_drone(self, drone_id, refresh_views=True):
+        if drone_id in self.drone_process_commanded_active:
+            return
+        self.drone_ids = sorted(self.drone_ids + [drone_id])
+        self.last_telemetry_update_time[drone_id] = 0.0
+        self.drone_process_commanded_active[drone_id] = False
+        self.is_drone_connected_via_telemetry[drone_id] = False
+        self.telemetry_cache[drone_id] = {}
+        self.process_status[drone_id] = ""
+        self.drone_gif_current_frame_index[drone_id] = 0
+        self.drone_gif_animation_job_id[drone_id] = None
+        if refresh_views:
+            print(f"INFO: Drone {drone_id} discovered on the telemetry bus.")
+            self._refresh_drone_views()
+
+    def _refresh_drone_views(self):
+        for view in (self.dashboard_grid, self.telemetry_grid, self.dashboard_table, self.telemetry_table):
+            view.set_drones(self.drone_ids)
 
     def setup_ui(self):
         # ===== NAVIGATION SIDEBAR (Far Left) =====
@@ -99,9 +149,9 @@ class DroneControlCenter:
 
         self.dashboard_frame = self.create_dashboard(self.main_content_area)
         self.telemetry_frame = self.create_telemetry_display(self.main_content_area)
+        self.map_frame = self.create_map_display(self.main_content_area)
 
         self.show_dashboard()
-        self._load_static_placeholder_images(FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL)
 
     def create_nav_buttons(self, parent_sidebar):
         nav_buttons_frame = ctk.CTkFrame(parent_sidebar, fg_color="transparent")
@@ -109,6 +159,7 @@ class DroneControlCenter:
         nav_buttons = [
             {"text": "Dashboard", "command": self.show_dashboard},
             {"text": "Telemetry", "command": self.show_telemetry},
+            {"text": "Swarm Map", "command": self.show_map},
             {"text": "Settings", "command": lambda: print("Settings clicked")}
         ]
         self.nav_button_refs = [] 
@@ -142,7 +193,9 @@ class DroneControlCenter:
         controls_data = [ # Changed variable name for clarity
             {"text": "Start All", "command": self.start_all, "color_key": "success", "hover_key": "success_hover"},
             {"text": "Stop All", "command": self.stop_all, "color_key": "danger", "hover_key": "danger_hover"},
-            {"text": "Emergency Stop", "command": self.emergency_stop, "color_key": "danger", "hover_key": "danger_hover"}
+            {"text": "Emergency Stop", "command": self.emergency_stop, "color_key": "danger", "hover_key": "danger_hover"},
+            {"text": "Hold All", "command": lambda: self.send_drone_command("Hold All", "hold"), "color_key": "warning", "hover_key": "gray"},
+            {"text": "Resume All", "command": lambda: self.send_drone_command("Resume All", "resume"), "color_key": "warning", "hover_key": "gray"}
         ]
         for ctrl_data in controls_data: # Iterate using new variable name
             btn = ctk.CTkButton(
@@ -151,6 +204,11 @@ class DroneControlCenter:
             )
             btn.pack(fill="x", padx=15, pady=5)
             self.control_buttons_refs.append(btn)
+        self.process_batch_label = ctk.CTkLabel(
+            controls_frame, text="", font=FONTS["small"], text_color=self.colors["text_secondary"],
+            wraplength=180, justify="left"
+        )
+        self.process_batch_label.pack(fill="x", padx=15, pady=(2, 0), anchor="w")
         
         
         self.theme_button = ctk.CTkButton(
@@ -211,167 +269,322 @@ class DroneControlCenter:
         header_content_frame.pack(fill="x", padx=25, pady=(25, 15))
         self.dashboard_header_label = ctk.CTkLabel(header_content_frame, text="Drone Control Panel", font=FONTS["title"],
                                                    text_color=self.colors["text_primary"])
-        self.dashboard_header_label.pack()
-
-        cards_frame = ctk.CTkFrame(frame, fg_color="transparent")
-        cards_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        cards_frame.grid_columnconfigure(0, weight=1)
-        cards_frame.grid_columnconfigure(1, weight=1)
-        cards_frame.grid_rowconfigure(0, weight=1) 
+        self.dashboard_header_label.pack(side="left")
+        self.dashboard_layout_switch = self._create_layout_switch(header_content_frame)
+
+        # Table mode controls act on the selected rows
+        self.dashboard_table_controls = ctk.CTkFrame(frame, fg_color="transparent")
+        self.table_start_button = ctk.CTkButton(
+            self.dashboard_table_controls, text="Start Selected", height=32, font=FONTS["button_small"], corner_radius=6,
+            command=lambda: [self.start_drone(did) for did in self.dashboard_table.selected_ids()],
+            fg_color=self.colors["success"], hover_color=self.colors["success_hover"]
+        )
+        self.table_start_button.pack(side="left", padx=(0, 8))
+        self.table_stop_button = ctk.CTkButton(
+            self.dashboard_table_controls, text="Stop Selected", height=32, font=FONTS["button_small"], corner_radius=6,
+            command=lambda: [self.stop_drone(did) for did in self.dashboard_table.selected_ids()],
+            fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"]
+        )
+        self.table_stop_button.pack(side="left")
+        self.table_hold_button = ctk.CTkButton(
+            self.dashboard_table_controls, text="Hold Selected", height=32, font=FONTS["button_small"], corner_radius=6,
+            command=lambda: [self.send_drone_command(f"Hold {did}", "hold", target=did) for did in self.dashboard_table.selected_ids()],
+            fg_color=self.colors["warning"], hover_color=self.colors["gray"]
+        )
+        self.table_hold_button.pack(side="left", padx=(8, 0))
+        self.table_resume_button = ctk.CTkButton(
+            self.dashboard_table_controls, text="Resume Selected", height=32, font=FONTS["button_small"], corner_radius=6,
+            command=lambda: [self.send_drone_command(f"Resume {did}", "resume", target=did) for did in self.dashboard_table.selected_ids()],
+            fg_color=self.colors["warning"], hover_color=self.colors["gray"]
+        )
+        self.table_resume_button.pack(side="left", padx=(8, 0))
 
-        self.create_drone_card(cards_frame, "DRONE 1", drone_id=1, column_idx=0)
-        self.create_drone_card(cards_frame, "DRONE 2", drone_id=2, column_idx=1)
+        self.dashboard_grid = VirtualCardGrid(
+            frame, self._create_dashboard_card, self._bind_dashboard_card, self._unbind_dashboard_card,
+            card_min_width=CARD_WIDTH_SMALL, card_height=CARD_HEIGHT_SMALL, bg_color=self.colors["dark"]
+        )
+        self.dashboard_grid.pack(fill="both", expand=True, padx=15, pady=10)
+        self.dashboard_table = DroneTable(frame, TABLE_COLUMNS)
+        self.dashboard_table.apply_colors(self.colors, FONTS["small"])
+        self.dashboard_grid.set_drones(self.drone_ids)
+        self.dashboard_table.set_drones(self.drone_ids)
         return frame
 
-    def create_drone_card(self, parent, title_text, drone_id, column_idx):
-        card = ctk.CTkFrame(
+    def _create_layout_switch(self, parent):
+        switch = ctk.CTkSegmentedButton(parent, values=["Cards", "Table"], command=self.set_layout_mode,
+                                        font=FONTS["button_small"])
+        switch.set("Cards")
+        switch.pack(side="right")
+        return switch
+
+    def set_layout_mode(self, value):
+        self.layout_mode = "table" if value == "Table" else "cards"
+        for switch in (self.dashboard_layout_switch, self.telemetry_layout_switch):
+            switch.set(value)
+        for grid, table in ((self.dashboard_grid, self.dashboard_table), (self.telemetry_grid, self.telemetry_table)):
+            if self.layout_mode == "table":
+                grid.pack_forget()
+                table.pack(fill="both", expand=True, padx=25, pady=10)
+            else:
+                table.pack_forget()
+                grid.pack(fill="both", expand=True, padx=15, pady=10)
+        if self.layout_mode == "table":
+            self.dashboard_table_controls.pack(fill="x", padx=25, before=self.dashboard_table)
+        else:
+            self.dashboard_table_controls.pack_forget()
+        self._refresh_all_drone_visuals()
+        self._schedule_plot_updates()
+        self._schedule_live_feeds()
+
+    def _create_dashboard_card(self, parent):
+        card_frame = ctk.CTkFrame(
             parent, fg_color=self.colors["card_bg"], corner_radius=12,
             border_width=2, border_color=self.colors["gray"],
         )
-        card.grid(row=0, column=column_idx, padx=12, pady=12, sticky="nsew")
-        card.grid_propagate(False)
-
-        # Store title label references directly for easier color update
-        title_label_attr = f"drone{drone_id}_card_title_label"
-        title_label = ctk.CTkLabel(card, text=title_text, font=FONTS["subtitle"], text_color=self.colors["accent"])
-        title_label.pack(pady=(12, 8))
-        setattr(self, title_label_attr, title_label)
+        card_frame.pack_propagate(False)
+        card = {"frame": card_frame, "drone_id": None,
+                "feed_size": (FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL), "feed_frames": None, "resize_job": None,
+                "live": False, "live_photo": None}
 
-        if drone_id == 1: self.dash_drone1_card_ref = card
-        else: self.dash_drone2_card_ref = card
+        card["title"] = ctk.CTkLabel(card_frame, text="", font=FONTS["subtitle"], text_color=self.colors["accent"])
+        card["title"].pack(pady=(12, 8))
 
-        feed_frame = ctk.CTkFrame(card, fg_color=self.colors["dark"], corner_radius=8)
+        feed_frame = ctk.CTkFrame(card_frame, fg_color=self.colors["dark"], corner_radius=8)
         feed_frame.pack(pady=(5, 10), padx=10, fill="both", expand=True)
         feed_frame.pack_propagate(False) 
+        card["feed"] = feed_frame
 
-        image_label = ctk.CTkLabel(feed_frame, text="")
-        image_label.pack(expand=True, fill="both")
-        self.drone_image_labels[drone_id] = image_label
+        card["image"] = ctk.CTkLabel(feed_frame, text="")
+        card["image"].pack(expand=True, fill="both")
+        feed_frame.bind("<Configure>", lambda event, c=card: self._on_feed_resize(c, event))
+        # Live feed counters: frames shown vs. frames replaced by a newer one before display
+        card["feed_stats"] = ctk.CTkLabel(feed_frame, text="", font=FONTS["small"], text_color=self.colors["text_secondary"],
+                                          fg_color=self.colors["dark"])
+        card["feed_stats"].place(relx=1.0, rely=1.0, x=-6, y=-4, anchor="se")
 
-        if self.static_placeholder_ctkimage:
-            image_label.configure(image=self.static_placeholder_ctkimage, text="")
-        else:
-            image_label.configure(text="Placeholder N/A", font=FONTS["small"], text_color=self.colors["warning"])
-
-        def resize_image_on_frame_resize(event):
-            if event.width > 0 and event.height > 0:
-                if not self.drone_process_commanded_active[drone_id] or not self.gif_loaded_successfully[drone_id]:
-                    self._load_static_placeholder_images(event.width, event.height)
-                    if self.static_placeholder_ctkimage:
-                        image_label.configure(image=self.static_placeholder_ctkimage, text="")
-                elif self.drone_process_commanded_active[drone_id] and self.gif_loaded_successfully[drone_id]:
-                    if self.drone_gif_ctk_frames[drone_id] and (
-                        event.width != self.drone_gif_ctk_frames[drone_id][0].width() or
-                        event.height != self.drone_gif_ctk_frames[drone_id][0].height()
-                    ):
-                        print(f"INFO: Resizing GIF for Drone {drone_id} to {event.width}x{event.height}")
-                        self._load_gif_frames(drone_id, DRONE_GIF_PATH)
-                        if self.drone_gif_animation_job_id[drone_id]:
-                            self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                            self.drone_gif_animation_job_id[drone_id] = None
-                        self.drone_gif_current_frame_index[drone_id] = 0
-                        self._animate_gif(drone_id)
-        feed_frame.bind("<Configure>", resize_image_on_frame_resize)
-
-        status_display_frame = ctk.CTkFrame(card, fg_color="transparent")
+        status_display_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         status_display_frame.pack(pady=(8, 8))
-        if drone_id == 1:
-            self.drone1_dashboard_status_light, self.drone1_dashboard_status_label = \
-                self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
-        else:
-            self.drone2_dashboard_status_light, self.drone2_dashboard_status_label = \
-                self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
+        card["light"], card["status"] = self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
+        card["process"] = ctk.CTkLabel(card_frame, text="", font=FONTS["small"], text_color=self.colors["text_secondary"],
+                                       wraplength=CARD_WIDTH_SMALL - 40)
+        card["process"].pack(padx=10)
 
-        buttons_control_frame = ctk.CTkFrame(card, fg_color="transparent")
+        buttons_control_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         buttons_control_frame.pack(pady=(8, 12), padx=15, fill="x")
-        start_cmd = self.start_drone1 if drone_id == 1 else self.start_drone2
-        stop_cmd = self.stop_drone1 if drone_id == 1 else self.stop_drone2
-        
-        self.drone_start_buttons = getattr(self, 'drone_start_buttons', {})
-        self.drone_stop_buttons = getattr(self, 'drone_stop_buttons', {})
-
-        start_btn = self.create_control_button(buttons_control_frame, f"Start Drone {drone_id}", start_cmd,
-                                               self.colors["success"], self.colors["success_hover"])
-        self.drone_start_buttons[drone_id] = start_btn
-
-        stop_btn = self.create_control_button(buttons_control_frame, f"Stop Drone {drone_id}", stop_cmd,
-                                             self.colors["danger"], self.colors["danger_hover"])
-        self.drone_stop_buttons[drone_id] = stop_btn
+        card["start"] = self.create_control_button(buttons_control_frame, "Start Drone", lambda c=card: self.start_drone(c["drone_id"]),
+                                                   self.colors["success"], self.colors["success_hover"])
+        card["stop"] = self.create_control_button(buttons_control_frame, "Stop Drone", lambda c=card: self.stop_drone(c["drone_id"]),
+                                                  self.colors["danger"], self.colors["danger_hover"])
         return card
 
-    def _load_gif_frames(self, drone_id, gif_path):
-        image_label_widget = self.drone_image_labels.get(drone_id)
-        if not image_label_widget:
-            print(f"ERROR: No image label widget found for Drone {drone_id} for GIF loading.")
-            self.gif_loaded_successfully[drone_id] = False
+    def _apply_dashboard_card_colors(self, card):
+        self._configure_if_changed(card["title"], text_color=self.colors["accent"])
+        self._configure_if_changed(card["feed"], fg_color=self.colors["dark"])
+        self._configure_if_changed(card["feed_stats"], fg_color=self.colors["dark"], text_color=self.colors["text_secondary"])
+        self._configure_if_changed(card["process"], text_color=self.colors["text_secondary"])
+        self._configure_if_changed(card["frame"], fg_color=self.colors["card_bg"])
+        self._configure_if_changed(card["start"], fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
+        self._configure_if_changed(card["stop"], fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
+
+    def _bind_dashboard_card(self, card, drone_id):
+        card["drone_id"] = drone_id
+        self._configure_if_changed(card["title"], text=f"DRONE {drone_id}")
+        self._configure_if_changed(card["start"], text=f"Start Drone {drone_id}")
+        self._configure_if_changed(card["stop"], text=f"Stop Drone {drone_id}")
+        self._apply_dashboard_card_colors(card)
+        self._refresh_drone_feed(drone_id)
+        self._update_drone_visuals(drone_id)
+
+    def _unbind_dashboard_card(self, card, drone_id):
+        if self.drone_gif_animation_job_id.get(drone_id):
+            self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
+            self.drone_gif_animation_job_id[drone_id] = None
+        card["drone_id"] = None
+        card["live"] = False
+        self._configure_if_changed(card["feed_stats"], text="")
+
+    def _feed_image_path(self, drone_id):
+        return DRONE_GIF_PATH if self.drone_process_commanded_active[drone_id] else DRONE_IMAGE_PATH
+
+    def _refresh_drone_feed(self, drone_id):
+        """Shows the GIF for an active drone or the placeholder on its bound card, at the card's size."""
+        if self.drone_gif_animation_job_id[drone_id]:
+            self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
+            self.drone_gif_animation_job_id[drone_id] = None
+        card = self.dashboard_grid.bound_cards.get(drone_id)
+        if card is None or card["live"]:
+            return # The live camera feed owns the image while frames keep arriving
+
+        path, size = self._feed_image_path(drone_id), card["feed_size"]
+        entry = frame_cache.get(path, size)
+        if entry is None:
+            # Decoded on the cache worker; the current image stays up until the new size is ready
+            frame_cache.request(path, size, lambda photos, durations: self._on_feed_frames_ready(drone_id, path, size))
             return
 
-        current_width = image_label_widget.winfo_width()
-        current_height = image_label_widget.winfo_height()
-        if current_width == 0 or current_height == 0:
-            print(f"WARNING: Image label for Drone {drone_id} has zero dimensions. Using default for GIF.")
-            current_width, current_height = FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL
+        if not entry[0] and path == DRONE_GIF_PATH:
+            entry = frame_cache.get(DRONE_IMAGE_PATH, size) # GIF unavailable: fall back to the placeholder
+            if entry is None:
+                frame_cache.request(DRONE_IMAGE_PATH, size, lambda photos, durations: self._on_feed_frames_ready(drone_id, path, size))
+                return
+        card["feed_frames"] = entry # Keeps the shared PhotoImages alive while this card shows them
+        if not entry[0]:
+            card["image"].configure(image=None, text="Image N/A", font=FONTS["small"], text_color=self.colors["warning"])
+            return
+        self.drone_gif_current_frame_index[drone_id] = 0
+        self._animate_gif(drone_id)
 
-        try:
-            pil_gif = Image.open(gif_path)
-            self.drone_gif_ctk_frames[drone_id] = []
-            self.drone_gif_durations[drone_id] = []
-            for i in range(pil_gif.n_frames):
-                pil_gif.seek(i)
-                pil_frame_copy = pil_gif.copy().convert("RGBA")
-                pil_frame_resized = pil_frame_copy.resize((current_width, current_height), Image.Resampling.LANCZOS)
-                self.drone_gif_ctk_frames[drone_id].append(ImageTk.PhotoImage(pil_frame_resized))
-                self.drone_gif_durations[drone_id].append(pil_gif.info.get('duration', 100))
-            self.gif_loaded_successfully[drone_id] = True
-            print(f"INFO: GIF loaded for Drone {drone_id} ({pil_gif.n_frames} frames) resized to {current_width}x{current_height}.")
-        except Exception as e:
-            print(f"ERROR: Could not load GIF for Drone {drone_id}: {e}")
-            self.gif_loaded_successfully[drone_id] = False
+    def _on_feed_frames_ready(self, drone_id, path, size):
+        card = self.dashboard_grid.bound_cards.get(drone_id)
+        # Ignore results for a card that was re-bound, resized or switched image meanwhile
+        if card is not None and card["feed_size"] == size and self._feed_image_path(drone_id) == path:
+            self._refresh_drone_feed(drone_id)
+
+    def _on_feed_resize(self, card, event):
+        if event.width <= 1 or event.height <= 1:
+            return
+        # Debounced: a window drag fires many <Configure> events, only the last size is decoded
+        if card["resize_job"]:
+            self.app.after_cancel(card["resize_job"])
+        card["resize_job"] = self.app.after(FEED_RESIZE_DEBOUNCE_MS, lambda: self._apply_feed_resize(card, (event.width, event.height)))
+
+    def _apply_feed_resize(self, card, size):
+        card["resize_job"] = None
+        if card["feed_size"] == size:
+            return
+        card["feed_size"] = size
+        if card["drone_id"] is not None:
+            self._refresh_drone_feed(card["drone_id"])
 
     def _animate_gif(self, drone_id):
-        if not self.drone_process_commanded_active[drone_id] or not self.gif_loaded_successfully[drone_id] or not self.drone_gif_ctk_frames[drone_id]:
-            if self.drone_gif_animation_job_id[drone_id]:
-                self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                self.drone_gif_animation_job_id[drone_id] = None
-            image_label_widget = self.drone_image_labels.get(drone_id)
-            if image_label_widget and self.static_placeholder_ctkimage:
-                image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
+        card = self.dashboard_grid.bound_cards.get(drone_id)
+        if card is None or card["live"] or not card["feed_frames"] or not card["feed_frames"][0]:
+            # Card scrolled out of view; the animation restarts when it is bound again
+            self.drone_gif_animation_job_id[drone_id] = None
             return
 
-        idx = self.drone_gif_current_frame_index[drone_id]
-        self.drone_image_labels[drone_id].configure(image=self.drone_gif_ctk_frames[drone_id][idx], text="")
-        self.drone_gif_current_frame_index[drone_id] = (idx + 1) % len(self.drone_gif_ctk_frames[drone_id])
-        duration = self.drone_gif_durations[drone_id][idx] if self.drone_gif_durations[drone_id] and idx < len(self.drone_gif_durations[drone_id]) else 100
+        photos, durations = card["feed_frames"]
+        idx = self.drone_gif_current_frame_index[drone_id] % len(photos)
+        card["image"].configure(image=photos[idx], text="")
+        if len(photos) == 1:
+            self.drone_gif_animation_job_id[drone_id] = None # Static image, nothing to animate
+            return
+        self.drone_gif_current_frame_index[drone_id] = (idx + 1) % len(photos)
+        duration = durations[idx] if idx < len(durations) else 100
         self.drone_gif_animation_job_id[drone_id] = self.app.after(duration, lambda: self._animate_gif(drone_id))
 
-    def _populate_telemetry_card_content(self, card_widget, title_text, drone_id):
-        title_frame = ctk.CTkFrame(card_widget, fg_color="transparent")
+    def _live_feeds_visible(self):
+        return self.current_view == "dashboard" and self.layout_mode == "cards"
+
+    def _schedule_live_feeds(self):
+        if self._live_feeds_visible() and self.feed_job_id is None:
+            self.feed_job_id = self.app.after(0, self._update_live_feeds)
+
+    def _update_live_feeds(self):
+        self.feed_job_id = None
+        if not self._live_feeds_visible():
+            self.live_feed.set_targets({}) # Nothing on screen: the worker stops decoding
+            return
+        cards = self.dashboard_grid.bound_cards
+        self.live_feed.set_targets({drone_id: card["feed_size"] for drone_id, card in cards.items()})
+        for drone_id, card in cards.items():
+            image = self.live_feed.take(drone_id)
+            if image is not None:
+                self._show_live_frame(drone_id, card, image)
+            elif card["live"] and not self.live_feed.is_live(drone_id):
+                print(f"INFO: Live feed of Drone {drone_id} stopped.")
+                card["live"] = False
+                self._configure_if_changed(card["feed_stats"], text="")
+                self._refresh_drone_feed(drone_id) # Back to the GIF / placeholder
+        self.feed_job_id = self.app.after(FEED_REFRESH_MS, self._update_live_feeds)
+
+    def _show_live_frame(self, drone_id, card, image):
+        became_live = not card["live"]
+        if became_live:
+            card["live"] = True
+            if self.drone_gif_animation_job_id[drone_id]:
+                self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
+                self.drone_gif_animation_job_id[drone_id] = None
+        photo = card["live_photo"]
+        if photo is None or (photo.width(), photo.height()) != image.size:
+            photo = card["live_photo"] = ImageTk.PhotoImage(image)
+            card["image"].configure(image=photo, text="")
+        else:
+            photo.paste(image) # Same Tk image updated in place, no new PhotoImage per frame
+            if became_live:
+                card["image"].configure(image=photo, text="")
+        stats = self.live_feed.stats_for(drone_id)
+        self._configure_if_changed(card["feed_stats"], text=f"LIVE  {stats['displayed']} shown / {stats['dropped']} dropped")
+
+    def _create_telemetry_card(self, parent):
+        card_frame = ctk.CTkFrame(parent, corner_radius=12, fg_color=self.colors["card_bg"],
+                                  border_color=self.colors["gray"], border_width=2)
+        card_frame.pack_propagate(False)
+        card = {"frame": card_frame, "drone_id": None}
+
+        title_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         title_frame.pack(pady=(15, 10), fill="x", padx=20)
-        
-        # Store references for easier color updates
-        title_label_attr = f"drone{drone_id}_telemetry_title_label"
-        conn_label_attr = f"drone{drone_id}_telemetry_connection_label"
 
-        title_label = ctk.CTkLabel(title_frame, text=title_text, font=FONTS["subtitle"], text_color=self.colors["accent"])
-        title_label.pack(side="left")
-        setattr(self, title_label_attr, title_label)
+        card["title"] = ctk.CTkLabel(title_frame, text="", font=FONTS["subtitle"], text_color=self.colors["accent"])
+        card["title"].pack(side="left")
         
-        conn_label = ctk.CTkLabel(title_frame, text="Status: UNKNOWN", font=FONTS["small"], text_color=self.colors["gray"])
-        conn_label.pack(side="right", padx=(0, 5))
-        setattr(self, conn_label_attr, conn_label)
+        card["connection"] = ctk.CTkLabel(title_frame, text="Status: UNKNOWN", font=FONTS["small"], text_color=self.colors["gray"])
+        card["connection"].pack(side="right", padx=(0, 5))
         
-        data_rows_frame = ctk.CTkFrame(card_widget, fg_color="transparent")
-        data_rows_frame.pack(fill="both", expand=True, pady=(5, 15), padx=20)
-        telemetry_fields = {
-            "latitude": "Latitude", "longitude": "Longitude", "altitude": "Altitude",
-            "speed": "Speed", "battery": "Battery", "mode": "Flight Mode",
-            "pitch": "Pitch Angle", "roll": "Roll Angle", "yaw": "Yaw Angle"
-        }
-        current_data_dict = {}
-        for key, display_name in telemetry_fields.items():
-            current_data_dict[key] = self.create_telemetry_row(data_rows_frame, display_name, "-")
-        if drone_id == 1: self.drone1_data = current_data_dict
-        else: self.drone2_data = current_data_dict
+        data_rows_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
+        data_rows_frame.pack(fill="x", pady=(5, 5), padx=20)
+        card["data"] = {}
+        card["row_names"] = []
+        for key, display_name in TELEMETRY_FIELDS.items():
+            name_label, value_label = self.create_telemetry_row(data_rows_frame, display_name, "-")
+            card["row_names"].append(name_label)
+            card["data"][key] = value_label
+
+        plots_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
+        plots_frame.pack(fill="both", expand=True, pady=(0, 15), padx=20)
+        card["plots"] = {}
+        for field, (_, label, unit, fixed_range) in PLOT_FIELDS.items():
+            plot = Sparkline(plots_frame, label, unit=unit, fixed_range=fixed_range, height=40, bg=self.colors["card_bg"])
+            plot.pack(fill="x", pady=2)
+            card["plots"][field] = plot
+        return card
+
+    def _apply_plot_colors(self, card):
+        if card.get("plot_theme") != self.current_theme:
+            for plot in card["plots"].values():
+                plot.apply_colors(self.colors)
+            card["plot_theme"] = self.current_theme
+
+    def _bind_telemetry_card(self, card, drone_id):
+        card["drone_id"] = drone_id
+        self._configure_if_changed(card["title"], text=f"Drone {drone_id} Telemetry", text_color=self.colors["accent"])
+        self._configure_if_changed(card["frame"], fg_color=self.colors["card_bg"])
+        for name_label in card["row_names"]:
+            self._configure_if_changed(name_label, text_color=self.colors["text_secondary"])
+        self._apply_plot_colors(card)
+        for plot in card["plots"].values():
+            plot.clear() # Drawn for the new drone on the next plot tick
+        self._update_drone_visuals(drone_id)
+
+    def _unbind_telemetry_card(self, card, drone_id):
+        card["drone_id"] = None
+
+    def _plots_visible(self):
+        return self.current_view == "telemetry" and self.layout_mode == "cards"
+
+    def _schedule_plot_updates(self):
+        if self.plot_job_id is None and self._plots_visible():
+            self.plot_job_id = self.app.after(0, self._update_plots)
+
+    def _update_plots(self):
+        self.plot_job_id = None
+        if not self._plots_visible():
+            return # Hidden: stop redrawing until the Telemetry card view is shown again
+        now = time.time()
+        for drone_id, card in self.telemetry_grid.bound_cards.items():
+            for field, plot in card["plots"].items():
+                plot.draw(self.telemetry_history.series(drone_id, field), now, PLOT_WINDOW_SECONDS)
+        self.plot_job_id = self.app.after(PLOT_REFRESH_MS, self._update_plots)
 
     def create_telemetry_display(self, parent_frame):
         frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
@@ -379,42 +592,73 @@ class DroneControlCenter:
         header.pack(fill="x", padx=25, pady=(25, 15))
         self.telemetry_header_label = ctk.CTkLabel(header, text="Live Drone Telemetry", font=FONTS["title"], text_color=self.colors["text_primary"])
         self.telemetry_header_label.pack(side="left")
+        self.telemetry_layout_switch = self._create_layout_switch(header)
         
-        cards_frame = ctk.CTkFrame(frame, fg_color="transparent")
-        cards_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        cards_frame.grid_columnconfigure(0, weight=1)
-        cards_frame.grid_columnconfigure(1, weight=1)
-        cards_frame.grid_rowconfigure(0, weight=1)
-
-        self.drone1_card_ref = ctk.CTkFrame(cards_frame, corner_radius=12, fg_color=self.colors["card_bg"],
-                                            border_color=self.colors["gray"], border_width=2)
-        self.drone1_card_ref.grid(row=0, column=0, padx=12, pady=12, sticky="nsew")
-        self.drone1_card_ref.grid_propagate(False)
-        self._populate_telemetry_card_content(self.drone1_card_ref, "Drone 1 Telemetry", drone_id=1)
-
-        self.drone2_card_ref = ctk.CTkFrame(cards_frame, corner_radius=12, fg_color=self.colors["card_bg"],
-                                            border_color=self.colors["gray"], border_width=2)
-        self.drone2_card_ref.grid(row=0, column=1, padx=12, pady=12, sticky="nsew")
-        self.drone2_card_ref.grid_propagate(False)
-        self._populate_telemetry_card_content(self.drone2_card_ref, "Drone 2 Telemetry", drone_id=2)
+        self.telemetry_grid = VirtualCardGrid(
+            frame, self._create_telemetry_card, self._bind_telemetry_card, self._unbind_telemetry_card,
+            card_min_width=CARD_WIDTH_SMALL, card_height=TELEMETRY_CARD_HEIGHT, bg_color=self.colors["dark"]
+        )
+        self.telemetry_grid.pack(fill="both", expand=True, padx=15, pady=10)
+        self.telemetry_table = DroneTable(frame, TABLE_COLUMNS)
+        self.telemetry_table.apply_colors(self.colors, FONTS["small"])
+        self.telemetry_grid.set_drones(self.drone_ids)
+        self.telemetry_table.set_drones(self.drone_ids)
         return frame
 
     def create_telemetry_row(self, parent, label, value):
         row_frame = ctk.CTkFrame(parent, fg_color="transparent", height=30)
         row_frame.pack(fill="x", padx=5, pady=3)
-        ctk.CTkLabel(row_frame, text=f"{label}:", font=FONTS["body"], text_color=self.colors["text_secondary"],
-                     width=130, anchor="w").pack(side="left", padx=(0,8))
+        name_label = ctk.CTkLabel(row_frame, text=f"{label}:", font=FONTS["body"], text_color=self.colors["text_secondary"],
+                                  width=130, anchor="w")
+        name_label.pack(side="left", padx=(0,8))
         value_label = ctk.CTkLabel(row_frame, text=value, font=FONTS["body"], text_color=self.colors["text_primary"], anchor="w")
         value_label.pack(side="left", expand=True, fill="x")
-        return value_label
+        return name_label, value_label
+
+    def create_map_display(self, parent_frame):
+        frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
+        header = ctk.CTkFrame(frame, fg_color="transparent")
+        header.pack(fill="x", padx=25, pady=(25, 15))
+        self.map_header_label = ctk.CTkLabel(header, text="Swarm Map", font=FONTS["title"], text_color=self.colors["text_primary"])
+        self.map_header_label.pack(side="left")
+        self.map_fit_button = ctk.CTkButton(header, text="Fit Swarm", width=110, height=32, font=FONTS["button_small"],
+                                            fg_color=self.colors["secondary"], hover_color=self.colors["tertiary"],
+                                            text_color=self.colors["accent"], corner_radius=6, command=lambda: self.swarm_map.fit())
+        self.map_fit_button.pack(side="right")
+
+        self.swarm_map = SwarmMapView(frame, self.swarm_tracks, self.colors, ring_distances=MAP_RING_DISTANCES,
+                                      tile_dir=MAP_TILE_DIR)
+        self.swarm_map.pack(fill="both", expand=True, padx=25, pady=(0, 25))
+        return frame
+
+    def _show_view(self, name):
+        views = {"dashboard": self.dashboard_frame, "telemetry": self.telemetry_frame, "map": self.map_frame}
+        for view_name, view_frame in views.items():
+            if view_name != name:
+                view_frame.pack_forget()
+        views[name].pack(fill="both", expand=True)
+        self.current_view = name
+        self._refresh_all_drone_visuals()
+        self._schedule_plot_updates()
+        self._schedule_live_feeds()
+        if name == "map" and self.map_job_id is None:
+            self.map_job_id = self.app.after(0, self._update_map)
 
     def show_dashboard(self):
-        self.telemetry_frame.pack_forget()
-        self.dashboard_frame.pack(fill="both", expand=True)
+        self._show_view("dashboard")
 
     def show_telemetry(self):
-        self.dashboard_frame.pack_forget()
-        self.telemetry_frame.pack(fill="both", expand=True)
+        self._show_view("telemetry")
+
+    def show_map(self):
+        self._show_view("map")
+
+    def _update_map(self):
+        self.map_job_id = None
+        if self.current_view != "map":
+            return # Hidden: tracks keep recording on the reader thread, nothing is drawn
+        self.swarm_map.refresh()
+        self.map_job_id = self.app.after(GUI_REFRESH_MS, self._update_map)
 
     def toggle_theme(self):
         if self.current_theme == "dark":
@@ -443,6 +687,7 @@ class DroneControlCenter:
         
         if hasattr(self, 'system_controls_title_label'): # Check if label exists
             self.system_controls_title_label.configure(text_color=self.colors["text_secondary"])
+        self.process_batch_label.configure(text_color=self.colors["text_secondary"])
 
         for i, btn in enumerate(self.control_buttons_refs):
             # Assuming specific order for Start All, Stop All, Emergency Stop
@@ -450,6 +695,8 @@ class DroneControlCenter:
                 btn.configure(fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
             elif i == 1 or i == 2: # Stop All, Emergency Stop
                 btn.configure(fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
+            else: # Hold All, Resume All
+                btn.configure(fg_color=self.colors["warning"], hover_color=self.colors["gray"])
         
         self.theme_button.configure(fg_color=self.colors["secondary"], hover_color=self.colors["tertiary"], text_color=self.colors["accent"])
         
@@ -463,275 +710,320 @@ class DroneControlCenter:
 
         self.exit_button.configure(fg_color=self.colors["dark"], hover_color=self.colors["danger_hover"], border_color=self.colors["secondary"])
 
-        
-
         self.dashboard_header_label.configure(text_color=self.colors["text_primary"])
-        
-        for i in [1, 2]:
-            dash_card = getattr(self, f"dash_drone{i}_card_ref", None)
-            dash_title = getattr(self, f"drone{i}_card_title_label", None)
-            if dash_card: dash_card.configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
-            if dash_title: dash_title.configure(text_color=self.colors["accent"])
-
-            # Update feed frame background and placeholder text color
-            if self.drone_image_labels[i]:
-                feed_frame = self.drone_image_labels[i].master # Get parent CTkFrame
-                if isinstance(feed_frame, ctk.CTkFrame): # Ensure it's the feed_frame
-                    feed_frame.configure(fg_color=self.colors["dark"])
-                # Check if placeholder text needs color update
-                if self.drone_image_labels[i].cget("image") == "" and "Placeholder N/A" in self.drone_image_labels[i].cget("text"):
-                    self.drone_image_labels[i].configure(text_color=self.colors["warning"])
-
-            start_btn = self.drone_start_buttons.get(i)
-            stop_btn = self.drone_stop_buttons.get(i)
-            if start_btn: start_btn.configure(fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
-            if stop_btn: stop_btn.configure(fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
-
         self.telemetry_header_label.configure(text_color=self.colors["text_primary"])
-        for i in [1, 2]:
-            tel_card = getattr(self, f"drone{i}_card_ref", None) # Telemetry view card
-            tel_title = getattr(self, f"drone{i}_telemetry_title_label", None)
-            tel_conn = getattr(self, f"drone{i}_telemetry_connection_label", None)
-            if tel_card:
-                tel_card.configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
-                self._update_telemetry_row_colors(tel_card)
-            if tel_title: tel_title.configure(text_color=self.colors["accent"])
-            # Connection label color is updated in _update_telemetry_card_visuals
-        
-        self._update_telemetry_card_visuals(1, self.drone1_data if self.is_drone_connected_via_telemetry[1] else {}) 
-        self._update_telemetry_card_visuals(2, self.drone2_data if self.is_drone_connected_via_telemetry[2] else {})
-
-    def _update_telemetry_row_colors(self, card_widget):
-        for child_frame in card_widget.winfo_children():
-            if isinstance(child_frame, ctk.CTkFrame) and child_frame.cget("fg_color") == "transparent": 
-                for row_frame in child_frame.winfo_children():
-                    if isinstance(row_frame, ctk.CTkFrame) and row_frame.cget("fg_color") == "transparent":
-                        labels_in_row = row_frame.winfo_children()
-                        if len(labels_in_row) >= 1 and isinstance(labels_in_row[0], ctk.CTkLabel) and labels_in_row[0].cget("text").endswith(":"):
-                            labels_in_row[0].configure(text_color=self.colors["text_secondary"])
-                        if len(labels_in_row) >= 2 and isinstance(labels_in_row[1], ctk.CTkLabel):
-                             # Value color is primarily handled by update_telemetry_data_labels/clear
-                            if labels_in_row[1].cget("text") == "-" or labels_in_row[1].cget("text").startswith("-"):
-                                labels_in_row[1].configure(text_color=self.colors["text_primary"])
-
-
-    def handle_drone_process_command(self, drone_id, start_process):
+        self.map_header_label.configure(text_color=self.colors["text_primary"])
+        self.map_fit_button.configure(fg_color=self.colors["secondary"], hover_color=self.colors["tertiary"], text_color=self.colors["accent"])
+        self.swarm_map.apply_colors(self.colors)
+        self.table_start_button.configure(fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
+        self.table_stop_button.configure(fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
+        for btn in (self.table_hold_button, self.table_resume_button):
+            btn.configure(fg_color=self.colors["warning"], hover_color=self.colors["gray"])
+
+        # Only bound cards are recoloured here; pooled cards pick up the theme when they are bound again
+        for grid in (self.dashboard_grid, self.telemetry_grid):
+            grid.set_background(self.colors["dark"])
+        for card in self.dashboard_grid.bound_cards.values():
+            self._apply_dashboard_card_colors(card)
+        for card in self.telemetry_grid.bound_cards.values():
+            self._configure_if_changed(card["title"], text_color=self.colors["accent"])
+            self._configure_if_changed(card["frame"], fg_color=self.colors["card_bg"])
+            for name_label in card["row_names"]:
+                self._configure_if_changed(name_label, text_color=self.colors["text_secondary"])
+            self._apply_plot_colors(card)
+        for table in (self.dashboard_table, self.telemetry_table):
+            table.apply_colors(self.colors, FONTS["small"])
+
+        self._refresh_all_drone_visuals()
+
+    def _drone_command(self, drone_id):
+        command = COMMANDS.get(f"drone{drone_id}")
+        if command:
+            return command
+        entry = self.swarm_manifest.get(drone_id, {})
+        script = entry.get("script") or DRONE_SCRIPT_TEMPLATE.format(id=drone_id)
+        return DRONE_COMMAND_TEMPLATE.format(id=drone_id, pose_y=(drone_id - 1) * 5, script=script)
+
+    def _drone_stop_steps(self, drone_id):
+        return [
+            ("kill sim", f"tmux kill-session -t drone{drone_id}_session 2>/dev/null"),
+            ("kill controller", f"tmux kill-session -t drone{drone_id}_py 2>/dev/null"),
+        ]
+
+    def handle_drone_process_command(self, drone_id, start_process, delay=0.0):
+        """Updates the drone state right away and runs the shell steps on the process executor."""
+        if drone_id not in self.drone_process_commanded_active:
+            return None
         self.drone_process_commanded_active[drone_id] = start_process
         if not start_process: self.is_drone_connected_via_telemetry[drone_id] = False
         self.last_telemetry_update_time[drone_id] = 0.0 
 
         if start_process:
             print(f"Attempting to start Drone {drone_id} processes...")
-            command_key = f"drone{drone_id}" # Simplified command key
-            subprocess.Popen(COMMANDS[command_key], shell=True, text=True)
-
-            current_width = self.drone_image_labels[drone_id].winfo_width()
-            current_height = self.drone_image_labels[drone_id].winfo_height()
-            if not self.gif_loaded_successfully[drone_id] or (
-                current_width > 0 and current_height > 0 and (
-                (self.drone_gif_ctk_frames[drone_id] and \
-                (current_width != self.drone_gif_ctk_frames[drone_id][0].width() or \
-                 current_height != self.drone_gif_ctk_frames[drone_id][0].height())) or \
-                 not self.drone_gif_ctk_frames[drone_id] 
-                )
-            ):
-                self._load_gif_frames(drone_id, DRONE_GIF_PATH)
-            
-            if self.gif_loaded_successfully[drone_id]:
-                self.drone_gif_current_frame_index[drone_id] = 0
-                if self.drone_gif_animation_job_id[drone_id]:
-                    self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                self._animate_gif(drone_id)
-            else:
-                image_label_widget = self.drone_image_labels.get(drone_id)
-                if image_label_widget:
-                    if self.static_placeholder_ctkimage:
-                        image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
-                    else:
-                        image_label_widget.configure(text="Image N/A", image=None)
+            name, steps = "Start", [("bring-up", self._drone_command(drone_id))]
         else: 
             print(f"Attempting to stop Drone {drone_id} processes...")
-            subprocess.call(f"tmux kill-session -t drone{drone_id}_session 2>/dev/null", shell=True)
-            subprocess.call(f"tmux kill-session -t drone{drone_id}_py 2>/dev/null", shell=True)
-
-            if self.drone_gif_animation_job_id[drone_id]:
-                self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                self.drone_gif_animation_job_id[drone_id] = None
-            
-            image_label_widget = self.drone_image_labels.get(drone_id)
-            if image_label_widget:
-                if self.static_placeholder_ctkimage:
-                    image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
-                else:
-                    image_label_widget.configure(text="Image Stopped", image=None)
+            name, steps = "Stop", self._drone_stop_steps(drone_id)
+        # A new job for this drone cancels the previous one, e.g. a stop during the 50 s bring-up sleep
+        job = self.process_executor.submit(drone_id, name, steps, delay=delay,
+                                           on_step=self._on_process_step, on_done=self._on_process_done)
+        self._set_process_status(drone_id, f"{name}: waiting {delay:.0f}s" if delay > 0 else f"{name}: running")
+        self._refresh_drone_feed(drone_id)
         self._update_telemetry_card_visuals(drone_id, {}) 
-
-    def start_drone1(self): self.handle_drone_process_command(1, True)
-    def stop_drone1(self): self.handle_drone_process_command(1, False)
-    def start_drone2(self): self.handle_drone_process_command(2, True)
-    def stop_drone2(self): self.handle_drone_process_command(2, False)
-
-    def start_qgc(self):
+        return job
+
+    def _set_process_status(self, drone_id, text):
+        self.process_status[drone_id] = text
+        self._update_drone_visuals(drone_id)
+
+    def _on_process_step(self, job):
+        if job.key in self.process_status:
+            self._set_process_status(job.key, job.summary() + " …")
+
+    def _on_process_done(self, job):
+        elapsed = job.finished - job.started
+        if job.key in self.process_status:
+            self._set_process_status(job.key, f"{job.summary()} (total {elapsed:.2f}s)")
+            print(f"INFO: Drone {job.key} {job.summary()} (total {elapsed:.2f}s)")
+        batch = self.process_batch
+        if batch and job.key in batch["pending"] and job.future is batch["jobs"].get(job.key):
+            batch["pending"].discard(job.key)
+            self._update_process_batch_label()
+
+    def _start_process_batch(self, name, jobs):
+        jobs = {job.key: job.future for job in jobs if job is not None}
+        self.process_batch = {"name": name, "jobs": jobs, "pending": set(jobs), "started": time.time()}
+        self._update_process_batch_label()
+
+    def _update_process_batch_label(self):
+        batch = self.process_batch
+        done = len(batch["jobs"]) - len(batch["pending"])
+        text = f"{batch['name']}: {done}/{len(batch['jobs'])} done"
+        if not batch["pending"]:
+            text += f" in {time.time() - batch['started']:.2f}s"
+        self._configure_if_changed(self.process_batch_label, text=text, text_color=self.colors["text_secondary"])
+
+    def start_drone(self, drone_id): return self.handle_drone_process_command(drone_id, True)
+    def stop_drone(self, drone_id): return self.handle_drone_process_command(drone_id, False)
+
+    def start_qgc(self, delay=0.0):
         print("Launching QGroundControl...")
-        subprocess.Popen(COMMANDS["qgc"], shell=True, text=True)
+        return self.process_executor.submit("qgc", "Launch QGC", [("launch", COMMANDS["qgc"])], delay=delay)
 
     def start_all(self):
         print("Starting all systems...")
-        self.start_drone1()
-        self.app.after(2000, self.start_drone2) 
-        self.app.after(7000, self.start_qgc) 
+        # Drone starts are staggered by 2 s; QGC follows 5 s after the last one. Delays run on the executor.
+        jobs = [self.handle_drone_process_command(drone_id, True, delay=2.0 * index)
+                for index, drone_id in enumerate(self.drone_ids)]
+        self.start_qgc(delay=2.0 * max(len(self.drone_ids) - 1, 0) + 5.0)
+        self._start_process_batch("Start All", jobs)
 
     def stop_all(self):
         print("Stopping all drone systems...")
-        self.stop_drone1()
-        self.stop_drone2()
+        # Every drone's teardown is submitted at once and runs in parallel
+        jobs = [self.stop_drone(drone_id) for drone_id in self.drone_ids]
+        self._start_process_batch("Stop All", jobs)
 
     def emergency_stop(self):
         print("EMERGENCY STOP ACTIVE!")
-        self.stop_all()
-
-    def read_shared_memory(self):
+        # Broadcast on the command ring: every controller stops and lands on its next tick.
+        # Processes are left running so the landing can complete; use Stop All to tear them down.
+        self.send_drone_command("Emergency Stop", "emergency_stop")
+
+    def send_drone_command(self, name, command, target=BROADCAST, **params):
+        """Writes one command to the ring and tracks acknowledgements in the sidebar."""
+        if self.command_ring is None:
+            print(f"ERROR: Command ring unavailable, '{command}' not sent.")
+            return None
         try:
-            telemetry_shm = shm.SharedMemory(name=SHM_NAME, create=False, size=SHM_SIZE)
-            raw_bytes = bytearray(telemetry_shm.buf)
-            try: null_index = raw_bytes.index(0) 
-            except ValueError: null_index = len(raw_bytes) # Read all if no null byte
-            decoded_str = raw_bytes[:null_index].decode('utf-8', errors='ignore').rstrip('\x00')
-            telemetry_shm.close()
-            return json.loads(decoded_str) if decoded_str.strip() else {}
-        except FileNotFoundError: return None
-        except json.JSONDecodeError: return None
-        except Exception: return None
+            seq = self.command_ring.send(command, target=target, **params)
+        except ValueError as e:
+            print(f"ERROR: Could not send '{command}': {e}")
+            return None
+        if target == BROADCAST:
+            # Only drones with live telemetry are expected to answer
+            targets = [did for did in self.drone_ids if self.is_drone_connected_via_telemetry[did]]
+        else:
+            targets = [target]
+        print(f"INFO: Sent '{command}' (seq {seq}) to {'all drones' if target == BROADCAST else f'Drone {target}'}.")
+        self.command_batch = {"name": name, "seq": seq, "targets": targets, "pending": set(targets), "started": time.time()}
+        if self.command_ack_job_id is None:
+            self.command_ack_job_id = self.app.after(0, self._poll_command_acks)
+        return seq
+
+    def _poll_command_acks(self, timeout=5.0):
+        self.command_ack_job_id = None
+        batch = self.command_batch
+        normal, warning = self.colors["text_secondary"], self.colors["warning"]
+        if not batch["targets"]:
+            # Broadcast with no connected drone: nothing will acknowledge it
+            self._configure_if_changed(self.process_batch_label, text=f"{batch['name']}: no drone received the command",
+                                       text_color=warning)
+            print(f"WARNING: {batch['name']}: no connected drone received the command.")
+            return
+        batch["pending"] = {did for did in batch["pending"] if not self.command_ring.acked(batch["seq"], did)}
+        elapsed = time.time() - batch["started"]
+        acked = len(batch["targets"]) - len(batch["pending"])
+        text = f"{batch['name']}: {acked}/{len(batch['targets'])} acked"
+        if not batch["pending"]:
+            self._configure_if_changed(self.process_batch_label, text=f"{text} in {elapsed * 1000:.0f} ms",
+                                       text_color=normal)
+            return
+        if elapsed > timeout:
+            missing = ", ".join(str(did) for did in sorted(batch["pending"]))
+            self._configure_if_changed(self.process_batch_label, text=f"{text}, no ack from {missing}",
+                                       text_color=warning)
+            print(f"WARNING: {batch['name']}: no acknowledgement from Drone(s) {missing}.")
+            return
+        self._configure_if_changed(self.process_batch_label, text=text, text_color=normal)
+        self.command_ack_job_id = self.app.after(GUI_REFRESH_MS, self._poll_command_acks)
+
+    def _configure_if_changed(self, widget, **kwargs):
+        """Calls widget.configure only when the requested options differ from the last applied ones."""
+        if widget is None:
+            return
+        last = self._widget_config_cache.get(widget)
+        if last == kwargs:
+            return
+        widget.configure(**kwargs)
+        self._widget_config_cache[widget] = kwargs
+
+    def _format_telemetry_texts(self, telemetry):
+        telemetry = telemetry if isinstance(telemetry, dict) else {}
+        lat_text = f"{telemetry.get('latitude', 0.0):.6f}" if isinstance(telemetry.get('latitude'), (float, int)) else "-"
+        lon_text = f"{telemetry.get('longitude', 0.0):.6f}" if isinstance(telemetry.get('longitude'), (float, int)) else "-"
+        alt_raw = telemetry.get('absolute_altitude', telemetry.get('altitude', "-")) 
+        alt_text = f"{alt_raw:.2f} m" if isinstance(alt_raw, (float, int)) else f"{alt_raw} m"
+
+        speed_val = telemetry.get('speed', '-') 
+        speed_text = f"{speed_val:.2f} m/s" if isinstance(speed_val, (float, int)) else f"{speed_val} m/s"
+
+        battery_val = telemetry.get('battery_percent', None) 
+        battery_text = "-%"
+        if isinstance(battery_val, (float, int)) and battery_val is not None: battery_text = f"{battery_val:.0f}%"
+        elif battery_val is not None and str(battery_val).replace('.', '', 1).isdigit(): battery_text = f"{float(battery_val):.0f}%"
+        elif battery_val is not None: battery_text = str(battery_val)
+
+        texts = {
+            "latitude": lat_text, "longitude": lon_text, "altitude": alt_text,
+            "speed": speed_text, "battery": battery_text, "mode": f"{telemetry.get('flight_mode', '-')}"
+        }
+        for key in ("pitch", "roll", "yaw"):
+            val = telemetry.get(key, '-')
+            texts[key] = f"{val:.2f}°" if isinstance(val, (float, int)) else f"{val}°"
+        return texts
 
     # Telemetry data display keys are corrected in this version
     def update_telemetry_data_labels(self, card_data_labels, telemetry):
-        telemetry = telemetry if isinstance(telemetry, dict) else {}
         if card_data_labels:
-            lat_text = f"{telemetry.get('latitude', 0.0):.6f}" if isinstance(telemetry.get('latitude'), (float, int)) else "-"
-            lon_text = f"{telemetry.get('longitude', 0.0):.6f}" if isinstance(telemetry.get('longitude'), (float, int)) else "-"
-            alt_raw = telemetry.get('absolute_altitude', telemetry.get('altitude', "-")) 
-            alt_text = f"{alt_raw:.2f} m" if isinstance(alt_raw, (float, int)) else f"{alt_raw} m"
-
-            card_data_labels.get("latitude").configure(text=lat_text, text_color=self.colors["text_primary"])
-            card_data_labels.get("longitude").configure(text=lon_text, text_color=self.colors["text_primary"])
-            card_data_labels.get("altitude").configure(text=alt_text, text_color=self.colors["text_primary"])
-            
-            speed_val = telemetry.get('speed', '-') 
-            speed_text = f"{speed_val:.2f} m/s" if isinstance(speed_val, (float, int)) else f"{speed_val} m/s"
-            card_data_labels.get("speed").configure(text=speed_text, text_color=self.colors["text_primary"])
-            
-            battery_val = telemetry.get('battery_percent', None) 
-            battery_text = "-%"
-            if isinstance(battery_val, (float, int)) and battery_val is not None: battery_text = f"{battery_val:.0f}%"
-            elif battery_val is not None and str(battery_val).replace('.', '', 1).isdigit(): battery_text = f"{float(battery_val):.0f}%"
-            elif battery_val is not None: battery_text = str(battery_val)
-            card_data_labels.get("battery").configure(text=battery_text, text_color=self.colors["text_primary"])
-
-            card_data_labels.get("mode").configure(text=f"{telemetry.get('flight_mode', '-')}", text_color=self.colors["text_primary"])
-            
-            pitch_val = telemetry.get('pitch', '-') 
-            pitch_text = f"{pitch_val:.2f}°" if isinstance(pitch_val, (float, int)) else f"{pitch_val}°"
-            card_data_labels.get("pitch").configure(text=pitch_text, text_color=self.colors["text_primary"])
-
-            roll_val = telemetry.get('roll', '-') 
-            roll_text = f"{roll_val:.2f}°" if isinstance(roll_val, (float, int)) else f"{roll_val}°"
-            card_data_labels.get("roll").configure(text=roll_text, text_color=self.colors["text_primary"])
-
-            yaw_val = telemetry.get('yaw', '-') 
-            yaw_text = f"{yaw_val:.2f}°" if isinstance(yaw_val, (float, int)) else f"{yaw_val}°"
-            card_data_labels.get("yaw").configure(text=yaw_text, text_color=self.colors["text_primary"])
+            for key, text in self._format_telemetry_texts(telemetry).items():
+                self._configure_if_changed(card_data_labels.get(key), text=text, text_color=self.colors["text_primary"])
 
     def _clear_telemetry_data_labels(self, card_data_labels):
         if card_data_labels:
-            default_texts = {
-                "latitude": "-", "longitude": "-", "altitude": "- m", "speed": "- m/s",
-                "battery": "-%", "mode": "-", "pitch": "-°", "roll": "-°", "yaw": "-°"
-            }
             for key, label_widget in card_data_labels.items():
                 if label_widget and isinstance(label_widget, ctk.CTkLabel):
-                    label_widget.configure(text=default_texts.get(key, "-"), text_color=self.colors["text_primary"])
+                    self._configure_if_changed(label_widget, text=DEFAULT_TELEMETRY_TEXTS.get(key, "-"), text_color=self.colors["text_primary"])
+
+    def _drone_status(self, drone_id):
+        """Returns (status_text, light_color_key, text_color_key, border_color_key) for one drone."""
+        if self.drone_process_commanded_active[drone_id]:
+            if self.is_drone_connected_via_telemetry[drone_id]:
+                return "ACTIVE", "success", "success", "success"
+            return "AWAITING DATA", "warning", "warning", "warning"
+        return "DISCONNECTED", "disconnected", "text_secondary", "gray"
 
     def _update_telemetry_card_visuals(self, drone_id, current_telemetry_data):
-        dash_light_ref, dash_label_ref = (self.drone1_dashboard_status_light, self.drone1_dashboard_status_label) if drone_id == 1 else \
-                                 (self.drone2_dashboard_status_light, self.drone2_dashboard_status_label)
-        
-        tel_view_card_widget = getattr(self, f"drone{drone_id}_card_ref", None)
-        tel_conn_label_widget = getattr(self, f"drone{drone_id}_telemetry_connection_label", None)
-        dashboard_card_widget = getattr(self, f"dash_drone{drone_id}_card_ref", None)
-        current_data_labels_dict = getattr(self, f"drone{drone_id}_data", {})
+        """Updates whichever widgets are currently showing this drone (visible cards or table rows)."""
+        status_text, light_color_key, text_color_key, border_color_key = self._drone_status(drone_id)
+        show_data = self.drone_process_commanded_active[drone_id] and self.is_drone_connected_via_telemetry[drone_id]
+
+        if self.layout_mode == "table":
+            table = self.dashboard_table if self.current_view == "dashboard" else self.telemetry_table
+            values = self._format_telemetry_texts(current_telemetry_data) if show_data else dict(DEFAULT_TELEMETRY_TEXTS)
+            values["drone"] = f"Drone {drone_id}"
+            values["status"] = status_text
+            values["process"] = self.process_status[drone_id] or "-"
+            table.update_row(drone_id, values)
+            return
 
-        status_text, light_color_key, text_color_key, border_color_key = "INACTIVE", "gray", "text_secondary", "gray"
+        if self.current_view == "dashboard":
+            card = self.dashboard_grid.bound_cards.get(drone_id)
+            if card:
+                self._configure_if_changed(card["light"], text_color=self.colors.get(light_color_key, self.colors["gray"]))
+                self._configure_if_changed(card["status"], text=status_text.upper(), text_color=self.colors.get(text_color_key, self.colors["text_secondary"]))
+                self._configure_if_changed(card["frame"], border_color=self.colors.get(border_color_key, self.colors["gray"]))
+                self._configure_if_changed(card["process"], text=self.process_status[drone_id])
+            return
 
+        card = self.telemetry_grid.bound_cards.get(drone_id)
+        if not card:
+            return
+        self._configure_if_changed(card["frame"], border_color=self.colors.get(border_color_key, self.colors["gray"]))
+        conn_disp_text = "Status: DISCONNECTED"
+        conn_disp_color = self.colors["text_secondary"]
         if self.drone_process_commanded_active[drone_id]:
-            if self.is_drone_connected_via_telemetry[drone_id]:
-                status_text, light_color_key, text_color_key, border_color_key = "ACTIVE", "success", "success", "success"
-            else: 
-                status_text, light_color_key, text_color_key, border_color_key = "AWAITING DATA", "warning", "warning", "warning"
-        else: 
-            status_text, light_color_key, text_color_key, border_color_key = "DISCONNECTED", "disconnected", "text_secondary", "gray"
-            
-        if dash_light_ref: dash_light_ref.configure(text_color=self.colors.get(light_color_key, self.colors["gray"]))
-        if dash_label_ref: dash_label_ref.configure(text=status_text.upper(), text_color=self.colors.get(text_color_key, self.colors["text_secondary"]))
-        if dashboard_card_widget: dashboard_card_widget.configure(border_color=self.colors.get(border_color_key, self.colors["gray"]))
-        if tel_view_card_widget: tel_view_card_widget.configure(border_color=self.colors.get(border_color_key, self.colors["gray"]))
-        
-        if tel_conn_label_widget:
-            conn_disp_text = "Status: DISCONNECTED"
-            conn_disp_color = self.colors["text_secondary"]
-            if self.drone_process_commanded_active[drone_id]:
-                conn_disp_text = "Status: CONNECTED" if self.is_drone_connected_via_telemetry[drone_id] else "Status: NO TELEMETRY"
-                conn_disp_color = self.colors["success"] if self.is_drone_connected_via_telemetry[drone_id] else self.colors["warning"]
-            tel_conn_label_widget.configure(text=conn_disp_text, text_color=conn_disp_color)
-
-        if self.drone_process_commanded_active[drone_id] and self.is_drone_connected_via_telemetry[drone_id]:
-            self.update_telemetry_data_labels(current_data_labels_dict, current_telemetry_data)
+            conn_disp_text = "Status: CONNECTED" if self.is_drone_connected_via_telemetry[drone_id] else "Status: NO TELEMETRY"
+            conn_disp_color = self.colors["success"] if self.is_drone_connected_via_telemetry[drone_id] else self.colors["warning"]
+        self._configure_if_changed(card["connection"], text=conn_disp_text, text_color=conn_disp_color)
+
+        if show_data:
+            self.update_telemetry_data_labels(card["data"], current_telemetry_data)
         else:
-            self._clear_telemetry_data_labels(current_data_labels_dict)
+            self._clear_telemetry_data_labels(card["data"])
+
+    def _update_drone_visuals(self, drone_id):
+        connected = self.is_drone_connected_via_telemetry[drone_id]
+        self._update_telemetry_card_visuals(drone_id, self.telemetry_cache[drone_id] if connected else {})
+
+    def _refresh_all_drone_visuals(self):
+        for drone_id in self.drone_ids:
+            self._update_drone_visuals(drone_id)
 
     def update_telemetry(self):
-        shared_data = self.read_shared_memory()
+        diffs, present_ids, _ = self.telemetry_reader.drain()
         now = time.time()
-        data_received_this_cycle = {1: False, 2: False}
-
-        if shared_data:
-            for drone_id_str, telemetry_content in shared_data.items():
-                try:
-                    drone_id = int(drone_id_str)
-                    if drone_id in [1, 2]:
-                        if self.drone_process_commanded_active[drone_id]: # Only process if active
-                            self.is_drone_connected_via_telemetry[drone_id] = True 
-                            self.last_telemetry_update_time[drone_id] = now
-                            # Pass the actual telemetry content for this drone
-                            self._update_telemetry_card_visuals(drone_id, telemetry_content) 
-                        data_received_this_cycle[drone_id] = True # Mark data was present in SHM
-                except ValueError:
-                    print(f"Invalid drone_id format in shared memory: {drone_id_str}")
-
-        for did in [1, 2]:
+
+        for drone_id in present_ids - set(self.drone_process_commanded_active):
+            self._register_drone(drone_id)
+        for drone_id, diff in diffs.items():
+            if drone_id in self.telemetry_cache:
+                self.telemetry_cache[drone_id].update(diff)
+
+        for did in self.drone_ids:
             if self.drone_process_commanded_active[did]:
-                # If active, but no data received for it in this cycle from SHM
-                if not data_received_this_cycle[did] and self.is_drone_connected_via_telemetry[did]: 
-                    # And if it was previously connected and timeout exceeded
+                if did in present_ids: # Only process if active
+                    was_connected = self.is_drone_connected_via_telemetry[did]
+                    self.is_drone_connected_via_telemetry[did] = True
+                    self.last_telemetry_update_time[did] = now
+                    # Labels are only touched when this drone's fields changed or its status flipped
+                    if did in diffs or not was_connected:
+                        self._update_telemetry_card_visuals(did, self.telemetry_cache[did])
+                elif self.is_drone_connected_via_telemetry[did]:
+                    # Previously connected and timeout exceeded
                     if (now - self.last_telemetry_update_time[did] > TIMEOUT_THRESHOLD):
                         print(f"Drone {did} telemetry timed out.")
                         self.is_drone_connected_via_telemetry[did] = False
                         self._update_telemetry_card_visuals(did, {}) # Update visuals to show timeout
-                # If active but not connected (e.g. awaiting first data, or already timed out)
-                elif not self.is_drone_connected_via_telemetry[did]:
-                     self._update_telemetry_card_visuals(did, {}) # Ensure visuals reflect "AWAITING" or "NO TELEMETRY"
-            else: # If drone is not commanded to be active
-                if self.is_drone_connected_via_telemetry[did]: # If it was somehow marked connected, correct it
-                    self.is_drone_connected_via_telemetry[did] = False
+            elif self.is_drone_connected_via_telemetry[did]: # If it was somehow marked connected, correct it
+                self.is_drone_connected_via_telemetry[did] = False
                 self._update_telemetry_card_visuals(did, {}) # Update visuals to "DISCONNECTED"
-            
-        self.app.after(500, self.update_telemetry)
+
+        self.app.after(GUI_REFRESH_MS, self.update_telemetry)
 
     def run(self):
-        self.app.mainloop()
+        try:
+            self.app.mainloop()
+        finally:
+            self.telemetry_reader.stop()
+            self.live_feed.stop()
+            self.process_executor.shutdown()
+            if self.command_ring is not None:
+                self.command_ring.close()
 
 if __name__ == "__main__":
     try:
-        existing_shm = shm.SharedMemory(name=SHM_NAME, create=False, size=SHM_SIZE)
+        existing_shm = attach_segment(SHM_NAME)  # A plain attach would unlink it when the GUI exits
         existing_shm.close()
         print(f"INFO: Shared memory '{SHM_NAME}' found.")
     except FileNotFoundError:
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+import fcntl
+import json
+import os
+import struct
+import tempfile
+import time
+import multiprocessing.shared_memory as shm
+
+# Shared-memory command ring: the reverse direction of the telemetry bus.
+# Operators (GUI / swarm_command.py) append messages, every drone controller
+# reads the ones addressed to it (or broadcast) each tick and acknowledges the
+# last sequence number it handled in its own ack slot.
+
+COMMAND_RING_NAME = "swarm_commands"
+COMMAND_RING_SLOTS = 64
+COMMAND_SLOT_SIZE = 256
+MAX_DRONES = 64  # Ack slots; drone ids must be 1..MAX_DRONES-1
+BROADCAST = 0
+
+COMMANDS = ("hold", "resume", "land", "emergency_stop", "set_target_distance", "set_mode")
+
+_MAGIC = b"SWMCMDS\x00"
+_RING_HEADER = struct.Struct("<8sIIQ")  # magic, slot_count, slot_size, published message count
+_RING_HEADER_SIZE = 64
+_COUNT_OFFSET = 16
+_ACK = struct.Struct("<Qd16s")  # last handled seq + 1 (0 = none), ack time, status
+_ACK_SIZE = 32
+_SLOT_HEADER = struct.Struct("<Qid24sI")  # seqlock, target, timestamp, command, params_len
+_SLOT_HEADER_SIZE = 48
+_ACKS_OFFSET = _RING_HEADER_SIZE
+_SLOTS_OFFSET = _ACKS_OFFSET + MAX_DRONES * _ACK_SIZE
+_LOCK_PATH = os.path.join(tempfile.gettempdir(), f"{COMMAND_RING_NAME}.lock")
+
+
+def open_command_ring(name=COMMAND_RING_NAME):
+    """
+    Attaches to the command ring, creating it if no one has yet. The segment is
+    never unlinked by a client exiting, so drones and operators can restart freely.
+    """
+    total = _SLOTS_OFFSET + COMMAND_RING_SLOTS * COMMAND_SLOT_SIZE
+    with open(_LOCK_PATH, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)  # Serialises create-vs-attach between processes
+        try:
+            segment = shm.SharedMemory(name=name, create=True, size=total)
+            segment.buf[:total] = b"\x00" * total
+            _RING_HEADER.pack_into(segment.buf, 0, _MAGIC, COMMAND_RING_SLOTS, COMMAND_SLOT_SIZE, 0)
+        except FileExistsError:
+            segment = shm.SharedMemory(name=name, create=False)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+    magic, slot_count, slot_size, _ = _RING_HEADER.unpack_from(segment.buf, 0)
+    if magic != _MAGIC or slot_count != COMMAND_RING_SLOTS or slot_size != COMMAND_SLOT_SIZE:
+        segment.close()
+        raise ValueError(f"'{name}' is not a command ring with the expected layout")
+    return segment
+
+
+class _CommandRing:
+    def __init__(self, name=COMMAND_RING_NAME):
+        self.segment = open_command_ring(name)
+        self.buf = self.segment.buf
+
+    def published_count(self):
+        return struct.unpack_from("<Q", self.buf, _COUNT_OFFSET)[0]
+
+    def _slot_offset(self, n):
+        return _SLOTS_OFFSET + (n % COMMAND_RING_SLOTS) * COMMAND_SLOT_SIZE
+
+    def ack_of(self, drone_id):
+        """Returns (last handled seq or -1, ack time, status) for drone_id."""
+        next_seq, timestamp, status = _ACK.unpack_from(self.buf, _ACKS_OFFSET + int(drone_id) * _ACK_SIZE)
+        return next_seq - 1, timestamp, status.rstrip(b"\x00").decode("ascii", "replace")
+
+    def close(self):
+        self.buf = None
+        self.segment.close()
+
+
+class CommandRingWriter(_CommandRing):
+    """Operator side. Several writers (GUI, CLI) may send at once; appends are serialised with a file lock."""
+
+    def send(self, command, target=BROADCAST, **params):
+        """Appends one message and returns its sequence number."""
+        if command not in COMMANDS:
+            raise ValueError(f"unknown command '{command}'")
+        if not 0 <= int(target) < MAX_DRONES:
+            raise ValueError(f"drone id {target} out of range")
+        payload = json.dumps(params).encode("utf-8")
+        if len(payload) > COMMAND_SLOT_SIZE - _SLOT_HEADER_SIZE:
+            raise ValueError("command parameters too large")
+        with open(_LOCK_PATH, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            n = self.published_count()
+            offset = self._slot_offset(n)
+            struct.pack_into("<Q", self.buf, offset, 2 * n + 1)  # Odd: slot is being written
+            _SLOT_HEADER.pack_into(self.buf, offset, 2 * n + 1, int(target), time.time(),
+                                   command.encode("ascii"), len(payload))
+            start = offset + _SLOT_HEADER_SIZE
+            self.buf[start:start + len(payload)] = payload
+            struct.pack_into("<Q", self.buf, offset, 2 * n + 2)  # Even: slot complete
+            struct.pack_into("<Q", self.buf, _COUNT_OFFSET, n + 1)
+        return n
+
+    def acked(self, seq, drone_id):
+        return self.ack_of(drone_id)[0] >= seq
+
+    def wait_for_acks(self, seq, drone_ids, timeout=2.0, interval=0.01):
+        """Blocks until every drone in drone_ids acked seq or timeout. Returns the ids still pending."""
+        pending = set(drone_ids)
+        deadline = time.time() + timeout
+        while pending and time.time() < deadline:
+            pending = {did for did in pending if not self.acked(seq, did)}
+            if pending:
+                time.sleep(interval)
+        return pending
+
+
+class CommandRingReader(_CommandRing):
+    """
+    Drone side. Starts at the current end of the ring, so commands sent before
+    the controller came up (e.g. an old emergency stop) are never replayed.
+    """
+
+    def __init__(self, drone_id, name=COMMAND_RING_NAME):
+        super().__init__(name)
+        self.drone_id = int(drone_id)
+        if not 0 < self.drone_id < MAX_DRONES:
+            self.close()
+            raise ValueError(f"drone id {drone_id} out of range")
+        self.next_seq = self.published_count()
+        self.missed = 0
+
+    def _read(self, n):
+        offset = self._slot_offset(n)
+        lock, target, timestamp, command, params_len = _SLOT_HEADER.unpack_from(self.buf, offset)
+        if lock != 2 * n + 2:
+            return None
+        start = offset + _SLOT_HEADER_SIZE
+        payload = bytes(self.buf[start:start + params_len])
+        if struct.unpack_from("<Q", self.buf, offset)[0] != 2 * n + 2:
+            return None  # Overwritten while copying
+        return {"seq": n, "target": target, "timestamp": timestamp,
+                "command": command.rstrip(b"\x00").decode("ascii"), "params": json.loads(payload or b"{}")}
+
+    def poll(self):
+        """Returns the new messages addressed to this drone or broadcast, oldest first."""
+        count = self.published_count()
+        if count <= self.next_seq:
+            return []
+        first = max(self.next_seq, count - COMMAND_RING_SLOTS)
+        self.missed += first - self.next_seq
+        messages = []
+        for n in range(first, count):
+            message = self._read(n)
+            if message is None:
+                self.missed += 1
+            elif message["target"] in (BROADCAST, self.drone_id):
+                messages.append(message)
+        self.next_seq = count
+        return messages
+
+    def ack(self, seq, status="ok"):
+        _ACK.pack_into(self.buf, _ACKS_OFFSET + self.drone_id * _ACK_SIZE, seq + 1, time.time(),
+                       status.encode("ascii", "replace")[:16])
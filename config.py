@@ -11,15 +11,31 @@ ctk.set_default_color_theme("blue") # default theme
 SHM_NAME = "telemetry_shared"
 SHM_SIZE = 4096
 TIMEOUT_THRESHOLD = 3 
+TELEMETRY_POLL_INTERVAL = 0.05 # seconds between shared memory polls in the reader thread
+GUI_REFRESH_MS = 50 # UI telemetry refresh period (20 Hz)
+HISTORY_SECONDS = 300 # Telemetry history kept per drone for the trend plots
+PLOT_WINDOW_SECONDS = 180 # Time span shown by each sparkline
+PLOT_REFRESH_MS = 100 # Sparkline redraw period while the Telemetry view is visible
+MAP_TRAIL_LENGTH = 300 # Trail points kept per drone on the swarm map
+MAP_RING_DISTANCES = (10, 15) # Escape / target distance rings drawn around each drone (m)
+MAP_TILE_DIR = None # Optional offline slippy-map tiles laid out as {z}/{x}/{y}.png
 
 DRONE_IMAGE_PATH = "/home/arda/Masaüstü/SP-494/Flight_not_started.png"
 DRONE_GIF_PATH = "/home/arda/Masaüstü/SP-494/Drone.gif"
 
+# Swarm manifest: every drone*_config.ini in this directory adds a drone card
+SWARM_CONFIG_DIR = "~/Masaüstü/SP-494"
+SWARM_CONFIG_PATTERN = "drone*_config.ini"
+
 # Card Size
 CARD_WIDTH_SMALL = 300 
 CARD_HEIGHT_SMALL = 380 
 FEED_WIDTH_SMALL = CARD_WIDTH_SMALL - 40 
 FEED_HEIGHT_SMALL = 150 
+TELEMETRY_CARD_HEIGHT = 600 # Telemetry rows plus the trend sparklines
+FEED_RESIZE_DEBOUNCE_MS = 150 # Wait for the window to settle before re-scaling feed images
+FEED_REFRESH_MS = 66 # Live camera feed: how often the dashboard takes the newest decoded frame
+LIVE_FEED_MAX_FPS = 15 # Upper bound on frames decoded per drone; older frames are dropped
 
 COLORS_DARK = {
     "primary": "#1E1E2E",      
@@ -138,3 +154,16 @@ COMMANDS = {
         tmux new-session -d -s drone1_py "python3 /home/arda/Masaüstü/SP-494/drone2.py"
     """
 } 
+
+# Start command for manifest drones without a "droneN" entry in COMMANDS.
+# {script} is the manifest "Script" key, defaulting to DRONE_SCRIPT_TEMPLATE.
+DRONE_SCRIPT_TEMPLATE = "/home/arda/Masaüstü/SP-494/drone{id}.py"
+DRONE_COMMAND_TEMPLATE = """
+    cd ~/PX4-Autopilot || exit 1;
+    export LIBGL_ALWAYS_SOFTWARE=1;
+    tmux kill-session -t drone{id}_session 2>/dev/null;
+    tmux new-session -d -s drone{id}_session "export LIBGL_ALWAYS_SOFTWARE=1; cd ~/PX4-Autopilot; HEADLESS=1 PX4_SYS_AUTOSTART=4001 PX4_SIM_MODEL=gz_x500_mono_cam PX4_GZ_MODEL_POSE='0,{pose_y}' ./build/px4_sitl_default/bin/px4 -i {id}";
+    sleep 50;
+    tmux kill-session -t drone{id}_py 2>/dev/null;
+    tmux new-session -d -s drone{id}_py "python3 {script}"
+"""
@@ -1,67 +1,82 @@
 #!/bin/bash
 
-# Parallel run of Sena_bash01.py and Sena_bash02.py with frame extraction and inference
+# Recording of both drones (one video_logger.py process) followed by inference
+#
+# Usage: ./double_eye.sh [offline|stream]
+#   offline (default): record AVIs, then segment them (frames decoded directly from the videos)
+#   stream:            loggers hand sampled frames to a segmentation worker over shared
+#                      memory during the flight; no frame extraction, results as they come
+
+MODE="${1:-offline}"
+STREAM_IDLE_EXIT=15         # Worker exits this many seconds after the last streamed frame
+ANALYSIS_FPS="${ANALYSIS_FPS:-2}"
 
 PYTHON_CMD=$(command -v python3 || command -v python)
-FFMPEG_CMD=$(command -v ffmpeg)
 
-if [ -z "$PYTHON_CMD" ]; then
-  echo "[ERROR] Python3 is not installed or not in PATH."
+if [ "$MODE" != "offline" ] && [ "$MODE" != "stream" ]; then
+  echo "[ERROR] Unknown mode: $MODE (expected offline or stream)"
   exit 1
 fi
 
-if [ -z "$FFMPEG_CMD" ]; then
-  echo "[ERROR] ffmpeg is not installed or not in PATH."
+if [ -z "$PYTHON_CMD" ]; then
+  echo "[ERROR] Python3 is not installed or not in PATH."
   exit 1
 fi
 
-SCRIPT_PATH_1="./start_video_logger1.py"
+LOGGER_SCRIPT="./video_logger.py"
+LOGGER_DRONES="1 2"
 OUTPUT_VIDEO_1="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_1.avi"
-FRAMES_DIR_1="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_1_frames"
 DETECT_OUTPUT_1="/home/eren/Desktop/Video_Output_Detect_01"
 
-SCRIPT_PATH_2="./start_video_logger2.py"
 OUTPUT_VIDEO_2="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_2.avi"
-FRAMES_DIR_2="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_2_frames"
 DETECT_OUTPUT_2="/home/eren/Desktop/Video_Output_Detect_02"
 
 MODEL_INFER_SCRIPT="./model_inference.py"
+FINAL_SCRIPT="/home/arda/Masaüstü/SP-494/segment_and_detect_agriculture.py"
+DETECT_OUTPUT_ROOT="/home/arda/Masaüstü/SP-494/Video_Output"
 
 # Check scripts
-if [ ! -f "$SCRIPT_PATH_1" ]; then
-  echo "[ERROR] $SCRIPT_PATH_1 not found."
+if [ ! -f "$LOGGER_SCRIPT" ]; then
+  echo "[ERROR] $LOGGER_SCRIPT not found."
   exit 1
 fi
 
-if [ ! -f "$SCRIPT_PATH_2" ]; then
-  echo "[ERROR] $SCRIPT_PATH_2 not found."
-  exit 1
+# Streaming mode: start the segmentation worker first so it is attached when frames arrive
+if [ "$MODE" = "stream" ]; then
+  if [ ! -f "$FINAL_SCRIPT" ]; then
+    echo "[ERROR] $FINAL_SCRIPT not found."
+    exit 1
+  fi
+  echo "[INFO] Starting streaming segmentation worker..."
+  $PYTHON_CMD "$FINAL_SCRIPT" --stream 1 2 --output-root "$DETECT_OUTPUT_ROOT" --idle-exit "$STREAM_IDLE_EXIT" &
+  WORKER_PID=$!
+  trap 'kill -INT $WORKER_PID 2>/dev/null' EXIT  # Never leave the worker behind if a logger fails
+  export SWARMIND_STREAM=1
+  export SWARMIND_ANALYSIS_FPS="$ANALYSIS_FPS"
 fi
 
-# Run both scripts in parallel
-echo "[INFO] Starting Sena_bash01.py and Sena_bash02.py in parallel..."
-$PYTHON_CMD "$SCRIPT_PATH_1" &
-PID1=$!
-$PYTHON_CMD "$SCRIPT_PATH_2" &
-PID2=$!
-
-wait $PID1
-EXIT_CODE_1=$?
-wait $PID2
-EXIT_CODE_2=$?
-
-if [ $EXIT_CODE_1 -ne 0 ]; then
-  echo "[ERROR] start_video_logger1.py exited with status $EXIT_CODE_1"
-  exit $EXIT_CODE_1
+# One logger process records every drone (encoding shares a thread pool)
+echo "[INFO] Starting video logger for drones $LOGGER_DRONES..."
+$PYTHON_CMD "$LOGGER_SCRIPT" --drones $LOGGER_DRONES
+EXIT_CODE=$?
+
+if [ $EXIT_CODE -ne 0 ]; then
+  echo "[ERROR] video_logger.py exited with status $EXIT_CODE"
+  exit $EXIT_CODE
 else
-  echo "[INFO] start_video_logger1.py finished successfully."
+  echo "[INFO] video_logger.py finished successfully."
 fi
 
-if [ $EXIT_CODE_2 -ne 0 ]; then
-  echo "[ERROR] start_video_logger2.py exited with status $EXIT_CODE_2"
-  exit $EXIT_CODE_2
-else
-  echo "[INFO] Sena_bash02.py finished successfully."
+if [ "$MODE" = "stream" ]; then
+  echo "[INFO] Loggers finished, waiting for the segmentation worker to drain its streams..."
+  wait $WORKER_PID
+  EXIT_CODE=$?
+  if [ $EXIT_CODE -ne 0 ]; then
+    echo "[ERROR] Streaming segmentation exited with status $EXIT_CODE"
+    exit $EXIT_CODE
+  fi
+  echo "[INFO] All processes completed successfully."
+  exit 0
 fi
 
 # Check output videos
@@ -74,33 +89,12 @@ if [ ! -f "$OUTPUT_VIDEO_2" ]; then
   exit 1
 fi
 
-# Extract frames from both videos
-for i in 1 2; do
-  FRAMES_DIR_VAR="FRAMES_DIR_$i"
-  OUTPUT_VIDEO_VAR="OUTPUT_VIDEO_$i"
-  echo "[INFO] Extracting frames from video to: ${!FRAMES_DIR_VAR}"
-  if [ -d "${!FRAMES_DIR_VAR}" ]; then
-    echo "[INFO] Frames directory exists, clearing old frames..."
-    rm -f "${!FRAMES_DIR_VAR}"/*
-  else
-    mkdir -p "${!FRAMES_DIR_VAR}"
-  fi
-
-  $FFMPEG_CMD -i "${!OUTPUT_VIDEO_VAR}" -vf fps=30 "${!FRAMES_DIR_VAR}/frame_%06d.png"
-  if [ $? -eq 0 ]; then
-    echo "[INFO] Frame extraction for video $i completed successfully."
-  else
-    echo "[ERROR] Frame extraction for video $i failed."
-    exit 1
-  fi
-done
-
+# Frames are decoded straight from the videos by the segmentation script (no PNG extraction)
 
 # Run the final script
-FINAL_SCRIPT="/home/arda/Masaüstü/SP-494/segment_and_detect_agriculture.py"
 if [ -f "$FINAL_SCRIPT" ]; then
   echo "[INFO] Starting SENA.py..."
-  $PYTHON_CMD "$FINAL_SCRIPT"
+  $PYTHON_CMD "$FINAL_SCRIPT" --input "$OUTPUT_VIDEO_1" "$OUTPUT_VIDEO_2" --output-root "$DETECT_OUTPUT_ROOT"
   EXIT_CODE=$?
   if [ $EXIT_CODE -ne 0 ]; then
     echo "[ERROR] SENA.py exited with status $EXIT_CODE"
@@ -9,6 +9,7 @@ from mavsdk.offboard import VelocityNedYaw
 import os
 import math
 from datetime import datetime
+from command_bus import CommandRingReader
 
 GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
 SHM_NAME = "telemetry_shared"
@@ -87,15 +88,95 @@ async def telemetry_collector(drone, drone_id, telemetry_shm):
         publisher()
     )
 
+async def handle_command(drone, message, mode, target_distance, escape_distance, yaw):
+    """
+    Applies one operator command. Returns (mode, target_distance, ack status).
+    Modes: "flocking", "hold" (zero velocity until resume), "landed", "stopped" (emergency).
+    emergency_stop is handled by the controller itself (see emergency_land).
+    """
+    command, params = message["command"], message["params"]
+    if command == "hold" or (command == "set_mode" and params.get("mode") == "hold"):
+        if mode in ("landed", "stopped"):
+            return mode, target_distance, "rejected"
+        await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, yaw))
+        return "hold", target_distance, "hold"
+    if command == "resume" or (command == "set_mode" and params.get("mode") == "flocking"):
+        if mode in ("landed", "stopped"):
+            return mode, target_distance, "rejected"
+        return "flocking", target_distance, "flocking"
+    if command == "land":
+        await drone.action.land()
+        return "landed", target_distance, "landed"
+    if command == "set_target_distance":
+        try:
+            value = float(params.get("value"))
+        except (TypeError, ValueError):
+            return mode, target_distance, "rejected"
+        if value <= escape_distance + 1:  # The separation band must stay between escape and target
+            return mode, target_distance, "rejected"
+        return mode, value, "ok"
+    return mode, target_distance, "unknown"
+
+async def emergency_land(drone, yaw, attempts=3):
+    """
+    Zero velocity, then land; a failed land is retried with the offboard mode
+    stopped first (escalation). Returns True once MAVSDK accepted the land.
+    """
+    try:
+        await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, yaw))
+    except Exception as e:
+        print(f"{RED}[Emergency] Velocity could not be zeroed: {e}{ENDC}")
+    for attempt in range(attempts):
+        try:
+            if attempt > 0:
+                await drone.offboard.stop()
+            await drone.action.land()
+            return True
+        except Exception as e:
+            print(f"{RED}[Emergency] Land attempt {attempt + 1} failed: {e}{ENDC}")
+            await asyncio.sleep(0.5)
+    return False
+
 async def flocking_controller(drone_id, drone, telemetry_shm):
     ESCAPE_DISTANCE = 10
-    TARGET_DISTANCE = 15   # Fixed distance target (cohesion)
+    TARGET_DISTANCE = 15   # Fixed distance target (cohesion), can be changed at runtime
     COHESION_SPEED = 1.2   # Cohesion/constant distance approach speed
     ESCAPE_SPEED = 3.5     # Evasion speed 
     NORMAL_SPEED = 0.8     # Free flight speed
 
+    commands = CommandRingReader(int(drone_id))
+    mode = "flocking"
+    last_yaw = 0.0
+    land_pending = False
+
     while True:
         try:
+            # Operator commands are handled first so an emergency stop takes effect within one tick.
+            # Every message gets its own try: a failing command is acked as an error and never
+            # takes the rest of the batch with it.
+            for message in commands.poll():
+                if message["command"] == "emergency_stop":
+                    mode = "stopped"  # Before any MAVSDK call: a failure must not leave the drone flocking
+                    land_pending = not await emergency_land(drone, last_yaw)
+                    status = "stop_error" if land_pending else "stopped"
+                else:
+                    try:
+                        mode, TARGET_DISTANCE, status = await handle_command(
+                            drone, message, mode, TARGET_DISTANCE, ESCAPE_DISTANCE, last_yaw)
+                    except Exception as e:
+                        status = "error"
+                        print(f"{RED}[Command] {message['command']} failed: {e}{ENDC}")
+                commands.ack(message["seq"], status)
+                print(f"{YELLOW}[Command] {message['command']} {message['params']} -> {status}{ENDC}")
+            if land_pending:
+                # Retried every tick until the land goes through
+                land_pending = not await emergency_land(drone, last_yaw, attempts=1)
+                if not land_pending:
+                    print(f"{YELLOW}[Emergency] Land accepted after retrying.{ENDC}")
+            if mode != "flocking":
+                await asyncio.sleep(0.05)
+                continue
+
             # Read from SHM
             for _ in range(3):
                 try:
@@ -116,6 +197,7 @@ async def flocking_controller(drone_id, drone, telemetry_shm):
                 continue
 
             my_lat, my_lon, my_yaw = my.get("latitude"), my.get("longitude"), my.get("yaw")
+            last_yaw = my_yaw or last_yaw
             others = [d for oid, d in all_data.items() if oid != drone_id and "latitude" in d]
             if not others:
                 await drone.offboard.set_velocity_ned(VelocityNedYaw(NORMAL_SPEED, 0.0, 0.0, my_yaw or 0))
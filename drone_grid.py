@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import math
+import tkinter as tk
+from tkinter import ttk
+import customtkinter as ctk
+
+
+class VirtualCardGrid(ctk.CTkFrame):
+    """
+    Scrollable grid of drone cards that only keeps widgets for the rows on screen.
+    Card widgets are pooled and re-bound to other drones while scrolling, so the
+    widget count depends on the window size and not on the swarm size.
+
+    card_factory(parent) must return a dict with at least a "frame" widget.
+    bind_card(card, drone_id) / unbind_card(card, drone_id) fill and release it.
+    """
+
+    def __init__(self, parent, card_factory, bind_card, unbind_card=None,
+                 card_min_width=300, card_height=380, padding=12, overscan_rows=1,
+                 bg_color="#121212", **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.card_factory = card_factory
+        self.bind_card = bind_card
+        self.unbind_card = unbind_card
+        self.card_min_width = card_min_width
+        self.card_height = card_height
+        self.padding = padding
+        self.overscan_rows = overscan_rows
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=bg_color, yscrollincrement=40)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.drone_ids = []
+        self.bound_cards = {}   # drone_id -> card dict currently on screen
+        self._free_cards = []   # Hidden cards ready for re-use
+        self._layout_job = None
+
+        self.canvas.bind("<Configure>", lambda e: self.schedule_layout())
+        self.bind("<Enter>", self._bind_mousewheel)
+        self.bind("<Leave>", self._unbind_mousewheel)
+
+    # ---------- public API ----------
+    def set_drones(self, drone_ids):
+        drone_ids = list(drone_ids)
+        if drone_ids != self.drone_ids:
+            self.drone_ids = drone_ids
+            self.schedule_layout()
+
+    def set_background(self, color):
+        self.canvas.configure(bg=color)
+
+    def schedule_layout(self):
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._layout)
+
+    # ---------- scrolling ----------
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._layout()
+
+    def _bind_mousewheel(self, _event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, _event=None):
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            step = -1
+        else:
+            step = 1
+        top, bottom = self.canvas.yview()
+        if (step < 0 and top <= 0.0) or (step > 0 and bottom >= 1.0):
+            return
+        self.canvas.yview_scroll(step, "units")
+        self._layout()
+
+    # ---------- layout ----------
+    def _layout(self):
+        self._layout_job = None
+        width = max(self.canvas.winfo_width(), 1)
+        view_height = max(self.canvas.winfo_height(), 1)
+        pad = self.padding
+
+        cols = max(1, (width - pad) // (self.card_min_width + pad))
+        card_width = max(1, (width - pad) // cols - pad)
+        row_height = self.card_height + pad
+        rows = math.ceil(len(self.drone_ids) / cols) if self.drone_ids else 0
+        self.canvas.configure(scrollregion=(0, 0, width, max(rows * row_height + pad, view_height)))
+
+        top = self.canvas.canvasy(0)
+        first_row = max(0, int(top // row_height) - self.overscan_rows)
+        last_row = min(rows - 1, int((top + view_height) // row_height) + self.overscan_rows)
+        first_index = first_row * cols
+        visible_ids = self.drone_ids[first_index:(last_row + 1) * cols] if rows else []
+        visible_set = set(visible_ids)
+
+        for drone_id in [did for did in self.bound_cards if did not in visible_set]:
+            card = self.bound_cards.pop(drone_id)
+            if self.unbind_card:
+                self.unbind_card(card, drone_id)
+            self.canvas.itemconfigure(card["_window"], state="hidden")
+            card["_geometry"] = None  # Shown again by the next binding, even in the same slot
+            self._free_cards.append(card)
+
+        for offset, drone_id in enumerate(visible_ids):
+            card = self.bound_cards.get(drone_id)
+            if card is None:
+                card = self._free_cards.pop() if self._free_cards else self._new_card()
+                self.bound_cards[drone_id] = card
+                self.bind_card(card, drone_id)
+            row, col = divmod(first_index + offset, cols)
+            geometry = (pad + col * (card_width + pad), pad + row * row_height, card_width)
+            if card.get("_geometry") != geometry:
+                x, y, w = geometry
+                self.canvas.coords(card["_window"], x, y)
+                self.canvas.itemconfigure(card["_window"], width=w, height=self.card_height, state="normal")
+                card["_geometry"] = geometry
+
+    def _new_card(self):
+        card = self.card_factory(self.canvas)
+        card["_window"] = self.canvas.create_window(0, 0, window=card["frame"], anchor="nw",
+                                                    width=self.card_min_width, height=self.card_height)
+        card["_geometry"] = None
+        return card
+
+
+class DroneTable(ctk.CTkFrame):
+    """
+    Compact one-row-per-drone table for large swarms. ttk.Treeview only draws
+    the rows on screen, and cells are only written when their text changes.
+    """
+
+    def __init__(self, parent, columns, style_name="SwarMind.Treeview", **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.columns = columns  # [(key, heading, width), ...]
+        self.style_name = style_name
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in columns], show="headings", style=style_name)
+        for key, heading, width in columns:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w", stretch=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._rows = {}  # drone_id -> {column_key: text}
+
+    def set_drones(self, drone_ids):
+        drone_ids = list(drone_ids)
+        for drone_id in [did for did in self._rows if did not in drone_ids]:
+            self.tree.delete(str(drone_id))
+            del self._rows[drone_id]
+        for index, drone_id in enumerate(drone_ids):
+            if drone_id not in self._rows:
+                self.tree.insert("", index, iid=str(drone_id), values=[""] * len(self.columns))
+                self._rows[drone_id] = {}
+
+    def update_row(self, drone_id, values):
+        row = self._rows.get(drone_id)
+        if row is None:
+            return
+        iid = str(drone_id)
+        for key, text in values.items():
+            if row.get(key) != text:
+                self.tree.set(iid, key, text)
+                row[key] = text
+
+    def selected_ids(self):
+        return [int(iid) for iid in self.tree.selection()]
+
+    def apply_colors(self, colors, font):
+        style = ttk.Style(self)
+        style.configure(self.style_name, background=colors["card_bg"], fieldbackground=colors["card_bg"],
+                        foreground=colors["text_primary"], rowheight=26, font=font, borderwidth=0)
+        style.configure(f"{self.style_name}.Heading", background=colors["secondary"],
+                        foreground=colors["text_secondary"], font=font)
+        style.map(self.style_name, background=[("selected", colors["accent"])])
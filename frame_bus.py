@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import struct
+import time
+import multiprocessing.shared_memory as shm
+
+# Shared-memory ring of video frames published by a video logger.
+# Every slot is guarded by a sequence counter (seqlock): the writer marks the
+# slot odd while copying and even when done, readers retry/skip torn slots.
+#
+# Two streams per drone: "preview" (small JPEGs, latest-frame-wins for the GUI)
+# and "analysis" (sampled full-size JPEGs consumed in order by the segmentation
+# worker). A consumer publishes its cursor in the ring header; a writer that
+# publishes with backpressure drops new frames instead of overwriting ones the
+# consumer has not read yet.
+
+FRAME_RING_PREFIX = "swarmind_frames_"
+FRAME_RING_SLOTS = 8
+FRAME_RING_SLOT_SIZE = 1 << 20  # 1 MiB per slot: a 640 px JPEG preview or a compressed full frame
+ANALYSIS_RING_SLOTS = 32  # ~16 s of buffering at the default 2 fps analysis rate
+CONSUMER_TIMEOUT = 5.0  # A consumer that has not advanced its heartbeat for this long is ignored
+
+ENCODING_RAW_BGR = 0
+ENCODING_JPEG = 1
+
+_MAGIC = b"SWMFRAME"
+_RING_HEADER = struct.Struct("<8sIIQ")  # magic, slot_count, slot_size, published frame count
+_RING_HEADER_SIZE = 64
+_SLOT_HEADER = struct.Struct("<QQdIIIIIdddd")  # seq, frame_number, timestamp, w, h, channels, encoding, payload_len, lat, lon, alt, yaw
+_SLOT_HEADER_SIZE = 128
+_COUNT_OFFSET = 16  # Offset of the published frame count inside the ring header
+_CONSUMER = struct.Struct("<Qd")  # next seq the consumer will read + 1 (0 = no consumer), heartbeat time
+_CONSUMER_OFFSET = 24
+
+
+def frame_ring_name(drone_id, stream="preview"):
+    return f"{FRAME_RING_PREFIX}{drone_id}" if stream == "preview" else f"{FRAME_RING_PREFIX}{stream}_{drone_id}"
+
+
+def attach_segment(name):
+    """Maps an existing segment without letting this process's resource tracker unlink it on exit."""
+    segment = shm.SharedMemory(name=name, create=False)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+    return segment
+
+
+class FrameRingWriter:
+    """Single-writer side of the frame ring (one per video logger / drone)."""
+
+    def __init__(self, name, slot_count=FRAME_RING_SLOTS, slot_size=FRAME_RING_SLOT_SIZE):
+        self.name = name
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        total = _RING_HEADER_SIZE + slot_count * (_SLOT_HEADER_SIZE + slot_size)
+        try:
+            self.segment = shm.SharedMemory(name=name, create=True, size=total)
+        except FileExistsError:
+            # Left over from a crashed logger: replace it so the geometry always matches
+            stale = shm.SharedMemory(name=name, create=False)
+            stale.close()
+            stale.unlink()
+            self.segment = shm.SharedMemory(name=name, create=True, size=total)
+        self.buf = self.segment.buf
+        _RING_HEADER.pack_into(self.buf, 0, _MAGIC, slot_count, slot_size, 0)
+        self.count = 0
+        self.oversized = 0
+        self.backpressure_drops = 0
+
+    def _slot_offset(self, index):
+        return _RING_HEADER_SIZE + (index % self.slot_count) * (_SLOT_HEADER_SIZE + self.slot_size)
+
+    def consumer_lag(self):
+        """Frames published but not yet consumed by a live consumer, or None without one."""
+        cursor, heartbeat = _CONSUMER.unpack_from(self.buf, _CONSUMER_OFFSET)
+        if cursor == 0 or time.time() - heartbeat > CONSUMER_TIMEOUT:
+            return None
+        return self.count - (cursor - 1)
+
+    def publish(self, payload, width, height, channels, encoding, frame_number=0, timestamp=None,
+                lat=0.0, lon=0.0, alt=0.0, yaw=0.0, backpressure=False):
+        """
+        Copies one frame into the next slot. Returns its sequence number, or None if it
+        does not fit or, with backpressure, if it would overwrite an unconsumed frame.
+        """
+        payload = memoryview(payload).cast("B")
+        if len(payload) > self.slot_size:
+            self.oversized += 1
+            return None
+        if backpressure:
+            lag = self.consumer_lag()
+            if lag is not None and lag >= self.slot_count:
+                self.backpressure_drops += 1
+                return None
+        n = self.count
+        offset = self._slot_offset(n)
+        timestamp = time.time() if timestamp is None else timestamp
+        struct.pack_into("<Q", self.buf, offset, 2 * n + 1)  # Odd: slot is being written
+        _SLOT_HEADER.pack_into(self.buf, offset, 2 * n + 1, frame_number, timestamp, width, height, channels,
+                               encoding, len(payload), lat, lon, alt, yaw)
+        start = offset + _SLOT_HEADER_SIZE
+        self.buf[start:start + len(payload)] = payload
+        struct.pack_into("<Q", self.buf, offset, 2 * n + 2)  # Even: slot complete
+        self.count = n + 1
+        struct.pack_into("<Q", self.buf, _COUNT_OFFSET, self.count)
+        return n
+
+    def close(self, unlink=True):
+        self.buf = None
+        self.segment.close()
+        if unlink:
+            try:
+                self.segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameRingReader:
+    """
+    Reader side. latest() implements latest-frame-wins for previews; frames
+    older than the newest complete one are simply skipped and counted.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.last_seq = -1
+        self.next_seq = None  # In-order cursor, set by the first consume()
+        self.missed = 0
+        self.segment = attach_segment(name)
+        self.buf = self.segment.buf
+        # The writer creates the segment before it packs the header: a zeroed (or
+        # foreign) segment is "not a ring yet", which callers retry on
+        magic = None
+        if self.segment.size >= _RING_HEADER_SIZE:
+            magic, self.slot_count, self.slot_size, _ = _RING_HEADER.unpack_from(self.buf, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"'{name}' is not a frame ring")
+
+    def published_count(self):
+        return struct.unpack_from("<Q", self.buf, _COUNT_OFFSET)[0]
+
+    def _slot_offset(self, index):
+        return _RING_HEADER_SIZE + (index % self.slot_count) * (_SLOT_HEADER_SIZE + self.slot_size)
+
+    def read(self, n):
+        """Returns frame n as a dict (metadata + payload bytes), or None if it was overwritten or is being written."""
+        offset = self._slot_offset(n)
+        header = _SLOT_HEADER.unpack_from(self.buf, offset)
+        if header[0] != 2 * n + 2:
+            return None
+        payload_len = header[7]
+        start = offset + _SLOT_HEADER_SIZE
+        payload = bytes(self.buf[start:start + payload_len])
+        if struct.unpack_from("<Q", self.buf, offset)[0] != 2 * n + 2:
+            return None  # Overwritten while copying
+        _, frame_number, timestamp, width, height, channels, encoding, _, lat, lon, alt, yaw = header
+        return {"seq": n, "frame_number": frame_number, "timestamp": timestamp, "width": width,
+                "height": height, "channels": channels, "encoding": encoding, "payload": payload,
+                "lat": lat, "lon": lon, "alt": alt, "yaw": yaw}
+
+    def latest(self):
+        """
+        Returns (frame, skipped) for the newest complete frame not returned yet,
+        or (None, 0). skipped counts the published frames this reader never saw.
+        """
+        count = self.published_count()
+        if count == 0 or count - 1 <= self.last_seq:
+            return None, 0
+        n = count - 1
+        frame = self.read(n)
+        if frame is None and n > 0:
+            n -= 1  # Newest slot is mid-write; fall back to the previous one
+            frame = self.read(n) if n > self.last_seq else None
+        if frame is None:
+            return None, 0
+        skipped = n - self.last_seq - 1 if self.last_seq >= 0 else 0
+        self.last_seq = n
+        return frame, skipped
+
+    def consume(self, from_start=False):
+        """
+        In-order read for a single consumer. Returns the next unread frame or None,
+        and advertises the cursor so writers publishing with backpressure wait for it.
+        Frames overwritten before they were read are counted in self.missed.
+        """
+        count = self.published_count()
+        if self.next_seq is None:
+            self.next_seq = max(0, count - self.slot_count) if from_start else count
+        frame = None
+        while frame is None and self.next_seq < count:
+            oldest = count - self.slot_count
+            if self.next_seq < oldest:
+                self.missed += oldest - self.next_seq
+                self.next_seq = oldest
+            frame = self.read(self.next_seq)
+            if frame is None:
+                self.missed += 1
+            self.next_seq += 1
+        _CONSUMER.pack_into(self.buf, _CONSUMER_OFFSET, self.next_seq + 1, time.time())
+        return frame
+
+    def close(self):
+        if self.buf is not None and self.next_seq is not None:
+            _CONSUMER.pack_into(self.buf, _CONSUMER_OFFSET, 0, 0.0)  # Detach so the writer stops waiting
+        self.buf = None
+        self.segment.close()
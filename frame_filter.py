@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import cv2
+import numpy as np
+
+from geo import calculate_distance
+
+
+def dhash(image_rgb, hash_size=8):
+    """Difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size grayscale thumbnail."""
+    gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return (small[:, 1:] > small[:, :-1]).flatten()
+
+
+class RedundancyFilter:
+    """
+    Skips frames that are near-duplicates of the last frame that was processed.
+      - GPS:  displacement since the last processed frame below min_displacement_m
+              (when both frames carry a position this alone decides)
+      - hash: dHash Hamming distance at or below hash_threshold bits (of 64)
+      - MAD:  mean absolute difference of 64x64 grayscale thumbnails below mad_threshold
+    Comparing with the last *processed* frame means slow drift still triggers a
+    new inference once it adds up.
+    """
+
+    REASONS = ("gps", "hash", "mad")
+
+    def __init__(self, min_displacement_m=None, hash_threshold=4, mad_threshold=3.0, thumb_size=64):
+        self.min_displacement_m = min_displacement_m
+        self.hash_threshold = hash_threshold
+        self.mad_threshold = mad_threshold
+        self.thumb_size = thumb_size
+        self.processed = 0
+        self.skipped = {reason: 0 for reason in self.REASONS}
+        self._last_position = None
+        self._last_hash = None
+        self._last_thumb = None
+
+    @staticmethod
+    def _position(meta):
+        if not meta or meta.get("fix_age", 0) < 0:
+            return None
+        lat, lon = meta.get("lat"), meta.get("lon")
+        if lat is None or lon is None or (lat == 0.0 and lon == 0.0):
+            return None
+        return lat, lon
+
+    def check(self, image_rgb, meta=None):
+        """Returns (keep, reason); reason is None for kept frames."""
+        position = self._position(meta)
+        use_gps = bool(self.min_displacement_m and position and self._last_position)
+        if use_gps and calculate_distance(*self._last_position, *position) < self.min_displacement_m:
+            return self._skip("gps")
+
+        frame_hash = dhash(image_rgb)
+        gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
+        thumb = cv2.resize(gray, (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA).astype(np.int16)
+        # With a position, the displacement decides; image similarity is the fallback without GPS
+        if not use_gps and self._last_hash is not None:
+            if np.count_nonzero(frame_hash != self._last_hash) <= self.hash_threshold:
+                return self._skip("hash")
+            if np.abs(thumb - self._last_thumb).mean() < self.mad_threshold:
+                return self._skip("mad")
+
+        self.processed += 1
+        self._last_hash, self._last_thumb = frame_hash, thumb
+        if position:
+            self._last_position = position
+        return True, None
+
+    def _skip(self, reason):
+        self.skipped[reason] += 1
+        return False, reason
+
+    def report(self):
+        total = self.processed + sum(self.skipped.values())
+        skipped = ", ".join(f"{reason} {count}" for reason, count in self.skipped.items())
+        return f"{self.processed}/{total} frames processed, skipped: {skipped}"
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import bisect
+import csv
+import os
+import struct
+import threading
+import time
+
+# Per-frame metadata sidecar written next to a logged video ("<video>.meta").
+# A 16-byte header followed by fixed-size little-endian records, so a frame's
+# row sits at a computable offset and the file can be appended while recording.
+
+META_SUFFIX = ".meta"
+_MAGIC = b"SWMMETA1"
+_HEADER = struct.Struct("<8sII")  # magic, record size, reserved
+_RECORD = struct.Struct("<Qddddff")  # frame_number, capture_time, lat, lon, alt, yaw, fix_age (-1 = no fix)
+FIELDS = ("frame_number", "capture_time", "lat", "lon", "alt", "yaw", "fix_age")
+
+
+def sidecar_path(video_path):
+    return video_path + META_SUFFIX
+
+
+class SidecarWriter:
+    """
+    Collects (frame_number, capture_time) from the annotate thread and writes
+    rows once the GPS cache has a fix at or after the capture time, so positions
+    are interpolated between fixes rather than held from the previous one.
+    Frames waiting longer than max_wait are written with the best estimate.
+    """
+
+    def __init__(self, path, gps, max_wait=1.0):
+        self.path = path
+        self.gps = gps
+        self.max_wait = max_wait
+        self.rows = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _RECORD.size, 0))
+
+    def add(self, frame_number, capture_time):
+        """Thread-safe; called from the pipeline's annotate stage."""
+        with self._lock:
+            self._pending.append((frame_number, capture_time))
+
+    def flush(self, force=False):
+        """Writes the rows whose position can be interpolated now. Call from the event-loop thread."""
+        now = time.time()
+        with self._lock:
+            ready = 0
+            for _, capture_time in self._pending:
+                if not (force or self.gps.covers(capture_time) or now - capture_time > self.max_wait):
+                    break
+                ready += 1
+            rows, self._pending = self._pending[:ready], self._pending[ready:]
+        for frame_number, capture_time in rows:
+            lat, lon, alt, yaw, fix_age = self.gps.sample_at(capture_time)
+            self._file.write(_RECORD.pack(frame_number, capture_time, lat, lon, alt, yaw,
+                                          -1.0 if fix_age is None else fix_age))
+        self.rows += len(rows)
+        if rows:
+            self._file.flush()
+
+    def close(self):
+        self.flush(force=True)
+        self._file.close()
+
+
+class FrameMetadata:
+    """
+    Read side of a sidecar. Lookup by frame number is a binary search over the
+    (sorted) frame column; bounding-box queries use a latitude-sorted index.
+    """
+
+    def __init__(self, path):
+        if not path.endswith(META_SUFFIX) and os.path.exists(sidecar_path(path)):
+            path = sidecar_path(path)  # Accept the video path as well
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, record_size, _ = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or record_size != _RECORD.size:
+            raise ValueError(f"'{path}' is not a frame metadata sidecar")
+        count = (len(data) - _HEADER.size) // record_size  # A torn last record (crash) is ignored
+        self.rows = [_RECORD.unpack_from(data, _HEADER.size + i * record_size) for i in range(count)]
+        self._frames = [row[0] for row in self.rows]
+        self._by_lat = sorted(range(count), key=lambda i: self.rows[i][2])
+        self._lats = [self.rows[i][2] for i in self._by_lat]
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def _as_dict(row):
+        return dict(zip(FIELDS, row))
+
+    def frame(self, frame_number):
+        """Returns the metadata dict for frame_number, or None if it was not logged."""
+        i = bisect.bisect_left(self._frames, frame_number)
+        if i < len(self._frames) and self._frames[i] == frame_number:
+            return self._as_dict(self.rows[i])
+        return None
+
+    def frames_in_bbox(self, lat_min, lon_min, lat_max, lon_max):
+        """Returns the frame numbers taken inside the box, in frame order."""
+        lo = bisect.bisect_left(self._lats, lat_min)
+        hi = bisect.bisect_right(self._lats, lat_max)
+        rows = self.rows
+        return sorted(rows[i][0] for i in self._by_lat[lo:hi]
+                      if lon_min <= rows[i][3] <= lon_max and rows[i][6] >= 0)
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(self.rows)
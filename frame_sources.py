@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import shutil
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from frame_metadata import FrameMetadata, sidecar_path
+from geo import calculate_distance
+
+# Frame sources for segment_and_detect_agriculture.process_frames.
+# Every source yields dicts:
+#   name           file-style frame name used for the outputs
+#   image          RGB uint8 array
+#   index          frame index in the source
+#   meta           sidecar row (lat/lon/alt/yaw...) or None
+#   save_original  callable(dest_dir) storing the untouched source frame
+# skip(name), when given, is asked before a frame is decoded; frames it
+# returns True for are passed over without decoding (resumed runs).
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+VIDEO_EXTENSIONS = ('.avi', '.mp4', '.mkv', '.mov')
+_END = object()
+
+
+def _save_array(image, name):
+    def save(dest_dir):
+        Image.fromarray(image).save(os.path.join(dest_dir, name))
+    return save
+
+
+def _load_metadata(path, every_metres):
+    if not os.path.exists(sidecar_path(path)):
+        if every_metres:
+            print(f"[WARNING] {sidecar_path(path)} not found; distance-based sampling disabled.")
+        return None
+    return FrameMetadata(sidecar_path(path))
+
+
+class _DistanceGate:
+    """Keeps a frame only after the drone moved every_metres since the last kept one."""
+
+    def __init__(self, every_metres):
+        self.every_metres = every_metres
+        self.last = None
+
+    def keep(self, meta):
+        if not self.every_metres or meta is None or meta["fix_age"] < 0:
+            return True
+        if self.last is not None and calculate_distance(self.last[0], self.last[1], meta["lat"], meta["lon"]) < self.every_metres:
+            return False
+        self.last = (meta["lat"], meta["lon"])
+        return True
+
+
+def directory_frames(input_dir, stride=1, skip=None):
+    """Images of a directory (e.g. ffmpeg-extracted frames), sorted by name."""
+    frame_files = sorted(f for f in os.listdir(input_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+    for index, image_name in enumerate(frame_files[::stride]):
+        if skip is not None and skip(image_name):
+            continue
+        image_path = os.path.join(input_dir, image_name)
+        yield {
+            "name": image_name,
+            "image": np.array(Image.open(image_path).convert("RGB")),
+            "index": index * stride,
+            "meta": None,
+            "save_original": lambda dest_dir, p=image_path, n=image_name: shutil.copy(p, os.path.join(dest_dir, n)),
+        }
+
+
+def video_frames(video_path, stride=1, time_range=None, every_metres=None, prefetch=8, skip=None):
+    """
+    Decodes a video directly with OpenCV on a prefetching thread, so decoding
+    overlaps inference. Skipped frames are only grabbed, never decoded.
+      stride        keep every stride-th frame
+      time_range    (start_s, end_s), either end may be None
+      every_metres  keep a frame each time the drone moved this far (needs the .meta sidecar)
+    """
+    metadata = _load_metadata(video_path, every_metres)
+    gate = _DistanceGate(every_metres if metadata is not None else None)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        cap.release()
+        raise RuntimeError(f"Could not open video: {video_path}")
+    frames = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def decode():
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            start_s, end_s = time_range or (None, None)
+            index = 0
+            if start_s:
+                index = int(start_s * fps)
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            end_index = int(end_s * fps) if end_s is not None else None
+            while not stop.is_set() and (end_index is None or index < end_index):
+                if not cap.grab():
+                    break
+                meta = metadata.frame(index) if metadata is not None else None
+                name = f"frame_{index + 1:06d}.png"  # 1-based like the former ffmpeg extraction
+                # The gate sees skipped frames too, so distance sampling picks the same frames on resume
+                if index % stride == 0 and gate.keep(meta) and not (skip is not None and skip(name)):
+                    ok, bgr = cap.retrieve()
+                    if not ok:
+                        break
+                    image = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+                    item = {"name": name, "image": image, "index": index, "meta": meta,
+                            "save_original": _save_array(image, name)}
+                    while not stop.is_set():
+                        try:
+                            frames.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                index += 1
+        finally:
+            cap.release()
+            while True:
+                try:
+                    frames.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        break
+
+    thread = threading.Thread(target=decode, name="VideoPrefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is _END:
+                break
+            yield item
+    finally:
+        stop.set()  # Consumer stopped early: let the decoder exit
+        thread.join(timeout=1.0)
+
+
+def open_frame_source(input_path, stride=1, time_range=None, every_metres=None, skip=None):
+    """Picks the source for a directory of images or a video file."""
+    if os.path.isdir(input_path):
+        if time_range or every_metres:
+            print("[WARNING] Time ranges and distance-based sampling only apply to video input.")
+        return directory_frames(input_path, stride, skip)
+    if input_path.lower().endswith(VIDEO_EXTENSIONS):
+        return video_frames(input_path, stride, time_range, every_metres, skip=skip)
+    raise ValueError(f"Unsupported input: {input_path}")
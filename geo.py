@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import math
+
+EARTH_RADIUS_M = 6371000
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    """Haversine distance in metres (same formula the flocking controller uses)."""
+    if None in (lat1, lon1, lat2, lon2):
+        return 1e9
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class LocalProjection:
+    """Equirectangular projection to local east/north metres around (lat0, lon0)."""
+
+    def __init__(self, lat0, lon0):
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.m_per_deg_lat = math.radians(1) * EARTH_RADIUS_M
+        self.m_per_deg_lon = self.m_per_deg_lat * math.cos(math.radians(lat0))
+
+    def to_local(self, lat, lon):
+        return (lon - self.lon0) * self.m_per_deg_lon, (lat - self.lat0) * self.m_per_deg_lat
+
+    def to_geo(self, east, north):
+        return self.lat0 + north / self.m_per_deg_lat, self.lon0 + east / self.m_per_deg_lon
+
+
+# ---------- Slippy map (z/x/y) tile helpers ----------
+TILE_SIZE = 256
+
+
+def tile_metres_per_pixel(lat, zoom):
+    return 156543.03392 * math.cos(math.radians(lat)) / (2 ** zoom)
+
+
+def latlon_to_tile(lat, lon, zoom):
+    """Returns fractional tile coordinates (x, y) for a web-mercator zoom level."""
+    n = 2 ** zoom
+    lat_rad = math.radians(lat)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0 * n
+    return x, y
+
+
+def tile_to_latlon(x, y, zoom):
+    """Returns the lat/lon of the north-west corner of tile (x, y)."""
+    n = 2 ** zoom
+    lon = x / n * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return lat, lon
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import bisect
+import time
+from collections import deque
+
+
+def _lerp_angle(a, b, f):
+    """Interpolates headings in degrees along the shorter arc."""
+    delta = (b - a + 180.0) % 360.0 - 180.0
+    return (a + delta * f + 180.0) % 360.0 - 180.0
+
+
+class PositionHistory:
+    """
+    Latest position fix of one drone plus a short history of fixes and headings,
+    so per-frame metadata can be interpolated at capture time. latest() never
+    awaits, so the frame loop is paced by the camera and not by telemetry latency.
+    A feed (BusGpsFeed) calls record_position / record_yaw.
+    """
+
+    def __init__(self, history_seconds=10.0):
+        self.lat, self.lon, self.alt, self.yaw = 0.0, 0.0, 0.0, 0.0
+        self.fix_time = None  # time.time() of the last fix, None until the first one
+        self.updates = 0
+        self._positions = deque(maxlen=int(history_seconds * 50))  # (t, lat, lon, alt)
+        self._headings = deque(maxlen=int(history_seconds * 50))   # (t, yaw)
+
+    def record_position(self, t, lat, lon, alt):
+        self.lat, self.lon, self.alt = lat, lon, alt
+        self.fix_time = t
+        self.updates += 1
+        self._positions.append((t, lat, lon, alt))
+
+    def record_yaw(self, t, yaw):
+        self.yaw = yaw
+        self._headings.append((t, yaw))
+
+    def latest(self):
+        """Returns (lat, lon, alt, age_s); age_s is None before the first fix."""
+        age = None if self.fix_time is None else time.time() - self.fix_time
+        return self.lat, self.lon, self.alt, age
+
+    def covers(self, t):
+        """True once a fix at or after t has arrived, i.e. sample_at(t) no longer extrapolates."""
+        return self.fix_time is not None and self.fix_time >= t
+
+    @staticmethod
+    def _bracket(samples, t):
+        times = [s[0] for s in samples]
+        i = bisect.bisect_left(times, t)
+        if i == 0:
+            return samples[0], samples[0], 0.0
+        if i == len(samples):
+            return samples[-1], samples[-1], 0.0
+        a, b = samples[i - 1], samples[i]
+        return a, b, (t - a[0]) / (b[0] - a[0]) if b[0] > a[0] else 0.0
+
+    def sample_at(self, t):
+        """
+        Returns (lat, lon, alt, yaw, fix_age_s) linearly interpolated at time t
+        (held at the nearest fix outside the history). fix_age_s is the distance
+        to the nearest real fix, None before the first one.
+        """
+        if not self._positions:
+            return self.lat, self.lon, self.alt, self.yaw, None
+        positions = list(self._positions)
+        a, b, f = self._bracket(positions, t)
+        lat = a[1] + (b[1] - a[1]) * f
+        lon = a[2] + (b[2] - a[2]) * f
+        alt = a[3] + (b[3] - a[3]) * f
+        fix_age = min(abs(t - a[0]), abs(b[0] - t))
+        yaw = self.yaw
+        if self._headings:
+            ha, hb, hf = self._bracket(list(self._headings), t)
+            yaw = _lerp_angle(ha[1], hb[1], hf)
+        return lat, lon, alt, yaw, fix_age
+
+
+class BusGpsFeed:
+    """
+    Fills one PositionHistory per drone from the telemetry bus the drone scripts
+    already publish, so a logger needs no MAVSDK connection of its own.
+    Register on a TelemetryReader; callbacks run on the reader thread.
+    """
+
+    POSITION_KEYS = ("latitude", "longitude", "absolute_altitude")
+
+    def __init__(self, reader, drone_ids, history_seconds=10.0):
+        self.reader = reader
+        self.histories = {drone_id: PositionHistory(history_seconds) for drone_id in drone_ids}
+        self.speeds = {drone_id: 0.0 for drone_id in drone_ids}  # Horizontal speed (m/s) from the bus
+        reader.add_listener(self._on_telemetry)
+
+    def _on_telemetry(self, drone_id, diff, now):
+        history = self.histories.get(drone_id)
+        if history is None:
+            return
+        if "speed" in diff:
+            self.speeds[drone_id] = diff["speed"] or 0.0
+        if any(key in diff for key in self.POSITION_KEYS):
+            # Diffs carry only the changed fields; the snapshot has the full fix
+            telemetry = self.reader.snapshot(drone_id)
+            lat, lon, alt = (telemetry.get(key) for key in self.POSITION_KEYS)
+            if lat is not None and lon is not None:
+                history.record_position(now, lat, lon, alt or 0.0)
+        if diff.get("yaw") is not None:
+            history.record_yaw(now, diff["yaw"])
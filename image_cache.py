@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
+
+
+class ImageFrameCache:
+    """
+    Process-wide cache of decoded and resized image frames keyed by (path, size).
+    Decoding and LANCZOS resizing happen once per key on a worker thread; the
+    PhotoImages are built once on the Tk thread and shared by every card.
+    """
+
+    def __init__(self, max_entries=8, max_sources=4, poll_ms=30):
+        self.max_entries = max_entries
+        self.max_sources = max_sources
+        self.poll_ms = poll_ms
+
+        self._lock = threading.Lock()
+        self._sources = OrderedDict()  # path -> ([RGBA frames at original size], [durations])
+        self._resized = OrderedDict()  # (path, size) -> ([resized frames], [durations])
+        self._photos = OrderedDict()   # (path, size) -> ([PhotoImage], [durations]); Tk thread only
+        self._pending = {}             # (path, size) -> [callbacks waiting on the Tk thread]
+        self._done = queue.Queue()     # keys finished by the worker
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ImageFrameCache")
+        self._root = None
+        self._poll_job = None
+
+    def attach(self, tk_root):
+        """Sets the Tk root used to hand finished work back to the UI thread."""
+        self._root = tk_root
+
+    def get(self, path, size):
+        """Returns (photos, durations) when the key is ready, otherwise None. Tk thread only."""
+        key = (path, (int(size[0]), int(size[1])))
+        entry = self._photos.get(key)
+        if entry is not None:
+            self._photos.move_to_end(key)
+            return entry
+        with self._lock:
+            resized = self._resized.get(key)
+            if resized is not None:
+                self._resized.move_to_end(key)
+        if resized is None:
+            return None
+        frames, durations = resized
+        entry = ([ImageTk.PhotoImage(frame) for frame in frames], durations)
+        self._photos[key] = entry
+        # Evicted PhotoImages stay alive while a label still holds a reference to them
+        while len(self._photos) > self.max_entries:
+            self._photos.popitem(last=False)
+        return entry
+
+    def request(self, path, size, callback):
+        """
+        Calls callback(photos, durations) on the Tk thread once (path, size) is ready.
+        Runs immediately when cached; concurrent requests for one key share a single job.
+        """
+        key = (path, (int(size[0]), int(size[1])))
+        entry = self.get(*key)
+        if entry is not None:
+            callback(*entry)
+            return
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+        self._pending[key] = [callback]
+        self._executor.submit(self._build, key)
+        if self._poll_job is None and self._root is not None:
+            self._poll_job = self._root.after(self.poll_ms, self._poll)
+
+    # ---------- worker side ----------
+    def _load_source(self, path):
+        with self._lock:
+            source = self._sources.get(path)
+            if source is not None:
+                self._sources.move_to_end(path)
+                return source
+        frames, durations = [], []
+        with Image.open(path) as img:
+            for i in range(getattr(img, "n_frames", 1)):
+                img.seek(i)
+                frames.append(img.copy().convert("RGBA"))
+                durations.append(img.info.get('duration', 100))
+        with self._lock:
+            self._sources[path] = (frames, durations)
+            while len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+        return frames, durations
+
+    def _build(self, key):
+        path, size = key
+        try:
+            frames, durations = self._load_source(path)
+            resized = ([frame.resize(size, Image.Resampling.LANCZOS) for frame in frames], list(durations))
+            print(f"INFO: Cached '{path}' ({len(frames)} frames) at {size[0]}x{size[1]}.")
+        except Exception as e:
+            print(f"ERROR: Could not load image '{path}' at {size[0]}x{size[1]}: {e}")
+            resized = ([], [])
+        with self._lock:
+            self._resized[key] = resized
+            while len(self._resized) > self.max_entries:
+                self._resized.popitem(last=False)
+        self._done.put(key)
+
+    # ---------- Tk side ----------
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                key = self._done.get_nowait()
+            except queue.Empty:
+                break
+            entry = self.get(*key)
+            if entry is None:
+                # Evicted before the UI picked it up; build it again for the waiting callbacks
+                self._executor.submit(self._build, key)
+                continue
+            for callback in self._pending.pop(key, []):
+                try:
+                    callback(*entry)
+                except Exception as e:
+                    print(f"ERROR: Image cache callback failed: {e}")
+        if self._pending:
+            self._poll_job = self._root.after(self.poll_ms, self._poll)
+
+
+# Shared by every window and card in the process
+frame_cache = ImageFrameCache()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+# Inference backends behind one interface: build_backend() returns a callable
+# taking a normalized (N, 3, H, W) float tensor and returning an object with
+# .logits, like the transformers model, so BatchedSegmenter works unchanged.
+#   eager              fp32 PyTorch (reference)
+#   bf16               eager under bfloat16 autocast
+#   compile            torch.compile
+#   int8               dynamic int8 quantization of the Linear layers (most of SegFormer's compute)
+#   onnx               ONNX export run by onnxruntime
+#   onnx-int8          onnxruntime dynamic int8 quantization
+#   onnx-int8-static   onnxruntime static int8 quantization, calibrated on reference frames
+
+BACKENDS = ("eager", "bf16", "compile", "int8", "onnx", "onnx-int8", "onnx-int8-static")
+
+
+class _Bf16:
+    def __init__(self, model, device):
+        self.model = model
+        self.device_type = device.type
+
+    def __call__(self, inputs):
+        with torch.autocast(self.device_type, dtype=torch.bfloat16):
+            logits = self.model(inputs).logits
+        return SimpleNamespace(logits=logits.float())
+
+
+class _OnnxRuntime:
+    def __init__(self, path, threads=None):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, inputs):
+        logits = self.session.run(None, {self.input_name: inputs.detach().cpu().numpy()})[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits).to(inputs.device))
+
+
+def export_onnx(model, path, image_size=512):
+    class Logits(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, pixel_values):
+            return self.model(pixel_values).logits
+
+    example = torch.zeros((2, 3, image_size, image_size))
+    torch.onnx.export(Logits(model).cpu().eval(), example, path, input_names=["pixel_values"],
+                      output_names=["logits"], dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+                      opset_version=17)
+    return path
+
+
+class _CalibrationReader:
+    """Feeds normalized reference batches to onnxruntime's static quantizer."""
+
+    def __init__(self, batches):
+        self._batches = iter(batches)
+
+    def get_next(self):
+        batch = next(self._batches, None)
+        return None if batch is None else {"pixel_values": batch.numpy()}
+
+
+def _fingerprint(model):
+    """Short key for the cached ONNX files, so a re-exported model is not served from a stale cache."""
+    digest = hashlib.sha1()
+    for name, tensor in model.state_dict().items():
+        digest.update(f"{name}{tuple(tensor.shape)}{float(tensor.float().sum()):.6e}".encode())
+    return digest.hexdigest()[:12]
+
+
+def build_backend(name, model, device, threads=None, cache_dir=None, calibration=None):
+    """
+    cache_dir keeps the exported/quantized ONNX files between runs; calibration
+    (an iterable of normalized CPU batches) recalibrates onnx-int8-static.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend '{name}'")
+    if threads:
+        torch.set_num_threads(threads)
+    if name == "eager":
+        return model
+    if name == "bf16":
+        return _Bf16(model, device)
+    if name == "compile":
+        return torch.compile(model)
+    if name == "int8":
+        if device.type != "cpu":
+            raise ValueError("int8 dynamic quantization runs on the CPU only")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".cache", "swarmind")
+    os.makedirs(cache_dir, exist_ok=True)
+    key = _fingerprint(model)
+    fp32_path = os.path.join(cache_dir, f"segformer-{key}.onnx")
+    if not os.path.exists(fp32_path):
+        print(f"[INFO] Exporting ONNX model to {fp32_path}...")
+        export_onnx(model, fp32_path)
+    if name == "onnx":
+        return _OnnxRuntime(fp32_path, threads)
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic, quantize_static
+    quantized_path = os.path.join(cache_dir, f"segformer-{key}.{name}.onnx")
+    if name == "onnx-int8":
+        if not os.path.exists(quantized_path):
+            quantize_dynamic(fp32_path, quantized_path, weight_type=QuantType.QInt8)
+    elif calibration is not None:
+        quantize_static(fp32_path, quantized_path, _CalibrationReader(calibration))
+    elif not os.path.exists(quantized_path):
+        # The calibrated model is reused by later runs
+        raise ValueError("onnx-int8-static is not calibrated yet; run inference_backends.py on a reference set first")
+    return _OnnxRuntime(quantized_path, threads)
+
+
+def mean_iou(pred, target, num_classes=7):
+    """mIoU of pred against target over the classes present in either."""
+    ious = []
+    for cls in range(num_classes):
+        p, t = pred == cls, target == cls
+        union = (p | t).sum().item()
+        if union:
+            ious.append((p & t).sum().item() / union)
+    return float(np.mean(ious)) if ious else 1.0
+
+
+if __name__ == "__main__":
+    import cv2
+    from frame_sources import open_frame_source
+    from model_artifact import load_artifact
+    from segmentation_engine import BatchedSegmenter, IMAGE_SIZE, MEAN, STD
+
+    parser = argparse.ArgumentParser(description="Accuracy vs speed of the inference backends against eager fp32")
+    parser.add_argument("--model", required=True, help="Model artifact (model_artifact.py export)")
+    parser.add_argument("--reference", required=True, help="Video or frame directory used as the reference set")
+    parser.add_argument("--limit", type=int, default=32, help="Reference frames to use")
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=4)
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    images = []
+    for frame in open_frame_source(args.reference, stride=args.stride):
+        images.append(frame["image"])
+        if len(images) >= args.limit:
+            break
+    if not images:
+        raise SystemExit(f"[ERROR] No frames in {args.reference}")
+
+    def calibration_batches():
+        mean = np.array(MEAN, dtype=np.float32) * 255.0
+        std = np.array(STD, dtype=np.float32) * 255.0
+        for image in images[:8]:
+            resized = cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE), interpolation=cv2.INTER_LINEAR).astype(np.float32)
+            yield torch.from_numpy(((resized - mean) / std).transpose(2, 0, 1)[None].copy())
+
+    reference = None
+    print(f"{'backend':<18}{'fps':>8}{'mIoU vs fp32':>14}{'pixels equal':>14}")
+    for name in ["eager"] + [b for b in args.backends if b != "eager"]:
+        model = load_artifact(args.model, device)
+        try:
+            calibration = calibration_batches() if name == "onnx-int8-static" else None
+            backend = build_backend(name, model, device, args.threads, calibration=calibration)
+        except Exception as e:
+            print(f"{name:<18}  unavailable: {e}")
+            continue
+        segmenter = BatchedSegmenter(backend, device, batch_size=args.batch_size)
+        segmenter.infer(images[:args.batch_size])  # Warm-up (compilation, graph optimization)
+        segmenter.frames, segmenter.busy = 0, 0.0
+        masks = torch.stack([torch.tensor(result["mask"]) for _, result in segmenter.infer(images)])  # Copies
+        segmenter.close()
+        if reference is None:
+            reference = masks
+        miou = float(np.mean([mean_iou(m, r) for m, r in zip(masks, reference)]))
+        equal = (masks == reference).float().mean().item()
+        print(f"{name:<18}{segmenter.frames / segmenter.busy:>8.2f}{miou:>14.4f}{equal:>14.2%}")
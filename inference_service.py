@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import queue
+import threading
+import time
+
+# Long-lived segmentation worker: the model is loaded once, on first use, and
+# jobs for any number of sources (videos, frame directories) run one after the
+# other on the worker thread, sharing the model and its batch buffers.
+
+
+class SegmentationJob:
+    def __init__(self, name, frames, handle_result):
+        self.name = name
+        self.frames = frames                # Iterable of frame dicts (see frame_sources)
+        self.handle_result = handle_result  # handle_result(frame, transformed, result)
+        self.status = "queued"              # queued -> running -> done | failed
+        self.processed = 0
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def fps(self):
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.time()) - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        waited = (self.started or time.time()) - self.submitted
+        line = f"{self.name}: {self.status}, {self.processed} frames, {self.fps():.2f} fps (queued {waited:.1f}s)"
+        return line + (f", error: {self.error}" if self.error else "")
+
+
+class InferenceService:
+    """
+    load_model()             -> model, called once on the worker thread
+    make_segmenter(model)    -> BatchedSegmenter
+    submit() queues a job and returns it; infer() runs a synchronous batch
+    (stream mode) between jobs on the same model.
+    """
+
+    def __init__(self, load_model, make_segmenter):
+        self.load_model = load_model
+        self.make_segmenter = make_segmenter
+        self.jobs = []
+        self.load_seconds = None
+        self._queue = queue.Queue()
+        self._segmenter = None
+        self._lock = threading.Lock()  # One batch on the model at a time
+        self._thread = threading.Thread(target=self._run, name="InferenceService", daemon=True)
+        self._thread.start()
+
+    def _get_segmenter(self):
+        if self._segmenter is None:
+            started = time.time()
+            self._segmenter = self.make_segmenter(self.load_model())
+            self.load_seconds = time.time() - started
+            print(f"[INFO] Model loaded in {self.load_seconds:.1f}s; it is reused for every job.")
+        return self._segmenter
+
+    def submit(self, name, frames, handle_result):
+        job = SegmentationJob(name, frames, handle_result)
+        self.jobs.append(job)
+        self._queue.put(job)
+        print(f"[INFO] Queued {name} (queue depth {self.queue_depth()}).")
+        return job
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def infer(self, images):
+        with self._lock:
+            return self._get_segmenter().infer(images)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            job.status = "running"
+            job.started = time.time()
+            try:
+                with self._lock:
+                    for frame, transformed, result in self._get_segmenter().segment(job.frames):
+                        job.handle_result(frame, transformed, result)
+                        job.processed += 1
+                job.status = "done"
+            except Exception as e:
+                job.status, job.error = "failed", e
+            job.finished = time.time()
+            print(f"[INFO] {job.summary()} | queue depth {self.queue_depth()}")
+            job._done.set()
+
+    def wait_all(self):
+        for job in list(self.jobs):
+            job.wait()
+
+    def report(self):
+        lines = [job.summary() for job in self.jobs]
+        if self._segmenter is not None:
+            lines.append(self._segmenter.report())
+        return "\n".join(lines)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._segmenter is not None:
+            self._segmenter.close()
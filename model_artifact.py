@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import zipfile
+from types import SimpleNamespace
+
+import torch
+
+# Self-contained SegFormer artifact: config + fine-tuned weights in one file,
+# so the segmentation script starts without the Hugging Face hub (or its cache)
+# and without building and randomly initializing a model it then overwrites.
+#   eager        torch.save({"format", "version", "config", "state_dict"})
+#   torchscript  traced module with the config in extra/config.json (no transformers import)
+
+HUB_MODEL = "nvidia/segformer-b3-finetuned-ade-512-512"
+NUM_LABELS = 7
+ARTIFACT_FORMAT = "swarmind-segformer"
+ARTIFACT_VERSION = 1
+
+
+def load_from_hub(weights_path, device):
+    """The former loader: hub config + pretrained model, then the local fine-tuned weights."""
+    from transformers import SegformerConfig, SegformerForSemanticSegmentation
+    config = SegformerConfig.from_pretrained(HUB_MODEL)
+    config.num_labels = NUM_LABELS
+    model = SegformerForSemanticSegmentation.from_pretrained(
+        HUB_MODEL, config=config, ignore_mismatched_sizes=True
+    ).to(device)
+    model.load_state_dict(torch.load(weights_path, map_location=device))
+    model.eval()
+    return model
+
+
+def export_artifact(model, path, torchscript=False, image_size=512):
+    config = model.config.to_dict()
+    if not torchscript:
+        torch.save({"format": ARTIFACT_FORMAT, "version": ARTIFACT_VERSION, "config": config,
+                    "state_dict": model.state_dict()}, path)
+        return path
+    model.config.torchscript = True  # Tuple outputs, which tracing needs
+    example = torch.zeros((2, 3, image_size, image_size), device=next(model.parameters()).device)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    model.config.torchscript = False
+    torch.jit.save(traced, path, _extra_files={"config.json": json.dumps(config)})
+    return path
+
+
+class _TracedSegformer(torch.nn.Module):
+    """Gives a traced module the `.logits` output of the transformers model."""
+
+    def __init__(self, traced, config):
+        super().__init__()
+        self.traced = traced
+        self.config = SimpleNamespace(**config)
+
+    def forward(self, pixel_values):
+        return SimpleNamespace(logits=self.traced(pixel_values)[0])
+
+
+def _is_torchscript(path):
+    with zipfile.ZipFile(path) as archive:
+        return any(name.endswith("extra/config.json") for name in archive.namelist())
+
+
+def load_artifact(path, device):
+    """Builds the model from an artifact; no hub access and no throwaway initialization."""
+    if _is_torchscript(path):
+        extra = {"config.json": ""}
+        traced = torch.jit.load(path, map_location=device, _extra_files=extra)
+        return _TracedSegformer(traced, json.loads(extra["config.json"])).eval()
+
+    artifact = torch.load(path, map_location=device)
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"'{path}' is not a SegFormer artifact (export it with model_artifact.py export)")
+    if artifact["version"] > ARTIFACT_VERSION:
+        raise ValueError(f"'{path}' has artifact version {artifact['version']}, newer than this loader")
+    from transformers import SegformerConfig, SegformerForSemanticSegmentation
+    config = SegformerConfig.from_dict(artifact["config"])
+    with torch.device("meta"):  # Parameters get no storage and no initialization
+        model = SegformerForSemanticSegmentation(config)
+    model.load_state_dict(artifact["state_dict"], assign=True)
+    missing = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers()) if tensor.is_meta]
+    if missing:
+        raise ValueError(f"'{path}' has no values for {', '.join(missing[:5])}")
+    return model.to(device).eval()
+
+
+def _cold_start(code):
+    """Seconds for a fresh interpreter to import and build the model (what every run pays)."""
+    started = time.time()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.time() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export / time the offline SegFormer artifact")
+    sub = parser.add_subparsers(dest="action", required=True)
+    export = sub.add_parser("export", help="Write the artifact from the hub config and the fine-tuned weights")
+    export.add_argument("--weights", required=True, help="Fine-tuned .pth state dict")
+    export.add_argument("--out", required=True)
+    export.add_argument("--torchscript", action="store_true", help="Trace the model (loads without transformers)")
+    bench = sub.add_parser("benchmark", help="Cold-start time of the hub loader vs the artifact loader")
+    bench.add_argument("--weights", required=True)
+    bench.add_argument("--artifact", required=True)
+    args = parser.parse_args()
+
+    if args.action == "export":
+        model = load_from_hub(args.weights, torch.device("cpu"))
+        export_artifact(model, args.out, torchscript=args.torchscript)
+        print(f"[INFO] Artifact written: {args.out}")
+    else:
+        setup = "import torch, model_artifact as m; d = torch.device('cpu'); "
+        hub = _cold_start(setup + f"m.load_from_hub({args.weights!r}, d)")
+        artifact = _cold_start(setup + f"m.load_artifact({args.artifact!r}, d)")
+        print(f"[INFO] Cold start: hub loader {hub:.2f}s, artifact loader {artifact:.2f}s "
+              f"({hub / artifact:.1f}x faster)")
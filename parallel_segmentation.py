@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import argparse
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+
+import torch
+
+import segment_and_detect_agriculture as sda
+from inference_backends import build_backend
+from inference_service import InferenceService
+
+# Runs several sources (videos, frame directories) at once on the CPU. One fp32
+# model is loaded in the parent and moved to shared memory; worker processes
+# are forked from it, so they share its weights instead of loading their own.
+# Each worker gets its slice of the cores (torch.set_num_threads, resize
+# threads) and takes sources from a common queue until none are left. Inside a
+# worker the I/O stages already overlap inference: video decoding on the
+# prefetch thread, resizing on the preprocessing pool, image and store writes
+# on the visualizer's threads.
+# On CUDA there is one device to share, so sources run on the single service
+# of segment_and_detect_agriculture instead (it batches them on the GPU).
+
+_model = None  # Set in the parent before the workers are forked
+
+
+def partition_threads(cores, workers):
+    """Splits cores over workers as evenly as possible, e.g. (6, 4) -> [2, 2, 1, 1]."""
+    return [cores // workers + (1 if k < cores % workers else 0) for k in range(workers)]
+
+
+def _worker(app, threads, tasks, results, output_root, options):
+    torch.set_num_threads(threads)
+    app.PREPROCESS_WORKERS = threads
+    app.INFERENCE_THREADS = threads
+    app._service = InferenceService(lambda: build_backend(app.BACKEND, _model, app.DEVICE, threads),
+                                    app.make_segmenter)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            number, input_path = task
+            started = time.time()
+            try:
+                job = app.process_frames(input_path, *app.drone_output_dirs(output_root, number), wait=True, **options)
+                status, processed, error = job.status, job.processed, job.error
+            except Exception as e:
+                status, processed, error = "failed", 0, e
+            results.put((input_path, status, processed, time.time() - started, str(error) if error else None))
+    finally:
+        app._service.close()
+        if app._visualizer is not None:
+            app._visualizer.close()
+        if app._store is not None:
+            app._store.close()
+
+
+def run_parallel(app, inputs, output_root, workers, cores=None, **options):
+    """
+    Segments inputs with up to `workers` processes sharing `cores` (default:
+    all). app is the segment_and_detect_agriculture module whose settings apply
+    (its __main__ passes itself); options are passed to process_frames.
+    Returns [(input_path, status, frames, seconds, error)] in completion order.
+    """
+    global _model
+    cores = cores or os.cpu_count() or 1
+    workers = max(1, min(workers, len(inputs), cores))
+    threads = partition_threads(cores, workers)
+    if _model is None:
+        _model = app.load_base_model()
+        _model.share_memory()
+    if app.BACKEND.startswith("onnx"):
+        build_backend(app.BACKEND, _model, app.DEVICE, 1)  # Exports/quantizes once, the workers use the cache
+    print(f"[INFO] {len(inputs)} sources on {workers} workers, threads per worker: {threads}")
+
+    context = multiprocessing.get_context("fork")
+    tasks, results = context.Queue(), context.Queue()
+    for number, input_path in enumerate(inputs, start=1):
+        tasks.put((number, input_path))
+    for _ in range(workers):
+        tasks.put(None)
+    processes = [context.Process(target=_worker, args=(app, t, tasks, results, output_root, options),
+                                 name=f"Segmentation-{k + 1}") for k, t in enumerate(threads)]
+    for process in processes:
+        process.start()
+
+    finished = []
+    while len(finished) < len(inputs):
+        try:
+            finished.append(results.get(timeout=1.0))
+            input_path, status, processed, seconds, error = finished[-1]
+            print(f"[INFO] {input_path}: {status}, {processed} frames in {seconds:.1f}s"
+                  + (f", error: {error}" if error else ""))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                print("[ERROR] Segmentation workers exited before finishing every source.")
+                break
+    for process in processes:
+        process.join()
+    return finished
+
+
+def benchmark(inputs, core_counts, seconds, stride):
+    """
+    Wall-clock throughput of the same workload per (cores, workers) layout;
+    one worker per source is compared with a single worker using every core.
+    Visualization and the results store are off, so this measures decode +
+    preprocessing + inference.
+    """
+    sda.VISUALIZATION, sda.STORE_DIR = "off", None
+    options = {"stride": stride, "time_range": (None, seconds) if seconds else None,
+               "skip_redundant": False, "rerun": True}
+    print(f"{'cores':>6}{'workers':>9}{'threads':>10}{'frames':>8}{'seconds':>9}{'fps':>8}{'speedup':>9}")
+    baseline = None
+    for cores in core_counts:
+        for workers in sorted({1, min(len(inputs), cores)}):
+            with tempfile.TemporaryDirectory() as output_root:
+                started = time.time()
+                finished = run_parallel(sda, inputs, output_root, workers, cores, **options)
+                elapsed = time.time() - started
+            frames = sum(processed for _, _, processed, _, _ in finished)
+            fps = frames / elapsed if elapsed > 0 else 0.0
+            baseline = baseline or fps
+            threads = "/".join(map(str, partition_threads(cores, workers)))
+            print(f"{cores:>6}{workers:>9}{threads:>10}{frames:>8}{elapsed:>9.1f}{fps:>8.2f}{fps / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark of parallel multi-source segmentation (CPU)")
+    parser.add_argument("--input", nargs="+", required=True, metavar="PATH", help="Sources, e.g. the two logger videos")
+    parser.add_argument("--model", default=sda.MODEL_ARTIFACT, help="Model artifact from model_artifact.py export")
+    parser.add_argument("--backend", default=sda.BACKEND)
+    parser.add_argument("--cores", nargs="+", type=int, default=None,
+                        help="Core counts to measure (default: 1, 2, 4, ... up to all cores)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Seconds of each video to process (0 = all)")
+    parser.add_argument("--stride", type=int, default=5)
+    args = parser.parse_args()
+
+    if sda.DEVICE.type != "cpu":
+        raise SystemExit("[ERROR] The scaling benchmark is for CPU inference (set CUDA_VISIBLE_DEVICES=\"\").")
+    sda.MODEL_ARTIFACT, sda.BACKEND = args.model, args.backend
+    total = os.cpu_count() or 1
+    core_counts = args.cores or sorted({min(2 ** k, total) for k in range(total.bit_length() + 1)})
+    benchmark(args.input, core_counts, args.seconds, args.stride)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import torch
+import torch.nn.functional as F
+
+from mask_refine import refine_mask
+
+# Batched post-processing on the inference device, from logits to compact
+# per-frame results in one pass: (optional upsampling of the logits) -> argmax
+# -> refinement -> per-class pixel fractions -> flags. Intermediate masks live
+# in preallocated device buffers; only the uint8 masks, the fractions and the
+# flags are copied back to the host.
+
+
+class PostProcessor:
+    """
+    upsample_logits  bilinear-upsample logits to out_size before argmax (sharper
+                     edges, refinement runs at full size); otherwise argmax and
+                     refinement run at logit resolution and the mask is returned
+                     small (consumers upsample with nearest, which changes no fraction)
+    flag_classes     {class_id: min_fraction}; a frame is flagged when any listed
+                     class covers more than its fraction (0 = any pixel)
+    """
+
+    def __init__(self, device, num_classes=7, out_size=512, upsample_logits=False,
+                 refine=refine_mask, flag_classes=None, max_batch=8):
+        self.device = device
+        self.num_classes = num_classes
+        self.out_size = out_size
+        self.upsample_logits = upsample_logits
+        self.refine = refine
+        self.flag_classes = flag_classes or {5: 0.0}
+        self.max_batch = max_batch
+        self._buffers = {}
+        self._flag_ids = torch.tensor(list(self.flag_classes), device=device)
+        self._flag_min = torch.tensor(list(self.flag_classes.values()), device=device)
+
+    def _buffer(self, key, count, shape, dtype):
+        """Rows [:count] of a reused device buffer, reallocated only when the size changes or the batch grows."""
+        buffer = self._buffers.get(key)
+        if buffer is None or tuple(buffer.shape[1:]) != tuple(shape) or buffer.shape[0] < count:
+            buffer = torch.empty((max(count, self.max_batch), *shape), dtype=dtype, device=self.device)
+            self._buffers[key] = buffer
+        return buffer[:count]
+
+    def run(self, logits):
+        """logits: (N, C, h, w) on the device. Returns [{"mask", "fractions", "flagged"}, ...] on the host."""
+        count = logits.shape[0]
+        with torch.no_grad():
+            if self.upsample_logits and logits.shape[-1] != self.out_size:
+                logits = F.interpolate(logits, size=(self.out_size, self.out_size), mode="bilinear",
+                                       align_corners=False)
+            labels = self._buffer("labels", count, logits.shape[-2:], torch.long)
+            torch.argmax(logits, dim=1, out=labels)
+            masks = self._buffer("masks", count, logits.shape[-2:], torch.uint8)
+            masks.copy_(self.refine(labels))
+
+            # Per-frame class histograms in one bincount: frame k counts into bins [k*C, (k+1)*C)
+            offsets = self._buffer("offsets", count, (1,), torch.long)
+            torch.mul(torch.arange(count, device=self.device).view(count, 1), self.num_classes, out=offsets)
+            flat = labels.view(count, -1)
+            flat.copy_(masks.view(count, -1)).add_(offsets)
+            counts = torch.bincount(flat.view(-1), minlength=count * self.num_classes).view(count, self.num_classes)
+            fractions = counts.float() / flat.shape[1]
+            flagged = (fractions[:, self._flag_ids] > self._flag_min).any(dim=1)
+
+            # The only device -> host copies: compact uint8 masks, fractions, flags. On the CPU
+            # .cpu() is a no-op, so the reused buffer is cloned: results outlive the next batch
+            masks_host = masks.clone().cpu().numpy() if masks.device.type == "cpu" else masks.cpu().numpy()
+            fractions_host = fractions.cpu().numpy()
+            flagged_host = flagged.cpu().numpy()
+        return [{"mask": masks_host[k], "fractions": fractions_host[k], "flagged": bool(flagged_host[k])}
+                for k in range(count)]
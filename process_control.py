@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+
+class ProcessJob:
+    """One queued unit of work: a list of (label, shell command) steps run in order for one key."""
+
+    def __init__(self, key, name, steps, delay=0.0):
+        self.key = key
+        self.name = name
+        self.steps = steps
+        self.delay = delay
+        self.cancelled = threading.Event()
+        self.process = None
+        self.timings = []  # (label, returncode, seconds) per finished step
+        self.started = None
+        self.finished = None
+        self.future = None
+
+    def summary(self):
+        parts = [f"{label} {seconds:.2f}s" + ("" if code == 0 else f" (rc {code})") for label, code, seconds in self.timings]
+        text = f"{self.name}: " + (", ".join(parts) if parts else "-")
+        return text + (" [cancelled]" if self.cancelled.is_set() else "")
+
+
+class ProcessExecutor:
+    """
+    Runs drone bring-up / teardown shell commands on worker threads so the Tk
+    thread never blocks on a shell. Each step is timed; step and job results
+    are handed back to the UI thread through a queue polled with after().
+    Submitting a new job for a key cancels the one still running for it
+    (e.g. "stop" kills a start that is still in its sleep).
+    Every job gets its own thread: a bring-up blocks ~50 s in delays and shell
+    sleeps, so a bounded pool would start a large swarm in waves.
+    """
+
+    def __init__(self, poll_ms=50):
+        self.poll_ms = poll_ms
+        self._closed = False
+        self._lock = threading.Lock()
+        self._jobs = {}            # key -> latest ProcessJob
+        self._events = queue.Queue()  # ("step" | "done", callback, job) for the Tk thread
+        self._root = None
+        self._poll_job = None
+        self._outstanding = 0      # Submitted jobs whose "done" event the Tk thread has not seen yet
+
+    def attach(self, tk_root):
+        self._root = tk_root
+
+    def submit(self, key, name, steps, delay=0.0, on_step=None, on_done=None):
+        """
+        Queues steps for key and returns the job (job.future resolves to the job).
+        on_step(job) / on_done(job) are called on the Tk thread.
+        """
+        job = ProcessJob(key, name, steps, delay)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProcessExecutor is shut down")
+            previous = self._jobs.get(key)
+            self._jobs[key] = job
+        if previous is not None:
+            self._cancel(previous)
+        self._outstanding += 1
+        job.future = Future()
+        threading.Thread(target=self._run, args=(job, on_step, on_done),
+                         name=f"ProcessJob-{key}", daemon=True).start()
+        if self._poll_job is None and self._root is not None:
+            self._poll_job = self._root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is not None:
+            self._cancel(job)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            self._cancel(job)
+
+    # ---------- worker side ----------
+    @staticmethod
+    def _cancel(job):
+        job.cancelled.set()
+        process = job.process
+        if process is not None and process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)  # The shell and everything it spawned
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def _run(self, job, on_step, on_done):
+        job.started = time.time()
+        try:
+            if job.delay > 0 and job.cancelled.wait(job.delay):
+                return job
+            for label, command in job.steps:
+                if job.cancelled.is_set():
+                    break
+                step_start = time.time()
+                job.process = subprocess.Popen(command, shell=True, text=True, start_new_session=True)
+                if job.cancelled.is_set():
+                    self._cancel(job)  # Cancelled while the shell was being spawned
+                returncode = job.process.wait()
+                job.process = None
+                job.timings.append((label, returncode, time.time() - step_start))
+                if on_step is not None:
+                    self._events.put(("step", on_step, job))
+        except Exception as e:
+            print(f"ERROR: Job '{job.name}' for {job.key} failed: {e}")
+        finally:
+            job.finished = time.time()
+            self._events.put(("done", on_done, job))
+            job.future.set_result(job)
+        return job
+
+    # ---------- Tk side ----------
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                kind, callback, job = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "done":
+                self._outstanding -= 1
+            if callback is not None:
+                try:
+                    callback(job)
+                except Exception as e:
+                    print(f"ERROR: Process callback for {job.key} failed: {e}")
+        if self._outstanding > 0:
+            self._poll_job = self._root.after(self.poll_ms, self._poll)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Per-output-directory record of what a segmentation run produced, so a re-run
+# skips frames that are up to date, resumes after a crash and only recomputes
+# what changed. JSON Lines, appended as frames finish (a torn last line after
+# a crash is ignored):
+#   {"type": "run", "input", "source", "params", "started"}   header
+#   {"type": "frame", "name", "index", "source", "fractions", "flagged"}
+#   {"type": "frame", "name", "index", "source", "skipped": reason}
+# Results count only while the header's input fingerprint and parameters match
+# the current run; otherwise the file is started over.
+
+MANIFEST_NAME = "segmentation_manifest.jsonl"
+
+
+def file_fingerprint(path, content_bytes=1 << 20):
+    """size + mtime, plus a hash of the first and last content_bytes (catches rewrites that keep the mtime)."""
+    if path is None or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        digest.update(f.read(content_bytes))
+        if stat.st_size > content_bytes:
+            f.seek(max(content_bytes, stat.st_size - content_bytes))
+            digest.update(f.read(content_bytes))
+    return f"{stat.st_size}-{stat.st_mtime_ns}-{digest.hexdigest()[:16]}"
+
+
+class ResultsManifest:
+    """
+    done(name) tells whether a frame is up to date; record()/record_skip() are
+    thread-safe and append right away. For frame directories every frame has
+    its own fingerprint, so only changed images are recomputed; a changed video
+    invalidates all of its frames.
+    """
+
+    def __init__(self, output_dir, input_path, params):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.input_path = input_path
+        self.per_frame = os.path.isdir(input_path)
+        self.source = None if self.per_frame else file_fingerprint(input_path)
+        self.params = json.loads(json.dumps(params))  # Same types as after a reload (tuples -> lists)
+        self.frames = {}  # name -> record
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        header, frames = None, {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn write from an interrupted run
+                    if record.get("type") == "run":
+                        header = record
+                    elif record.get("type") == "frame":
+                        frames[record["name"]] = record
+        if header is not None and header.get("input") == os.path.abspath(self.input_path) \
+                and header.get("source") == self.source and header.get("params") == self.params:
+            self.frames = frames
+            return
+        if header is not None:
+            print(f"[INFO] {self.input_path}: input or parameters changed, previous results are recomputed.")
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"type": "run", "input": os.path.abspath(self.input_path), "source": self.source,
+                                "params": self.params, "started": time.time()}) + "\n")
+
+    def _append(self, record):
+        # Opened per record: nothing to close, and every finished frame is on disk
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _frame_source(self, name):
+        if not self.per_frame:
+            return self.source
+        return file_fingerprint(os.path.join(self.input_path, name), content_bytes=0)
+
+    def done(self, name):
+        record = self.frames.get(name)
+        return record is not None and record.get("source") == self._frame_source(name)
+
+    def record(self, name, index, result):
+        self._record({"type": "frame", "name": name, "index": index, "source": self._frame_source(name),
+                      "fractions": [round(float(x), 5) for x in result["fractions"]],
+                      "flagged": bool(result["flagged"])})
+
+    def record_skip(self, name, index, reason):
+        self._record({"type": "frame", "name": name, "index": index, "source": self._frame_source(name),
+                      "skipped": reason})
+
+    def _record(self, record):
+        with self._lock:
+            self.frames[record["name"]] = record
+            self._append(record)
+            self.recorded += 1
+
+    def results(self):
+        """Frame records of the current run that were segmented (not skipped), in frame order."""
+        with self._lock:
+            records = [r for r in self.frames.values() if "fractions" in r]
+        return sorted(records, key=lambda r: r["index"])
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+# Compact, queryable segmentation results, so questions like "which frames have
+# more than 30 % agriculture" are answered without re-running the model or
+# opening a PNG:
+#   <root>/results.sqlite     one row per frame: source, name, index, GPS
+#                             position, flag and one fraction column per class,
+#                             indexed on the fractions and on (lat, lon)
+#   <root>/masks_NNNNN.npz    run-length encoded masks, chunk_frames per file,
+#                             one zip member per frame, so reading a mask
+#                             decompresses only that frame
+# Flagged frames are not copied: the row references the original (image path,
+# or video path + frame index) and export() extracts it on demand.
+
+STORE_DB = "results.sqlite"
+NUM_CLASSES = 7
+
+
+def encode_mask(mask):
+    """uint8 (H, W) labels -> (values uint8, lengths uint32) runs in row-major order."""
+    flat = np.ascontiguousarray(mask, dtype=np.uint8).ravel()
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size)).astype(np.uint32)
+    return flat[starts], lengths
+
+
+def decode_mask(values, lengths, shape):
+    return np.repeat(values, lengths).reshape(shape)
+
+
+class ResultsStore:
+    """
+    add() buffers a frame and commits chunk_frames at a time (or on flush());
+    the table rows are committed only after their chunk file is complete, and
+    on_committed() callbacks run then, so anything keyed on "this frame is
+    stored" never gets ahead of the disk. Thread-safe, and several processes
+    may write to the same store (chunk numbers are allocated by the database).
+    """
+
+    def __init__(self, root, chunk_frames=256, num_classes=NUM_CLASSES):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.chunk_frames = chunk_frames
+        self.num_classes = num_classes
+        self._lock = threading.Lock()
+        self._pending = []  # (row, values, lengths, on_committed)
+        self._db = sqlite3.connect(os.path.join(root, STORE_DB), timeout=60, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS chunks (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+        fractions = ", ".join(f"frac_{c} REAL" for c in range(num_classes))
+        self._db.execute(f"""CREATE TABLE IF NOT EXISTS frames (
+            id INTEGER PRIMARY KEY, source TEXT, name TEXT, frame_index INTEGER,
+            lat REAL, lon REAL, alt REAL, capture_time REAL, flagged INTEGER,
+            height INTEGER, width INTEGER, chunk INTEGER, member TEXT,
+            original TEXT, original_index INTEGER, {fractions},
+            UNIQUE (source, name))""")
+        for c in range(num_classes):
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS frames_frac_{c} ON frames (frac_{c})")
+        self._db.execute("CREATE INDEX IF NOT EXISTS frames_position ON frames (lat, lon)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS frames_flagged ON frames (flagged, source)")
+        self._db.commit()
+
+    def add(self, source, frame, result, on_committed=None):
+        """
+        source is the input path; frame a frame_sources dict, result the
+        post-processing output ({"mask", "fractions", "flagged"}).
+        """
+        meta = frame["meta"] or {}
+        has_fix = meta and meta.get("fix_age", 0) >= 0
+        if os.path.isdir(source):
+            original, original_index = os.path.join(source, frame["name"]), None
+        else:
+            original, original_index = source, frame["index"]
+        values, lengths = encode_mask(result["mask"])
+        row = {"source": os.path.abspath(source), "name": frame["name"], "frame_index": frame["index"],
+               "lat": meta.get("lat") if has_fix else None, "lon": meta.get("lon") if has_fix else None,
+               "alt": meta.get("alt") if has_fix else None, "capture_time": meta.get("capture_time"),
+               "flagged": int(bool(result["flagged"])), "height": result["mask"].shape[0],
+               "width": result["mask"].shape[1], "original": os.path.abspath(original),
+               "original_index": original_index}
+        for c, fraction in enumerate(result["fractions"][:self.num_classes]):
+            row[f"frac_{c}"] = float(fraction)
+        with self._lock:
+            self._pending.append((row, values, lengths, on_committed))
+            if len(self._pending) >= self.chunk_frames:
+                self._commit()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._commit()
+
+    def _commit(self):
+        pending, self._pending = self._pending, []
+        chunk = self._db.execute("INSERT INTO chunks DEFAULT VALUES").lastrowid
+        self._db.commit()
+        arrays = {}
+        for slot, (row, values, lengths, _) in enumerate(pending):
+            row["chunk"], row["member"] = chunk, f"f{slot}"
+            arrays[f"f{slot}_values"], arrays[f"f{slot}_lengths"] = values, lengths
+        path = self._chunk_path(chunk)
+        np.savez_compressed(path + ".tmp.npz", **arrays)
+        os.replace(path + ".tmp.npz", path)  # A chunk file is either complete or absent
+        columns = list(pending[0][0])
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO frames ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [[row[c] for c in columns] for row, _, _, _ in pending])
+        self._db.commit()
+        for _, _, _, on_committed in pending:
+            if on_committed is not None:
+                on_committed()
+
+    def _chunk_path(self, chunk):
+        return os.path.join(self.root, f"masks_{chunk:05d}.npz")
+
+    def query(self, min_fraction=None, max_fraction=None, bbox=None, flagged=None, source=None, limit=None):
+        """
+        Frame rows (dicts) in source/frame order, filtered through the indexes:
+          min_fraction / max_fraction  {class_id: fraction}
+          bbox                         (lat_min, lon_min, lat_max, lon_max)
+        """
+        clauses, params = [], []
+        for cls, fraction in (min_fraction or {}).items():
+            clauses.append(f"frac_{int(cls)} > ?")
+            params.append(fraction)
+        for cls, fraction in (max_fraction or {}).items():
+            clauses.append(f"frac_{int(cls)} <= ?")
+            params.append(fraction)
+        if bbox is not None:
+            clauses.append("lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?")
+            params += [bbox[0], bbox[2], bbox[1], bbox[3]]
+        if flagged is not None:
+            clauses.append("flagged = ?")
+            params.append(int(flagged))
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(os.path.abspath(source))
+        sql = "SELECT * FROM frames"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY source, frame_index"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            return [dict(zip(columns, values)) for values in cursor.fetchall()]
+
+    def masks(self, rows):
+        """Yields (row, mask) for the rows, opening each chunk once and reading only the rows' members."""
+        by_chunk = {}
+        for row in rows:
+            by_chunk.setdefault(row["chunk"], []).append(row)
+        for chunk, chunk_rows in sorted(by_chunk.items()):
+            with np.load(self._chunk_path(chunk)) as arrays:
+                for row in chunk_rows:
+                    member = row["member"]
+                    yield row, decode_mask(arrays[f"{member}_values"], arrays[f"{member}_lengths"],
+                                           (row["height"], row["width"]))
+
+    def originals(self, rows):
+        """Yields (row, RGB image) from the referenced originals; each video is opened once and only seeks to the rows."""
+        import cv2
+        by_video = {}
+        for row in rows:
+            if row["original_index"] is None:
+                bgr = cv2.imread(row["original"])
+                if bgr is None:
+                    print(f"[WARNING] Original not found: {row['original']}")
+                    continue
+                yield row, cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            else:
+                by_video.setdefault(row["original"], []).append(row)
+        for path, video_rows in by_video.items():
+            cap = cv2.VideoCapture(path)
+            position = None
+            for row in sorted(video_rows, key=lambda r: r["original_index"]):
+                if position != row["original_index"]:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, row["original_index"])
+                ok, bgr = cap.read()
+                position = row["original_index"] + 1
+                if not ok:
+                    print(f"[WARNING] Frame {row['original_index']} not readable in {path}")
+                    continue
+                yield row, cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            cap.release()
+
+    def export(self, rows, dest_dir, what="originals", palette=None):
+        """Writes the rows' originals (as PNGs) or masks (palette PNGs when a palette is given) to dest_dir."""
+        from PIL import Image
+        os.makedirs(dest_dir, exist_ok=True)
+        count = 0
+        items = self.originals(rows) if what == "originals" else self.masks(rows)
+        for row, array in items:
+            stem = os.path.splitext(row["name"])[0]
+            image = Image.fromarray(array)
+            if what == "masks" and palette is not None:
+                image.putpalette(palette)
+            image.save(os.path.join(dest_dir, f"{stem}.png" if what == "originals" else f"{stem}_mask.png"))
+            count += 1
+        return count
+
+    def to_csv(self, path, rows=None):
+        rows = self.query() if rows is None else rows
+        columns = ["source", "name", "frame_index", "lat", "lon", "alt", "capture_time", "flagged"] + \
+                  [f"frac_{c}" for c in range(self.num_classes)]
+        with open(path, "w") as f:
+            f.write(",".join(columns) + "\n")
+            for row in rows:
+                f.write(",".join("" if row[c] is None else str(row[c]) for c in columns) + "\n")
+
+    def stats(self):
+        """Frame count and total mask bytes on disk."""
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM frames").fetchone()[0]
+        size = sum(os.path.getsize(os.path.join(self.root, f)) for f in os.listdir(self.root) if f.startswith("masks_"))
+        return count, size
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+def _fraction_filter(items):
+    """["5:0.3", ...] -> {5: 0.3}"""
+    result = {}
+    for item in items or []:
+        cls, fraction = item.split(":")
+        result[int(cls)] = float(fraction)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query and export stored segmentation results")
+    parser.add_argument("store", help="Results store directory")
+    parser.add_argument("--min", nargs="*", metavar="CLASS:FRACTION", help="e.g. 5:0.3 = more than 30 %% agriculture")
+    parser.add_argument("--max", nargs="*", metavar="CLASS:FRACTION")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("LAT_MIN", "LON_MIN", "LAT_MAX", "LON_MAX"))
+    parser.add_argument("--flagged", action="store_true", help="Flagged frames only")
+    parser.add_argument("--source", help="Limit to one input video/directory")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--csv", help="Write the matching rows to this CSV")
+    parser.add_argument("--export", help="Directory to export the matching frames to")
+    parser.add_argument("--what", choices=("originals", "masks"), default="originals")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.store, STORE_DB)):
+        raise SystemExit(f"[ERROR] No results store in {args.store}")
+    store = ResultsStore(args.store)
+    rows = store.query(_fraction_filter(args.min), _fraction_filter(args.max), args.bbox,
+                       True if args.flagged else None, args.source, args.limit)
+    for row in rows:
+        position = f"{row['lat']:.6f},{row['lon']:.6f}" if row["lat"] is not None else "-"
+        fractions = " ".join(f"{row[f'frac_{c}']:.3f}" for c in range(store.num_classes))
+        print(f"{os.path.basename(row['source'])} {row['name']} {position} {'*' if row['flagged'] else ' '} {fractions}")
+    print(f"[INFO] {len(rows)} matching frames")
+    if args.csv:
+        store.to_csv(args.csv, rows)
+        print(f"[INFO] Rows written to {args.csv}")
+    if args.export:
+        palette = None
+        if args.what == "masks":
+            from segment_and_detect_agriculture import label_colors
+            from visualization import build_palette
+            palette = build_palette(label_colors).flatten().tolist()
+        count = store.export(rows, args.export, args.what, palette)
+        print(f"[INFO] {count} {args.what} exported to {args.export}")
+    store.close()
@@ -1,40 +1,53 @@
 import os
+import io
+import sys
+import time
+import argparse
 import torch
-import torch.nn.functional as F
 from PIL import Image
 import numpy as np
-import albumentations as A
-from albumentations.pytorch import ToTensorV2
-from transformers import SegformerConfig, SegformerForSemanticSegmentation
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import shutil
+from frame_bus import FrameRingReader, frame_ring_name
+from frame_sources import open_frame_source
+from frame_filter import RedundancyFilter
+from mask_refine import refine_mask, reference_refine, AGRICULTURE_RULES, REFINE_MODES
+from segmentation_engine import BatchedSegmenter
+from inference_service import InferenceService
+from model_artifact import load_artifact, load_from_hub
+from inference_backends import build_backend, BACKENDS
+from visualization import Visualizer, VISUALIZATION_MODES
+from results_manifest import ResultsManifest, file_fingerprint, MANIFEST_NAME
+from results_store import ResultsStore
 
 # ==================== Settings ====================
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 MODEL_PATH = "/home/arda/Masaüstü/SP-494/Video_Output/best_segformer_b3_ema_.pth"  # Model weight file
-
-# ==================== Image Transformations ====================
-transform = A.Compose([
-    A.Resize(512, 512),
-    A.Normalize(mean=(0.485, 0.456, 0.406), std=(0.229, 0.224, 0.225)),
-    ToTensorV2()
-])
+# Offline config + weights (python model_artifact.py export --weights MODEL_PATH --out MODEL_ARTIFACT)
+MODEL_ARTIFACT = "/home/arda/Masaüstü/SP-494/Video_Output/segformer_b3_agriculture.pt"
+REFINE_MODE = "exact"      # "exact": same result as the former pixel loop, "fast": one parallel 3x3 pass
+VALIDATE_REFINE = False    # Compare every refined mask with the reference loop (slow, for checking)
+BACKEND = "eager"          # eager, bf16, compile, int8, onnx... (inference_backends.py compares them)
+INFERENCE_THREADS = None   # Intra-op threads of the model; None = library default
+VISUALIZATION = "full"     # "off", "masks" (palette PNG) or "full" (input | mask | legend panel)
+UPSAMPLE_LOGITS = False    # Upsample logits to 512 before argmax (refinement then runs at 512 too)
+BATCH_SIZE = 4             # Frames per forward pass (their flipped TTA copies run in the same pass)
+PREPROCESS_WORKERS = None  # Resize threads; None = one per core
+STORE_DIR = None           # Results store (masks + per-frame statistics, see results_store); None = off
+COPY_FLAGGED = False       # With a store, flagged frames are references; True also copies them as before
 
 def unnormalize(img_tensor):
     mean = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1).to(img_tensor.device)
     std = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1).to(img_tensor.device)
     return img_tensor * std + mean
 
-def refine_agriculture_class(pred_mask):
-    refined = pred_mask.clone()
-    h, w = refined.shape
-    for i in range(1, h - 1):
-        for j in range(1, w - 1):
-            if refined[i, j] == 1:
-                local_patch = refined[i-1:i+2, j-1:j+2]
-                if (local_patch == 5).sum() >= 3:
-                    refined[i, j] = 5
+def refine_agriculture_class(pred_mask, mode=None):
+    """Merges "Other" pixels surrounded by agriculture into agriculture (see mask_refine). Accepts (N, H, W) too."""
+    refined = refine_mask(pred_mask, AGRICULTURE_RULES, mode or REFINE_MODE)
+    if VALIDATE_REFINE:
+        masks, outputs = pred_mask.reshape(-1, *pred_mask.shape[-2:]), refined.reshape(-1, *refined.shape[-2:])
+        mismatches = sum(int((out != reference_refine(mask, AGRICULTURE_RULES)).sum())
+                         for mask, out in zip(masks, outputs))
+        if mismatches:
+            print(f"[WARNING] Refinement ({mode or REFINE_MODE}) differs from the reference loop in {mismatches} pixels")
     return refined
 
 label_colors = {
@@ -57,107 +70,323 @@ label_names = {
     6: "Forest"
 }
 
-def mask_has_agriculture(mask_arr, agriculture_label=5):
-    """Checks if the agriculture label is present in the numpy mask."""
-    return (mask_arr == agriculture_label).any()
+def load_base_model():
+    """The fp32 model, before the inference backend is applied."""
+    if os.path.exists(MODEL_ARTIFACT):
+        return load_artifact(MODEL_ARTIFACT, DEVICE)
+    print(f"[WARNING] {MODEL_ARTIFACT} not found; building the model from the Hugging Face hub. "
+          f"Export it once with: python model_artifact.py export --weights {MODEL_PATH} --out {MODEL_ARTIFACT}")
+    return load_from_hub(MODEL_PATH, DEVICE)
+
+def load_model():
+    model = load_base_model()
+    if BACKEND != "eager":
+        print(f"[INFO] Inference backend: {BACKEND}")
+    return build_backend(BACKEND, model, DEVICE, INFERENCE_THREADS)
+
+def make_segmenter(model):
+    return BatchedSegmenter(model, DEVICE, batch_size=BATCH_SIZE, workers=PREPROCESS_WORKERS,
+                            refine=refine_agriculture_class, upsample_logits=UPSAMPLE_LOGITS)
+
+_service = None
+_visualizer = None
+_store = None
+
+def get_service():
+    """Process-wide inference service; the model is loaded once, on first use, for every source."""
+    global _service
+    if _service is None:
+        _service = InferenceService(load_model, make_segmenter)
+    return _service
+
+def get_visualizer():
+    """Shared output writer (background threads); closed at the end of the run."""
+    global _visualizer
+    if _visualizer is None:
+        _visualizer = Visualizer(label_colors, label_names, mode=VISUALIZATION)
+    return _visualizer
+
+def get_store():
+    """Shared results store, or None when STORE_DIR is not set."""
+    global _store
+    if _store is None and STORE_DIR is not None:
+        _store = ResultsStore(STORE_DIR)
+    return _store
 
-def process_frames(input_dir, output_dir, agriculture_detect_dir=None, frames_original_dir=None):
+def save_frame_outputs(image_name, transformed, result, output_dir, save_original,
+                       agriculture_detect_dir=None, frames_original_dir=None, on_written=None):
+    """
+    Queues the visualization and the agriculture copies on the visualizer's
+    threads. result is the segmenter's post-processing output; its "flagged"
+    says whether the frame contains agriculture, which is returned.
+    save_original(dest_dir) stores the source frame; on_written() runs once
+    the frame's files are on disk.
+    """
+    agriculture = result["flagged"]
+    visualizer = get_visualizer()
+    # Copies: transformed is a view into the segmenter's reused input buffer
+    image_rgb = None
+    if visualizer.mode == "full":
+        image_rgb = (unnormalize(transformed[0]).clamp(0, 1) * 255).round().byte().permute(1, 2, 0).cpu().numpy()
+    visualizer.save(image_name, image_rgb, result["mask"], output_dir, save_original,
+                    agriculture_detect_dir, frames_original_dir, agriculture, on_written)
+    if agriculture and agriculture_detect_dir is not None:
+        print(f"[INFO] Agriculture detected: {image_name}")
+    return agriculture
+
+def run_params(skip_redundant, min_displacement_m):
+    """Everything besides the input that changes a frame's results; a change recomputes the frames."""
+    model_path = MODEL_ARTIFACT if os.path.exists(MODEL_ARTIFACT) else MODEL_PATH
+    return {"model": file_fingerprint(model_path), "backend": BACKEND, "refine": REFINE_MODE,
+            "upsample_logits": UPSAMPLE_LOGITS, "visualization": VISUALIZATION,
+            "skip_redundant": skip_redundant, "min_displacement": min_displacement_m,
+            "store": os.path.abspath(STORE_DIR) if STORE_DIR else None}
+
+def _make_output_dirs(output_dir, agriculture_detect_dir, frames_original_dir):
     os.makedirs(output_dir, exist_ok=True)
     if agriculture_detect_dir is not None:
         os.makedirs(agriculture_detect_dir, exist_ok=True)
     if frames_original_dir is not None:
         os.makedirs(frames_original_dir, exist_ok=True)
 
-    frame_files = sorted([
-        f for f in os.listdir(input_dir) if f.lower().endswith(('.jpg', '.jpeg', '.png'))
-    ])
-
-    # ==================== Model Loading ====================
-    config = SegformerConfig.from_pretrained("nvidia/segformer-b3-finetuned-ade-512-512")
-    config.num_labels = 7
-    model = SegformerForSemanticSegmentation.from_pretrained(
-        "nvidia/segformer-b3-finetuned-ade-512-512",
-        config=config,
-        ignore_mismatched_sizes=True
-    ).to(DEVICE)
-    model.load_state_dict(torch.load(MODEL_PATH, map_location=DEVICE))
-    model.eval()
-
-    for image_name in frame_files:
-        image_path = os.path.join(input_dir, image_name)
-        img_pil = Image.open(image_path).convert("RGB")
-        img_np = np.array(img_pil)
-        transformed = transform(image=img_np)["image"].unsqueeze(0).to(DEVICE)
-
-        with torch.no_grad():
-            img_flip = torch.flip(transformed, dims=[3])
-            out1 = model(transformed).logits
-            out2 = model(img_flip).logits
-            out2 = torch.flip(out2, dims=[3])
-            output = (out1 + out2) / 2
-            pred_mask = output.argmax(dim=1)[0]
-
-        refined_small = refine_agriculture_class(pred_mask.cpu())
-        refined_resized = F.interpolate(
-            refined_small.unsqueeze(0).unsqueeze(0).float(), size=(512, 512), mode='nearest'
-        ).squeeze().long()
-
-        # Color the mask
-        pred_rgb = np.zeros((512, 512, 3), dtype=np.uint8)
-        for cls_id, color in label_colors.items():
-            pred_rgb[refined_resized == cls_id] = color
-
-        # Unnormalize original image
-        unnorm = unnormalize(transformed[0]).permute(1, 2, 0).cpu().numpy()
-
-        # ========== Save with matplotlib ==========
-        fig, axs = plt.subplots(1, 3, figsize=(18, 8), gridspec_kw={'width_ratios': [3, 3, 1]})
-        axs[0].imshow(np.clip(unnorm, 0, 1))
-        axs[0].set_title(f"Input: {image_name}")
-        axs[0].axis("off")
-
-        axs[1].imshow(pred_rgb)
-        axs[1].set_title("Refined Prediction")
-        axs[1].axis("off")
-
-        legend_patches = [
-            mpatches.Patch(color=np.array(color)/255.0, label=label_names[cls_id])
-            for cls_id, color in label_colors.items()
-        ]
-        axs[2].legend(handles=legend_patches, loc="center left", fontsize=10)
-        axs[2].axis("off")
-        axs[2].set_title("Legend")
-
-        plt.tight_layout()
-        save_path = os.path.join(output_dir, f"{os.path.splitext(image_name)[0]}_viz.png")
-        plt.savefig(save_path)
-        plt.close(fig)
-        print(f"[INFO] Kayıt yapıldı: {save_path}")
-
-        # --- Copy the frames containing Agriculture to a separate folder ---
-        if agriculture_detect_dir is not None and frames_original_dir is not None:
-            # Check mask (use mask's label array)
-            if mask_has_agriculture(refined_resized.numpy(), agriculture_label=5):
-                # Copy the first mask (its visualized form).
-                dest_mask_path = os.path.join(agriculture_detect_dir, os.path.basename(save_path))
-                shutil.copy(save_path, dest_mask_path)
-                # Also copy the second original frame.
-                dest_img_path = os.path.join(frames_original_dir, image_name)
-                shutil.copy(image_path, dest_img_path)
-                print(f"[INFO] Agriculture detected: {image_name} ({dest_mask_path})")
+def process_frames(input_path, output_dir, agriculture_detect_dir=None, frames_original_dir=None,
+                   stride=1, time_range=None, every_metres=None, skip_redundant=True, min_displacement_m=None,
+                   wait=True, rerun=False):
+    """
+    input_path is a directory of frames or a video file. Videos are decoded
+    directly (no frame extraction to disk); stride, time_range=(start_s, end_s)
+    and every_metres (from the <video>.meta sidecar) select which frames run.
+    With skip_redundant, near-duplicates of the last processed frame are skipped
+    (GPS displacement below min_displacement_m, else perceptual hash / MAD).
+    The source is queued as a job on the shared inference service; with
+    wait=False the job is returned right away so several sources can be queued.
+    Frames already in output_dir's results manifest with the same input and
+    parameters are skipped (rerun=True starts over), so an interrupted run
+    resumes where it stopped. With a results store, masks and statistics are
+    stored there and flagged frames are referenced instead of copied.
+    """
+    store = get_store()
+    if store is not None and not COPY_FLAGGED:
+        agriculture_detect_dir = frames_original_dir = None
+    _make_output_dirs(output_dir, agriculture_detect_dir, frames_original_dir)
+    if rerun and os.path.exists(os.path.join(output_dir, MANIFEST_NAME)):
+        os.remove(os.path.join(output_dir, MANIFEST_NAME))
+    manifest = ResultsManifest(output_dir, input_path, run_params(skip_redundant, min_displacement_m))
+    up_to_date = 0
+
+    # Asked by the frame source before decoding, so finished frames cost no decode
+    def already_done(name):
+        nonlocal up_to_date
+        if manifest.done(name):
+            up_to_date += 1
+            return True
+        return False
+
+    source = open_frame_source(input_path, stride=stride, time_range=time_range, every_metres=every_metres,
+                               skip=already_done)
+    redundancy = RedundancyFilter(min_displacement_m=min_displacement_m) if skip_redundant else None
+
+    # Runs on the segmenter's feeder thread, ahead of inference
+    def pending_frames():
+        for frame in source:
+            if redundancy is not None:
+                keep, reason = redundancy.check(frame["image"], frame["meta"])
+                if not keep:
+                    manifest.record_skip(frame["name"], frame["index"], reason)
+                    continue
+            yield frame
+        if up_to_date:
+            print(f"[INFO] {input_path}: {up_to_date} frames already up to date in {manifest.path}")
+        if redundancy is not None:
+            print(f"[INFO] {input_path}: {redundancy.report()}")
+
+    def handle_result(frame, transformed, result):
+        # Recorded only once the outputs are written (and stored), so a crash never marks a frame done early
+        def on_written():
+            if store is None:
+                manifest.record(frame["name"], frame["index"], result)
+            else:
+                store.add(input_path, frame, result,
+                          on_committed=lambda: manifest.record(frame["name"], frame["index"], result))
+
+        save_frame_outputs(
+            frame["name"], transformed, result, output_dir, frame["save_original"],
+            agriculture_detect_dir, frames_original_dir, on_written=on_written
+        )
+
+    job = get_service().submit(input_path, pending_frames(), handle_result)
+    if wait:
+        job.wait()
+    return job
+
+def drone_output_dirs(output_root, drone_id):
+    return (os.path.join(output_root, f"output_video_{drone_id}_detect"),
+            os.path.join(output_root, f"output_video_{drone_id}_Agriculture_detect"),
+            os.path.join(output_root, f"output_video_{drone_id}_Agriculture_frames"))
+
+# ==================== Streaming Mode ====================
+def process_stream(drone_ids, output_root, idle_exit=None, poll_interval=0.05,
+                   skip_redundant=True, min_displacement_m=None):
+    """
+    Long-running worker: consumes the loggers' "analysis" frame rings during the
+    flight, in order and with backpressure (loggers drop new samples rather than
+    overwrite unread ones). Exits after idle_exit seconds without frames once a
+    stream has been attached, or on Ctrl+C.
+    """
+    dirs = {did: drone_output_dirs(output_root, did) for did in drone_ids}
+    for did in drone_ids:
+        _make_output_dirs(*dirs[did])
+    service = get_service()
+    readers = {}
+    redundancy = {did: RedundancyFilter(min_displacement_m=min_displacement_m) for did in drone_ids} if skip_redundant else {}
+    processed = 0
+    last_frame_time = time.time()
+    print(f"[INFO] Streaming segmentation started for drones {', '.join(map(str, drone_ids))}.")
+    try:
+        while True:
+            got_frame = False
+            pending = []  # One frame per drone per round, segmented as one batch
+            for did in drone_ids:
+                reader = readers.get(did)
+                if reader is None:
+                    try:
+                        reader = readers[did] = FrameRingReader(frame_ring_name(did, "analysis"))
+                        print(f"[INFO] Drone {did} analysis stream attached.")
+                    except (FileNotFoundError, ValueError):
+                        continue
+                frame = reader.consume(from_start=True)
+                if frame is None:
+                    continue
+                got_frame = True
+                img_np = np.array(Image.open(io.BytesIO(frame["payload"])).convert("RGB"))
+                if did in redundancy and not redundancy[did].check(img_np, frame)[0]:
+                    continue
+                pending.append((did, frame, img_np))
+
+            results = service.infer([img_np for _, _, img_np in pending]) if pending else []
+            for (did, frame, _), (transformed, result) in zip(pending, results):
+                image_name = f"drone{did}_frame_{frame['frame_number']:06d}.jpg"
+
+                def save_original(dest_dir, payload=frame["payload"], name=image_name):
+                    with open(os.path.join(dest_dir, name), "wb") as f:
+                        f.write(payload)
+
+                save_frame_outputs(image_name, transformed, result, dirs[did][0], save_original,
+                                   dirs[did][1], dirs[did][2])
+                processed += 1
+                reader = readers[did]
+                print(f"[INFO] Drone {did} frame {frame['frame_number']} "
+                      f"({frame['lat']:.6f}, {frame['lon']:.6f}) latency {time.time() - frame['timestamp']:.2f}s"
+                      + (f", {reader.missed} missed" if reader.missed else ""))
+
+            now = time.time()
+            if got_frame:
+                last_frame_time = now
+            elif idle_exit is not None and readers and now - last_frame_time > idle_exit:
+                print(f"[INFO] No frames for {idle_exit:.0f}s, stream finished.")
+                break
+            else:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("[INFO] Streaming segmentation stopped.")
+    finally:
+        for reader in readers.values():
+            reader.close()
+    print(f"[INFO] {processed} streamed frames processed.")
+    for did, frame_filter in redundancy.items():
+        print(f"[INFO] Drone {did}: {frame_filter.report()}")
 
 if __name__ == "__main__":
-    # First Video
-    process_frames(
-        input_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_1_frames",
-        output_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_1_detect",
-        agriculture_detect_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_1_Agriculture_detect",
-        frames_original_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_1_Agriculture_frames"
-    )
-    # 2.Second Video
-    process_frames(
-        input_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_with_gps_2_frames",
-        output_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_2_detect",
-        agriculture_detect_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_2_Agriculture_detect",
-        frames_original_dir="/home/arda/Masaüstü/SP-494/Video_Output/output_video_2_Agriculture_frames"
-    )
+    parser = argparse.ArgumentParser(description="SegFormer agriculture segmentation")
+    parser.add_argument("--stream", nargs="+", type=int, metavar="DRONE_ID",
+                        help="Consume the loggers' shared-memory analysis streams of these drones during the flight")
+    parser.add_argument("--output-root", default="/home/arda/Masaüstü/SP-494/Video_Output")
+    parser.add_argument("--idle-exit", type=float, default=None,
+                        help="Streaming: exit after this many seconds without new frames")
+    parser.add_argument("--input", nargs="+", metavar="PATH",
+                        help="Video files or frame directories (default: both logger videos)")
+    parser.add_argument("--stride", type=int, default=1, help="Process every N-th frame")
+    parser.add_argument("--start", type=float, default=None, help="Video start time in seconds")
+    parser.add_argument("--end", type=float, default=None, help="Video end time in seconds")
+    parser.add_argument("--every-metres", type=float, default=None,
+                        help="Process a frame each time the drone moved this far (uses the .meta sidecar)")
+    parser.add_argument("--keep-redundant", action="store_true",
+                        help="Do not skip frames that are near-duplicates of the last processed one")
+    parser.add_argument("--min-displacement", type=float, default=None,
+                        help="Skip frames taken less than this many metres from the last processed one")
+    parser.add_argument("--refine-mode", choices=REFINE_MODES, default=REFINE_MODE,
+                        help="exact: same masks as the sequential loop, fast: parallel update from the raw mask")
+    parser.add_argument("--validate-refine", action="store_true",
+                        help="Check every refined mask against the reference loop")
+    parser.add_argument("--model", default=MODEL_ARTIFACT, help="Model artifact from model_artifact.py export")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND,
+                        help="Inference backend; compare speed and mIoU drift with inference_backends.py")
+    parser.add_argument("--threads", type=int, default=INFERENCE_THREADS, help="Intra-op threads of the model")
+    parser.add_argument("--visualization", choices=VISUALIZATION_MODES, default=VISUALIZATION,
+                        help="off: no images, masks: palette-mode mask PNGs, full: input/mask/legend panels")
+    parser.add_argument("--upsample-logits", action="store_true",
+                        help="Argmax and refine at 512x512 instead of the 128x128 logit resolution")
+    parser.add_argument("--rerun", action="store_true",
+                        help="Ignore the results manifest and process every frame again")
+    parser.add_argument("--store", default=None,
+                        help="Results store directory (default: <output-root>/results_store); query it with results_store.py")
+    parser.add_argument("--no-store", action="store_true", help="Do not keep masks and statistics in a results store")
+    parser.add_argument("--copy-flagged", action="store_true",
+                        help="Also copy flagged frames to the *_Agriculture_* directories")
+    parser.add_argument("--parallel", type=int, default=1, metavar="N",
+                        help="CPU: segment up to N sources at once in worker processes sharing the cores "
+                             "(scaling benchmark: parallel_segmentation.py)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Frames per forward pass (flipped TTA copies share the pass)")
+    parser.add_argument("--workers", type=int, default=PREPROCESS_WORKERS,
+                        help="Preprocessing threads (default: one per core)")
+    args = parser.parse_args()
+    MODEL_ARTIFACT = args.model
+    BACKEND = args.backend
+    INFERENCE_THREADS = args.threads
+    VISUALIZATION = args.visualization
+    UPSAMPLE_LOGITS = args.upsample_logits
+    BATCH_SIZE = args.batch_size
+    PREPROCESS_WORKERS = args.workers
+    REFINE_MODE = args.refine_mode
+    VALIDATE_REFINE = args.validate_refine
+    if not args.stream and not args.no_store:
+        STORE_DIR = args.store or os.path.join(args.output_root, "results_store")
+    COPY_FLAGGED = args.copy_flagged
+
+    if args.stream:
+        process_stream(args.stream, args.output_root, idle_exit=args.idle_exit,
+                       skip_redundant=not args.keep_redundant, min_displacement_m=args.min_displacement)
+    else:
+        inputs = args.input or [
+            os.path.join(args.output_root, f"output_video_with_gps_{i}.avi") for i in (1, 2)
+        ]
+        time_range = (args.start, args.end) if args.start is not None or args.end is not None else None
+        options = dict(stride=args.stride, time_range=time_range, every_metres=args.every_metres,
+                       skip_redundant=not args.keep_redundant, min_displacement_m=args.min_displacement,
+                       rerun=args.rerun)
+        if args.parallel > 1 and DEVICE.type == "cpu" and len(inputs) > 1:
+            from parallel_segmentation import run_parallel
+            finished = run_parallel(sys.modules[__name__], inputs, args.output_root, args.parallel, **options)
+            if len(finished) < len(inputs) or any(status != "done" for _, status, _, _, _ in finished):
+                raise SystemExit(1)
+            raise SystemExit(0)
+        if args.parallel > 1 and DEVICE.type != "cpu":
+            print("[INFO] --parallel applies to CPU inference; on the GPU the sources share one batched service.")
+        # Every source is queued on one service: the model is loaded once for all of them
+        for number, input_path in enumerate(inputs, start=1):
+            process_frames(input_path, *drone_output_dirs(args.output_root, number), wait=False, **options)
+        get_service().wait_all()
+
+    service = get_service()
+    print(f"[INFO] Inference service summary:\n{service.report()}")
+    service.close()
+    if _visualizer is not None:
+        _visualizer.close()  # Waits for the queued image writes
+    if _store is not None:
+        _store.flush()  # Commits the last chunk (and marks its frames done in the manifests)
+        count, size = _store.stats()
+        _store.close()
+        print(f"[INFO] Results store {STORE_DIR}: {count} frames, masks {size / 1e6:.1f} MB")
+    if any(job.status == "failed" for job in service.jobs):
+        raise SystemExit(1)
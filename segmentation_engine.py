@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import torch
+
+from mask_refine import refine_mask
+from postprocess import PostProcessor
+
+# Batched SegFormer inference for segment_and_detect_agriculture.py.
+# Frames are resized on a thread pool into reused uint8 batch buffers ahead of
+# the model; normalization happens once per batch on the device, and the
+# flipped TTA copies run in the same forward pass as the originals.
+
+IMAGE_SIZE = 512
+MEAN = (0.485, 0.456, 0.406)
+STD = (0.229, 0.224, 0.225)
+_END = object()
+_ERROR = object()
+
+
+class BatchedSegmenter:
+    """
+    segment(frames)  generator over (frame, transformed, result) with prefetching
+    infer(images)    synchronous [(transformed, result), ...] for a list of RGB arrays
+
+    result is the PostProcessor output for the frame: {"mask" (uint8, logit
+    resolution unless upsample_logits), "fractions" (per class), "flagged"}.
+
+    In segment(), `transformed` is a (1, 3, 512, 512) view into the reused input
+    buffer and is only valid until the next batch runs; consume it before asking
+    for more. infer() returns copies.
+    """
+
+    def __init__(self, model, device, batch_size=4, workers=None, tta=True, prefetch_batches=2,
+                 refine=refine_mask, upsample_logits=False):
+        self.model = model
+        self.device = device
+        self.batch_size = batch_size
+        self.tta = tta
+        self.postprocess = PostProcessor(device, out_size=IMAGE_SIZE, upsample_logits=upsample_logits,
+                                         refine=refine, max_batch=batch_size)
+        self.prefetch_batches = prefetch_batches
+        self.pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 2,
+                                       thread_name_prefix="Preprocess")
+        copies = 2 if tta else 1
+        self._inputs = torch.empty((copies * batch_size, 3, IMAGE_SIZE, IMAGE_SIZE), device=device)
+        self._mean = torch.tensor(MEAN, device=device).view(1, 3, 1, 1) * 255.0
+        self._std = torch.tensor(STD, device=device).view(1, 3, 1, 1) * 255.0
+        self.frames = 0
+        self.batches = 0
+        self.busy = 0.0  # Seconds spent in forward + post-processing
+        self.started = None
+
+    # ---------- preprocessing ----------
+    def _new_slot(self):
+        return np.empty((self.batch_size, IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+
+    @staticmethod
+    def _resize_into(image, out):
+        cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE), dst=out, interpolation=cv2.INTER_LINEAR)
+
+    def _load(self, slot, count):
+        """Copies `count` resized frames into the input buffer and normalizes them (+ flipped copies)."""
+        pixels = torch.from_numpy(slot[:count]).to(self.device, non_blocking=True).permute(0, 3, 1, 2)
+        originals = self._inputs[:count]
+        originals.copy_(pixels)
+        originals.sub_(self._mean).div_(self._std)
+        if not self.tta:
+            return originals
+        self._inputs[count:2 * count].copy_(torch.flip(originals, dims=[3]))
+        return self._inputs[:2 * count]
+
+    # ---------- model ----------
+    def _run(self, slot, count):
+        if self.started is None:
+            self.started = time.time()
+        started = time.time()
+        inputs = self._load(slot, count)
+        with torch.no_grad():
+            logits = self.model(inputs).logits
+            if self.tta:
+                # Sum instead of mean: the argmax is the same
+                logits = logits[:count].add_(torch.flip(logits[count:], dims=[3]))
+        results = self.postprocess.run(logits)
+        self.busy += time.time() - started
+        self.frames += count
+        self.batches += 1
+        return [(self._inputs[k:k + 1], results[k]) for k in range(count)]
+
+    def infer(self, images):
+        results = []
+        for first in range(0, len(images), self.batch_size):
+            chunk = images[first:first + self.batch_size]
+            slot = self._new_slot()
+            list(self.pool.map(lambda k: self._resize_into(chunk[k], slot[k]), range(len(chunk))))
+            # Copies: a later chunk reuses the input buffer
+            results.extend((transformed.clone(), result) for transformed, result in self._run(slot, len(chunk)))
+        return results
+
+    def segment(self, frames):
+        """
+        Frames are dicts with an "image" (RGB array); they are read on a feeder
+        thread. If reading them fails, the frames read before are still yielded
+        and the error is raised here.
+        """
+        free_slots = queue.Queue()
+        for _ in range(self.prefetch_batches + 1):
+            free_slots.put(self._new_slot())
+        ready = queue.Queue(maxsize=self.prefetch_batches)
+        stop = threading.Event()
+
+        def feed():
+            batch, slot, futures = [], None, []
+            try:
+                for frame in frames:
+                    if stop.is_set():
+                        return
+                    if slot is None:
+                        slot = free_slots.get()
+                    futures.append(self.pool.submit(self._resize_into, frame["image"], slot[len(batch)]))
+                    batch.append(frame)
+                    if len(batch) == self.batch_size:
+                        ready.put((batch, slot, futures))
+                        batch, slot, futures = [], None, []
+                if batch:
+                    ready.put((batch, slot, futures))
+            except Exception as e:
+                # Frames read before the failure still go through; segment() raises after them
+                if batch:
+                    ready.put((batch, slot, futures))
+                ready.put((_ERROR, e))
+            finally:
+                ready.put(_END)
+
+        feeder = threading.Thread(target=feed, name="SegmentFeeder", daemon=True)
+        feeder.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _END:
+                    break
+                if item[0] is _ERROR:
+                    raise item[1]
+                batch, slot, futures = item
+                for future in futures:
+                    future.result()
+                results = self._run(slot, len(batch))
+                free_slots.put(slot)  # Already copied into the input buffer
+                for frame, (transformed, result) in zip(batch, results):
+                    yield frame, transformed, result
+        finally:
+            stop.set()
+            while feeder.is_alive():  # Unblock a feeder waiting on a full queue
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+                if free_slots.empty():
+                    free_slots.put(self._new_slot())
+
+    def report(self):
+        elapsed = time.time() - self.started if self.started else 0.0
+        fps = self.frames / elapsed if elapsed > 0 else 0.0
+        model_fps = self.frames / self.busy if self.busy > 0 else 0.0
+        return (f"{self.frames} frames in {self.batches} batches of up to {self.batch_size}"
+                f"{' (+flip TTA)' if self.tta else ''}: {fps:.2f} fps overall, {model_fps:.2f} fps in the model")
+
+    def close(self):
+        self.pool.shutdown(wait=True)
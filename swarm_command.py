@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+
+from command_bus import CommandRingWriter, BROADCAST, MAX_DRONES
+
+# Sends operator commands to running drone controllers over the shared-memory command ring.
+#   python3 swarm_command.py hold --drone 2
+#   python3 swarm_command.py set-target-distance 12
+#   python3 swarm_command.py emergency-stop
+#   python3 swarm_command.py status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SwarMind operator command line")
+    parser.add_argument("--drone", type=int, default=BROADCAST, help="Target drone id (default: broadcast to all)")
+    parser.add_argument("--wait", nargs="*", type=int, metavar="ID",
+                        help="Wait for acknowledgements from these drone ids (default: the target drone)")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Seconds to wait for acknowledgements")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("hold", "resume", "land", "emergency-stop", "status"):
+        sub.add_parser(name)
+    distance = sub.add_parser("set-target-distance")
+    distance.add_argument("value", type=float)
+    mode = sub.add_parser("set-mode")
+    mode.add_argument("mode", choices=["flocking", "hold"])
+    args = parser.parse_args()
+
+    ring = CommandRingWriter()
+    try:
+        if args.command == "status":
+            for drone_id in range(1, MAX_DRONES):
+                seq, timestamp, status = ring.ack_of(drone_id)
+                if seq >= 0:
+                    print(f"[INFO] Drone {drone_id}: seq {seq} '{status}' {time.time() - timestamp:.1f}s ago")
+            print(f"[INFO] {ring.published_count()} commands published.")
+            return
+
+        params = {}
+        if args.command == "set-target-distance":
+            params["value"] = args.value
+        elif args.command == "set-mode":
+            params["mode"] = args.mode
+        sent_at = time.time()
+        seq = ring.send(args.command.replace("-", "_"), target=args.drone, **params)
+        print(f"[INFO] Sent '{args.command}' as seq {seq} to {'all drones' if args.drone == BROADCAST else f'drone {args.drone}'}.")
+
+        wait_ids = args.wait if args.wait is not None else ([args.drone] if args.drone != BROADCAST else [])
+        if wait_ids:
+            pending = ring.wait_for_acks(seq, wait_ids, timeout=args.timeout)
+            for drone_id in sorted(set(wait_ids) - pending):
+                _, timestamp, status = ring.ack_of(drone_id)
+                print(f"[INFO] Drone {drone_id} acked '{status}' after {(timestamp - sent_at) * 1000:.0f} ms.")
+            for drone_id in sorted(pending):
+                print(f"[WARNING] No acknowledgement from drone {drone_id} within {args.timeout:.1f}s.")
+    finally:
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()
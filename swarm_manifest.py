@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import configparser
+import glob
+import os
+import re
+
+
+def load_swarm_manifest(config_dir, pattern="drone*_config.ini"):
+    """
+    Reads every drone config file (the same [swarm] files drone1.py/drone2.py use)
+    and returns {drone_id: entry}. Entry keys are the lower-cased [swarm] keys
+    (id, connection, port, ...) plus config_path.
+    """
+    manifest = {}
+    for path in sorted(glob.glob(os.path.join(os.path.expanduser(config_dir), pattern))):
+        config = configparser.ConfigParser()
+        try:
+            config.read(path)
+            section = config["swarm"]
+            drone_id = int(section.get("ID", "").strip())
+        except (KeyError, ValueError, configparser.Error) as e:
+            print(f"WARNING: Skipping swarm config '{path}': {e}")
+            continue
+        entry = {key: value.strip() for key, value in section.items()}
+        entry["id"] = drone_id
+        entry["config_path"] = path
+        if drone_id in manifest:
+            print(f"WARNING: Drone ID {drone_id} is defined twice ({manifest[drone_id]['config_path']}, {path}).")
+        manifest[drone_id] = entry
+    return manifest
+
+
+def command_drone_ids(commands):
+    """Returns the drone ids that have an explicit 'droneN' entry in a COMMANDS dict."""
+    ids = set()
+    for key in commands:
+        match = re.fullmatch(r"drone(\d+)", key)
+        if match:
+            ids.add(int(match.group(1)))
+    return ids
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import threading
+import tkinter as tk
+from collections import OrderedDict, deque
+import customtkinter as ctk
+
+from geo import LocalProjection, tile_metres_per_pixel, latlon_to_tile, tile_to_latlon
+
+DRONE_PALETTE = ["#4E9FEC", "#2ECC71", "#F39C12", "#E74C3C", "#9B59B6", "#1ABC9C", "#F1C40F", "#E67E22"]
+
+
+class SwarmTracks:
+    """
+    Latest position/heading and a bounded trail per drone. record() is a
+    TelemetryReader listener, so trails keep growing while the map is hidden.
+    """
+
+    def __init__(self, trail_length=200, trail_min_step_m=0.5):
+        self.trail_length = trail_length
+        self.trail_min_step_m = trail_min_step_m
+        self._lock = threading.Lock()
+        self._tracks = {}  # drone_id -> {"lat", "lon", "yaw", "trail": deque, "appended": int, "version": int}
+
+    def record(self, drone_id, diff, t):
+        if not ("latitude" in diff or "longitude" in diff or "yaw" in diff):
+            return
+        with self._lock:
+            track = self._tracks.get(drone_id)
+            if track is None:
+                track = self._tracks[drone_id] = {"lat": None, "lon": None, "yaw": None,
+                                                  "trail": deque(maxlen=self.trail_length), "appended": 0,
+                                                  "version": 0}
+            track["lat"] = diff.get("latitude", track["lat"])
+            track["lon"] = diff.get("longitude", track["lon"])
+            track["yaw"] = diff.get("yaw", track["yaw"])
+            lat, lon = track["lat"], track["lon"]
+            if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+                trail = track["trail"]
+                if not trail or self._step_m(trail[-1], (lat, lon)) >= self.trail_min_step_m:
+                    trail.append((lat, lon))
+                    track["appended"] += 1
+            track["version"] += 1
+
+    @staticmethod
+    def _step_m(a, b):
+        # Small-distance approximation; only used to thin the trail
+        dn = (b[0] - a[0]) * 111195.0
+        de = (b[1] - a[1]) * 111195.0 * math.cos(math.radians(a[0]))
+        return math.hypot(dn, de)
+
+    def positions(self):
+        """Returns {drone_id: (lat, lon)} for drones with a valid fix."""
+        with self._lock:
+            return {did: (t["lat"], t["lon"]) for did, t in self._tracks.items()
+                    if isinstance(t["lat"], (int, float)) and isinstance(t["lon"], (int, float))}
+
+    def changed_since(self, versions):
+        """
+        Returns {drone_id: (version, lat, lon, yaw, trail, appended)} for drones
+        whose version differs from versions; appended counts every trail point
+        ever added, so a caller can tell which points are new since its last look.
+        """
+        with self._lock:
+            return {did: (t["version"], t["lat"], t["lon"], t["yaw"], list(t["trail"]), t["appended"])
+                    for did, t in self._tracks.items() if versions.get(did) != t["version"]}
+
+
+class TileLayer:
+    """
+    Optional offline background from a local {z}/{x}/{y}.png tile directory.
+    Tiles are drawn 1:1, so the map snaps its scale to the tile zoom levels.
+    Canvas image items are pooled and PhotoImages LRU-cached.
+    """
+
+    def __init__(self, canvas, tile_dir, max_cached=96):
+        self.canvas = canvas
+        self.tile_dir = os.path.expanduser(tile_dir)
+        self.max_cached = max_cached
+        self.zoom_levels = sorted(int(d) for d in os.listdir(self.tile_dir) if d.isdigit()) \
+            if os.path.isdir(self.tile_dir) else []
+        self._images = OrderedDict()  # (z, x, y) -> PhotoImage or None when missing
+        self._items = []              # Pooled canvas image items
+        if not self.zoom_levels:
+            print(f"WARNING: No offline map tiles found in '{self.tile_dir}'.")
+
+    @property
+    def available(self):
+        return bool(self.zoom_levels)
+
+    def snap_scale(self, lat, px_per_m):
+        """Returns (zoom, px_per_m) of the tile zoom level closest to the requested scale."""
+        best = min(self.zoom_levels, key=lambda z: abs(math.log(px_per_m * tile_metres_per_pixel(lat, z))))
+        return best, 1.0 / tile_metres_per_pixel(lat, best)
+
+    def _image(self, key):
+        if key in self._images:
+            self._images.move_to_end(key)
+            return self._images[key]
+        z, x, y = key
+        path = os.path.join(self.tile_dir, str(z), str(x), f"{y}.png")
+        try:
+            image = tk.PhotoImage(file=path) if os.path.exists(path) else None
+        except tk.TclError:
+            image = None
+        self._images[key] = image
+        while len(self._images) > self.max_cached:
+            self._images.popitem(last=False)
+        return image
+
+    def draw(self, zoom, projection, to_canvas, width, height, to_local_from_canvas):
+        """Places the tiles covering the canvas; called only when the view transform changes."""
+        lat_nw, lon_nw = projection.to_geo(*to_local_from_canvas(0, 0))
+        lat_se, lon_se = projection.to_geo(*to_local_from_canvas(width, height))
+        x0, y0 = latlon_to_tile(lat_nw, lon_nw, zoom)
+        x1, y1 = latlon_to_tile(lat_se, lon_se, zoom)
+        used = 0
+        for tx in range(int(math.floor(x0)), int(math.floor(x1)) + 1):
+            for ty in range(int(math.floor(y0)), int(math.floor(y1)) + 1):
+                image = self._image((zoom, tx, ty))
+                if image is None:
+                    continue
+                cx, cy = to_canvas(*projection.to_local(*tile_to_latlon(tx, ty, zoom)))
+                if used == len(self._items):
+                    self._items.append(self.canvas.create_image(0, 0, anchor="nw", tags=("tile",)))
+                item = self._items[used]
+                self.canvas.coords(item, cx, cy)
+                self.canvas.itemconfigure(item, image=image, state="normal")
+                used += 1
+        for item in self._items[used:]:
+            self.canvas.itemconfigure(item, state="hidden")
+        self.canvas.tag_lower("tile")
+
+
+class SwarmMapView(ctk.CTkFrame):
+    """
+    Top-down map of the swarm in local metres: icon, heading vector, trail and
+    distance rings per drone. Canvas items are created once per drone and moved
+    with coords(); drones whose telemetry did not change are not touched unless
+    the view itself was panned, zoomed or resized. Projected trail coordinates
+    are kept per drone and only extended with the new points in between.
+    """
+
+    def __init__(self, parent, tracks, colors, ring_distances=(10, 15), tile_dir=None,
+                 heading_length_m=5.0, **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.tracks = tracks
+        self.colors = colors
+        self.ring_distances = ring_distances
+        self.heading_length_m = heading_length_m
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=colors["dark"])
+        self.canvas.pack(fill="both", expand=True)
+        self.tiles = TileLayer(self.canvas, tile_dir) if tile_dir else None
+
+        self.projection = None
+        self.px_per_m = 4.0
+        self.center = (0.0, 0.0)      # Local metres shown at the canvas centre
+        self.tile_zoom = None
+        self.auto_fit = True
+        self._view_dirty = True       # Transform changed: every drone must be re-projected
+        self._size = None             # Canvas (width, height) at the last refresh
+        self._items = {}              # drone_id -> {item name: canvas id}
+        self._trails = {}             # drone_id -> (points appended, flat canvas coords of the trail)
+        self._drawn_versions = {}
+        self._drag_start = None
+
+        self._scale_text = self.canvas.create_text(10, 10, anchor="nw", text="", fill=colors["text_secondary"],
+                                                   font=("Roboto", 10))
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.fit())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", self._on_wheel)
+        self.canvas.bind("<Button-5>", self._on_wheel)
+
+    # ---------- view transform ----------
+    def _canvas_size(self):
+        return max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1)
+
+    def _to_canvas(self, east, north, size):
+        width, height = size
+        return (width / 2 + (east - self.center[0]) * self.px_per_m,
+                height / 2 - (north - self.center[1]) * self.px_per_m)
+
+    def _to_local(self, x, y, size):
+        width, height = size
+        return (self.center[0] + (x - width / 2) / self.px_per_m,
+                self.center[1] - (y - height / 2) / self.px_per_m)
+
+    def _set_scale(self, px_per_m):
+        px_per_m = min(max(px_per_m, 0.05), 200.0)
+        if self.tiles and self.tiles.available and self.projection:
+            self.tile_zoom, px_per_m = self.tiles.snap_scale(self.projection.lat0, px_per_m)
+        if px_per_m != self.px_per_m:
+            self.px_per_m = px_per_m
+            self._view_dirty = True
+
+    def fit(self):
+        self.auto_fit = True
+        self._fit(self._canvas_size(), force=True)
+
+    def _fit(self, size, force=False):
+        if self.projection is None:
+            return
+        local = [self.projection.to_local(lat, lon) for lat, lon in self.tracks.positions().values()]
+        if not local:
+            return
+        width, height = size
+        margin_m = max(self.ring_distances, default=0) + 5
+        min_e, max_e = min(p[0] for p in local) - margin_m, max(p[0] for p in local) + margin_m
+        min_n, max_n = min(p[1] for p in local) - margin_m, max(p[1] for p in local) + margin_m
+        half_w, half_h = width / 2 / self.px_per_m, height / 2 / self.px_per_m
+
+        # Hysteresis: refit only when a drone leaves the view or the swarm shrinks to a small part of it
+        outside = (min_e < self.center[0] - half_w or max_e > self.center[0] + half_w or
+                   min_n < self.center[1] - half_h or max_n > self.center[1] + half_h)
+        too_small = (max_e - min_e) < 0.3 * 2 * half_w and (max_n - min_n) < 0.3 * 2 * half_h
+        if not (force or outside or too_small):
+            return
+        self.center = ((min_e + max_e) / 2, (min_n + max_n) / 2)
+        self._set_scale(min(width / (max_e - min_e), height / (max_n - min_n)) * 0.8)
+        self._view_dirty = True
+
+    def _on_wheel(self, event):
+        zoom_in = getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0
+        self.auto_fit = False
+        if self.tiles and self.tiles.available and self.tile_zoom is not None:
+            self._set_scale(self.px_per_m * (2.0 if zoom_in else 0.5))  # One tile zoom level per step
+        else:
+            self._set_scale(self.px_per_m * (1.25 if zoom_in else 0.8))
+
+    def _on_drag_start(self, event):
+        self._drag_start = (event.x, event.y, self.center)
+
+    def _on_drag(self, event):
+        if self._drag_start is None:
+            return
+        x0, y0, (ce, cn) = self._drag_start
+        self.auto_fit = False
+        self.center = (ce - (event.x - x0) / self.px_per_m, cn + (event.y - y0) / self.px_per_m)
+        self._view_dirty = True
+
+    # ---------- drawing ----------
+    def apply_colors(self, colors):
+        self.colors = colors
+        self.canvas.configure(bg=colors["dark"])
+        self.canvas.itemconfigure(self._scale_text, fill=colors["text_secondary"])
+        for items in self._items.values():
+            self.canvas.itemconfigure(items["label"], fill=colors["text_primary"])
+
+    def _create_items(self, drone_id):
+        color = DRONE_PALETTE[(drone_id - 1) % len(DRONE_PALETTE)]
+        c = self.canvas
+        items = {
+            "trail": c.create_line(0, 0, 0, 0, fill=color, width=1, state="hidden"),
+            "rings": [c.create_oval(0, 0, 0, 0, outline=color, dash=(3, 4)) for _ in self.ring_distances],
+            "heading": c.create_line(0, 0, 0, 0, fill=color, width=2, arrow="last"),
+            "icon": c.create_oval(0, 0, 0, 0, fill=color, outline=self.colors["text_primary"]),
+            "label": c.create_text(0, 0, anchor="w", text=f"D{drone_id}", fill=self.colors["text_primary"],
+                                   font=("Roboto", 10, "bold")),
+        }
+        self._items[drone_id] = items
+        return items
+
+    def _project_trail(self, drone_id, trail, appended, size):
+        """Canvas coords of the trail, projecting only the points added since the last call."""
+        cached = self._trails.get(drone_id)
+        new = appended - cached[0] if cached else None
+        if new is None or new > len(trail):
+            coords = []
+            new = len(trail)
+        else:
+            coords = cached[1]
+        for tlat, tlon in trail[len(trail) - new:]:
+            coords.extend(self._to_canvas(*self.projection.to_local(tlat, tlon), size))
+        del coords[:len(coords) - 2 * len(trail)]  # Points that fell off the bounded trail
+        self._trails[drone_id] = (appended, coords)
+        return coords
+
+    def _draw_drone(self, drone_id, lat, lon, yaw, trail, appended, size):
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            return
+        items = self._items.get(drone_id) or self._create_items(drone_id)
+        c = self.canvas
+        x, y = self._to_canvas(*self.projection.to_local(lat, lon), size)
+
+        for item, radius_m in zip(items["rings"], self.ring_distances):
+            r = radius_m * self.px_per_m
+            c.coords(item, x - r, y - r, x + r, y + r)
+        c.coords(items["icon"], x - 6, y - 6, x + 6, y + 6)
+        c.coords(items["label"], x + 9, y - 9)
+
+        heading = math.radians(yaw if isinstance(yaw, (int, float)) else 0.0)  # 0 = north, clockwise
+        length = max(self.heading_length_m * self.px_per_m, 14)
+        c.coords(items["heading"], x, y, x + math.sin(heading) * length, y - math.cos(heading) * length)
+
+        coords = self._project_trail(drone_id, trail, appended, size)
+        if len(trail) >= 2:
+            c.coords(items["trail"], *coords)
+            c.itemconfigure(items["trail"], state="normal")
+
+    def refresh(self):
+        """Redraws drones whose telemetry changed, or everything after a pan/zoom/resize."""
+        size = self._canvas_size()
+        if size != self._size:
+            self._size = size
+            self._view_dirty = True
+        if self.projection is None:
+            positions = self.tracks.positions()
+            if not positions:
+                return
+            lats = [p[0] for p in positions.values()]
+            lons = [p[1] for p in positions.values()]
+            self.projection = LocalProjection(sum(lats) / len(lats), sum(lons) / len(lons))
+            self._fit(size, force=True)
+        elif self.auto_fit:
+            self._fit(size)
+
+        if self._view_dirty:
+            changed = self.tracks.changed_since({})
+            self._trails.clear()
+            if self.tiles and self.tiles.available and self.tile_zoom is not None:
+                self.tiles.draw(self.tile_zoom, self.projection, lambda e, n: self._to_canvas(e, n, size),
+                                *size, lambda x, y: self._to_local(x, y, size))
+            self.canvas.itemconfigure(self._scale_text, text=f"{1 / self.px_per_m:.2f} m/px"
+                                      + ("" if self.auto_fit else "   (double-click to fit)"))
+            self._view_dirty = False
+        else:
+            changed = self.tracks.changed_since(self._drawn_versions)
+
+        for drone_id, (version, lat, lon, yaw, trail, appended) in changed.items():
+            self._draw_drone(drone_id, lat, lon, yaw, trail, appended, size)
+            self._drawn_versions[drone_id] = version
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import bisect
+import threading
+import tkinter as tk
+
+from geo import calculate_distance
+
+# history field -> (raw telemetry key or None for derived, label, unit, fixed y-range)
+PLOT_FIELDS = {
+    "altitude": ("absolute_altitude", "Alt", "m", None),
+    "speed": ("speed", "Speed", "m/s", None),
+    "battery": ("battery_percent", "Battery", "%", (0.0, 100.0)),
+    "distance": (None, "Nearest", "m", None),
+}
+
+
+class RollingSeries:
+    """Bounded (time, value) series. Trimming is amortised so appends stay O(1)."""
+
+    def __init__(self, max_points):
+        self.max_points = max_points
+        self.times = []
+        self.values = []
+        self._lock = threading.Lock()
+
+    def append(self, t, value):
+        with self._lock:
+            self.times.append(t)
+            self.values.append(value)
+            if len(self.times) > 2 * self.max_points:
+                del self.times[:-self.max_points]
+                del self.values[:-self.max_points]
+
+    def since(self, t0):
+        """
+        Returns (times, values) copies of the samples at or after t0. Telemetry
+        only records changes, so the last earlier sample still holds at t0: it
+        leads the result with its time clamped to t0.
+        """
+        with self._lock:
+            start = bisect.bisect_left(self.times, t0)
+            if start == 0:
+                return self.times[:], self.values[:]
+            return [t0] + self.times[start:], self.values[start - 1:]
+
+
+class TelemetryHistory:
+    """
+    Per-drone rolling history of the plotted fields. record() is registered as
+    a TelemetryReader listener, so it runs on the reader thread whether or not
+    any plot is on screen.
+    """
+
+    def __init__(self, max_points):
+        self.max_points = max_points
+        self._series = {}     # (drone_id, field) -> RollingSeries
+        self._positions = {}  # drone_id -> (lat, lon) used for the nearest-neighbour distance
+        self._lock = threading.Lock()
+
+    def series(self, drone_id, field):
+        key = (drone_id, field)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = RollingSeries(self.max_points)
+            return series
+
+    def record(self, drone_id, diff, t):
+        for field, (raw_key, _, _, _) in PLOT_FIELDS.items():
+            if raw_key is not None and isinstance(diff.get(raw_key), (int, float)):
+                self.series(drone_id, field).append(t, float(diff[raw_key]))
+
+        if "latitude" in diff or "longitude" in diff:
+            with self._lock:
+                lat, lon = self._positions.get(drone_id, (None, None))
+                lat = diff.get("latitude", lat)
+                lon = diff.get("longitude", lon)
+                self._positions[drone_id] = (lat, lon)
+                others = [pos for did, pos in self._positions.items() if did != drone_id]
+            if others and None not in (lat, lon):
+                nearest = min(calculate_distance(lat, lon, olat, olon) for olat, olon in others)
+                if nearest < 1e9:
+                    self.series(drone_id, "distance").append(t, nearest)
+
+
+def decimate_minmax(times, values, t0, t1, buckets):
+    """
+    Splits [t0, t1] into equal time buckets and keeps the min and max of each,
+    so the drawn envelope matches the raw data at one bucket per pixel column.
+    Returns [(bucket_index, vmin, vmax), ...].
+    """
+    if not times or buckets <= 0 or t1 <= t0:
+        return []
+    span = t1 - t0
+    edges = [bisect.bisect_left(times, t0 + span * k / buckets) for k in range(buckets)]
+    edges.append(len(times))
+    points = []
+    for k in range(buckets):
+        a, b = edges[k], edges[k + 1]
+        if a < b:
+            chunk = values[a:b]
+            points.append((k, min(chunk), max(chunk)))
+    return points
+
+
+class Sparkline(tk.Canvas):
+    """
+    Small rolling plot. The line and text items are created once and only
+    their coordinates / text are updated on each draw.
+    """
+
+    def __init__(self, parent, label, unit="", fixed_range=None, height=40, bg="#2C3E50", **kwargs):
+        super().__init__(parent, height=height, highlightthickness=0, bd=0, bg=bg, **kwargs)
+        self.label = label
+        self.unit = unit
+        self.fixed_range = fixed_range
+        self._line = self.create_line(0, 0, 0, 0, width=1.5, fill="#4E9FEC", state="hidden")
+        self._label_item = self.create_text(4, 2, anchor="nw", text=label, font=("Roboto", 9), fill="#B8B8B8")
+        self._value_item = self.create_text(0, 2, anchor="ne", text="-", font=("Roboto", 9, "bold"), fill="#FFFFFF")
+        self._range_item = self.create_text(4, height - 2, anchor="sw", text="", font=("Roboto", 8), fill="#7F8C8D")
+        self._texts = {}
+
+    def _set_text(self, item, text):
+        if self._texts.get(item) != text:
+            self.itemconfigure(item, text=text)
+            self._texts[item] = text
+
+    def apply_colors(self, colors):
+        self.configure(bg=colors["card_bg"])
+        self.itemconfigure(self._line, fill=colors["accent"])
+        self.itemconfigure(self._label_item, fill=colors["text_secondary"])
+        self.itemconfigure(self._value_item, fill=colors["text_primary"])
+        self.itemconfigure(self._range_item, fill=colors["gray"])
+
+    def clear(self):
+        self.itemconfigure(self._line, state="hidden")
+        self._set_text(self._value_item, "-")
+        self._set_text(self._range_item, "")
+
+    def draw(self, series, now, window_s):
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        times, values = series.since(now - window_s)
+        points = decimate_minmax(times, values, now - window_s, now, width // 2)
+        if not points:
+            self.clear()
+            return
+
+        if self.fixed_range:
+            lo, hi = self.fixed_range
+        else:
+            lo = min(p[1] for p in points)
+            hi = max(p[2] for p in points)
+        if hi - lo < 1e-6:
+            lo, hi = lo - 1.0, hi + 1.0
+        top, bottom = 14, height - 12
+        scale_y = (bottom - top) / (hi - lo)
+        step_x = width / (width // 2)
+
+        coords = []
+        for k, vmin, vmax in points:
+            x = k * step_x
+            coords.extend((x, bottom - (vmin - lo) * scale_y, x, bottom - (vmax - lo) * scale_y))
+        # Hold the last value up to "now" so fields that stopped changing still reach the right edge
+        coords.extend((width - 1, bottom - (values[-1] - lo) * scale_y))
+
+        self.coords(self._line, *coords)
+        self.itemconfigure(self._line, state="normal")
+        self.coords(self._value_item, width - 4, 2)
+        self._set_text(self._value_item, f"{values[-1]:.1f} {self.unit}")
+        self._set_text(self._range_item, f"{lo:.1f} – {hi:.1f}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+import time
+
+from frame_bus import attach_segment
+
+
+class TelemetryReader(threading.Thread):
+    """
+    Keeps the telemetry segment mapped and decodes it off the Tk thread.
+    The UI only receives per-drone diffs of the fields that changed.
+    """
+
+    def __init__(self, shm_name, shm_size, interval=0.05, reattach_after=3.0):
+        super().__init__(name="TelemetryReader", daemon=True)
+        self.shm_name = shm_name
+        self.shm_size = shm_size
+        self.interval = interval
+        self.reattach_after = reattach_after  # Re-map the segment if it stays frozen this long (writer restarted)
+
+        self._segment = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        self._last_raw = None
+        self._last_change_time = 0.0
+        self._snapshot = {}       # drone_id -> last decoded telemetry dict
+        self._pending = {}        # drone_id -> {field: value} not yet handed to the UI
+        self._present = set()     # drone ids found in the latest payload
+        self._available = False   # True while the segment is mapped and readable
+        self._listeners = []      # Called on this thread with (drone_id, diff, timestamp)
+
+    # ---------- segment handling ----------
+    def _attach(self):
+        try:
+            # Not registered with this process's resource tracker: the drones own the segment
+            self._segment = attach_segment(self.shm_name)
+            self._last_raw = None
+            self._last_change_time = time.time()
+            return True
+        except FileNotFoundError:
+            self._segment = None
+            return False
+        except Exception as e:
+            print(f"ERROR: Telemetry reader could not map '{self.shm_name}': {e}")
+            self._segment = None
+            return False
+
+    def _detach(self):
+        if self._segment is not None:
+            try:
+                self._segment.close()
+            except Exception:
+                pass
+            self._segment = None
+
+    def _read_raw(self):
+        buf = self._segment.buf
+        size = min(self.shm_size, len(buf))
+        raw = bytes(buf[:size])
+        null_index = raw.find(b'\x00')
+        return raw if null_index < 0 else raw[:null_index]
+
+    # ---------- public API ----------
+    def add_listener(self, callback):
+        """Registers callback(drone_id, diff, timestamp); it runs on the reader thread for every diff."""
+        self._listeners.append(callback)
+
+    def drain(self):
+        """
+        Returns (diffs, present_ids, available) and clears the pending diffs.
+        Safe to call from the Tk thread.
+        """
+        with self._lock:
+            diffs = self._pending
+            self._pending = {}
+            return diffs, set(self._present), self._available
+
+    def snapshot(self, drone_id):
+        """Returns a copy of the latest full telemetry dict for one drone."""
+        with self._lock:
+            return dict(self._snapshot.get(drone_id, {}))
+
+    def stop(self):
+        self._stop_event.set()
+
+    # ---------- thread body ----------
+    def run(self):
+        while not self._stop_event.is_set():
+            if self._segment is None and not self._attach():
+                with self._lock:
+                    self._available = False
+                    self._present = set()
+                self._stop_event.wait(1.0)
+                continue
+
+            try:
+                raw = self._read_raw()
+            except Exception as e:
+                print(f"ERROR: Telemetry reader lost the segment: {e}")
+                self._detach()
+                continue
+
+            now = time.time()
+            if raw != self._last_raw:
+                self._last_raw = raw
+                self._last_change_time = now
+                self._decode(raw, now)
+            elif now - self._last_change_time > self.reattach_after:
+                # The writer may have unlinked and re-created the segment; map it again.
+                self._detach()
+                self._last_change_time = now
+                continue
+
+            self._stop_event.wait(self.interval)
+        self._detach()
+
+    def _decode(self, raw, now):
+        try:
+            decoded = json.loads(raw.decode('utf-8', errors='ignore')) if raw.strip() else {}
+        except json.JSONDecodeError:
+            return  # Writer was mid-update; the next poll will catch the full payload
+        if not isinstance(decoded, dict):
+            return
+
+        present = set()
+        changes = {}
+        for drone_id_str, telemetry in decoded.items():
+            try:
+                drone_id = int(drone_id_str)
+            except ValueError:
+                continue
+            if not isinstance(telemetry, dict):
+                continue
+            present.add(drone_id)
+            previous = self._snapshot.get(drone_id, {})
+            diff = {k: v for k, v in telemetry.items() if previous.get(k) != v}
+            if diff:
+                changes[drone_id] = diff
+
+        with self._lock:
+            self._available = True
+            self._present = present
+            for drone_id, diff in changes.items():
+                self._snapshot.setdefault(drone_id, {}).update(diff)
+                self._pending.setdefault(drone_id, {}).update(diff)
+
+        for drone_id, diff in changes.items():
+            for callback in self._listeners:
+                try:
+                    callback(drone_id, diff, now)
+                except Exception as e:
+                    print(f"ERROR: Telemetry listener failed: {e}")
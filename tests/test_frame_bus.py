@@ -0,0 +1,98 @@
+import multiprocessing.shared_memory as shm
+import os
+import struct
+
+import pytest
+
+import frame_bus
+from frame_bus import FrameRingReader, FrameRingWriter, ENCODING_JPEG
+
+
+@pytest.fixture
+def ring_name(request):
+    return f"swarmind_test_{os.getpid()}_{request.node.name}"[:30]
+
+
+@pytest.fixture
+def writer(ring_name):
+    writer = FrameRingWriter(ring_name, slot_count=4, slot_size=64)
+    yield writer
+    writer.close()
+
+
+def _publish(writer, n, **kwargs):
+    return writer.publish(bytes([n]) * 8, 2, 2, 1, ENCODING_JPEG, frame_number=n, **kwargs)
+
+
+def test_round_trip(writer, ring_name):
+    reader = FrameRingReader(ring_name)
+    _publish(writer, 7, lat=1.5)
+    frame = reader.read(0)
+    assert frame["frame_number"] == 7 and frame["payload"] == bytes([7]) * 8 and frame["lat"] == 1.5
+    reader.close()
+
+
+def test_torn_slot_is_skipped(writer, ring_name):
+    reader = FrameRingReader(ring_name)
+    _publish(writer, 1)
+    struct.pack_into("<Q", writer.buf, writer._slot_offset(0), 1)  # Odd: mid-write
+    assert reader.read(0) is None
+    reader.close()
+
+
+def test_latest_counts_skipped_frames(writer, ring_name):
+    reader = FrameRingReader(ring_name)
+    for n in range(3):
+        _publish(writer, n)
+    frame, skipped = reader.latest()
+    assert frame["seq"] == 2 and skipped == 0
+    _publish(writer, 3)
+    _publish(writer, 4)
+    frame, skipped = reader.latest()
+    assert frame["seq"] == 4 and skipped == 1
+    assert reader.latest() == (None, 0)
+    reader.close()
+
+
+def test_consume_in_order_and_counts_overwritten(writer, ring_name):
+    reader = FrameRingReader(ring_name)
+    assert reader.consume(from_start=True) is None
+    for n in range(6):  # Slots 0 and 1 are overwritten by 4 and 5
+        _publish(writer, n)
+    assert [reader.consume()["seq"] for _ in range(4)] == [2, 3, 4, 5]
+    assert reader.missed == 2
+    assert reader.consume() is None
+    reader.close()
+
+
+def test_backpressure_drops_instead_of_overwriting(writer, ring_name):
+    reader = FrameRingReader(ring_name)
+    reader.consume(from_start=True)
+    for n in range(4):
+        assert _publish(writer, n, backpressure=True) == n
+    assert _publish(writer, 4, backpressure=True) is None
+    assert writer.backpressure_drops == 1
+    reader.consume()
+    assert _publish(writer, 5, backpressure=True) == 4
+    reader.close()
+
+
+def test_attach_before_header_raises_value_error(ring_name):
+    # A writer creates the segment before packing the header
+    segment = shm.SharedMemory(name=ring_name, create=True, size=frame_bus._RING_HEADER_SIZE * 2)
+    try:
+        with pytest.raises(ValueError):
+            FrameRingReader(ring_name)
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def test_attach_to_tiny_segment_raises_value_error(ring_name):
+    segment = shm.SharedMemory(name=ring_name, create=True, size=8)
+    try:
+        with pytest.raises(ValueError):
+            FrameRingReader(ring_name)
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+from PIL import Image
+import numpy as np
+
+from frame_sources import directory_frames, video_frames
+
+
+def test_skipped_frames_are_not_decoded(tmp_path):
+    Image.fromarray(np.zeros((4, 4, 3), dtype=np.uint8)).save(tmp_path / "a.png")
+    (tmp_path / "b.png").write_bytes(b"not an image")  # Would fail to decode
+    asked = []
+
+    def skip(name):
+        asked.append(name)
+        return name == "b.png"
+
+    frames = list(directory_frames(str(tmp_path), skip=skip))
+    assert [frame["name"] for frame in frames] == ["a.png"]
+    assert asked == ["a.png", "b.png"]
+
+
+def test_unreadable_video_raises(tmp_path):
+    path = tmp_path / "broken.avi"
+    path.write_bytes(b"not a video")
+    with pytest.raises(RuntimeError):
+        next(video_frames(str(path)))
@@ -0,0 +1,43 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from mask_refine import AGRICULTURE_RULES, MergeRule, _random_masks, reference_refine, refine_mask
+
+
+def test_exact_matches_the_reference_loop():
+    masks = _random_masks(8, size=32, seed=3)
+    refined = refine_mask(masks, AGRICULTURE_RULES, "exact")
+    for mask, out in zip(masks, refined):
+        assert torch.equal(out, reference_refine(mask, AGRICULTURE_RULES))
+
+
+def test_exact_follows_left_to_right_chains():
+    # Each "Other" pixel has two agriculture neighbours of its own and needs its
+    # refined left neighbour as the third, so the merge chains along the row
+    mask = torch.tensor([[5, 5, 5, 5, 5],
+                         [5, 1, 1, 1, 0],
+                         [0, 0, 0, 0, 0]])
+    rule = MergeRule(source=1, target=5, min_neighbours=4)
+    assert torch.equal(refine_mask(mask, (rule,), "exact"), reference_refine(mask, (rule,)))
+    assert refine_mask(mask, (rule,), "exact")[1].tolist() == [5, 5, 5, 5, 0]
+
+
+def test_border_and_small_masks_are_untouched():
+    mask = torch.full((4, 4), 1)
+    mask[0] = 5
+    assert torch.equal(refine_mask(mask, mode="exact")[0], mask[0])
+    tiny = torch.tensor([[1, 5], [5, 5]])
+    assert torch.equal(refine_mask(tiny, mode="exact"), tiny)
+
+
+def test_batched_and_single_give_the_same_result():
+    masks = _random_masks(3, size=24, seed=1)
+    batched = refine_mask(masks, mode="exact")
+    for mask, out in zip(masks, batched):
+        assert torch.equal(refine_mask(mask, mode="exact"), out)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        refine_mask(torch.zeros((4, 4), dtype=torch.long), mode="approx")
@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+from parallel_segmentation import partition_threads
+
+
+@pytest.mark.parametrize("cores, workers, expected", [
+    (6, 4, [2, 2, 1, 1]),
+    (8, 2, [4, 4]),
+    (1, 1, [1]),
+    (3, 3, [1, 1, 1]),
+    (7, 1, [7]),
+])
+def test_partition_threads(cores, workers, expected):
+    threads = partition_threads(cores, workers)
+    assert threads == expected
+    assert sum(threads) == cores and max(threads) - min(threads) <= 1
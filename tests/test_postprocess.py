@@ -0,0 +1,32 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from postprocess import PostProcessor
+
+
+def _logits(labels, num_classes=7):
+    """One-hot logits whose argmax is labels (N, H, W)."""
+    return torch.nn.functional.one_hot(labels, num_classes).permute(0, 3, 1, 2).float()
+
+
+def test_results_survive_the_next_batch():
+    post = PostProcessor(torch.device("cpu"), refine=lambda labels: labels, max_batch=2)
+    first = torch.randint(0, 7, (2, 16, 16))
+    results = post.run(_logits(first))
+    expected = [result["mask"].copy() for result in results]
+    post.run(_logits((first + 1) % 7))  # Reuses the same device buffers
+    for result, mask in zip(results, expected):
+        assert (result["mask"] == mask).all()
+    assert (results[0]["mask"] == first[0].numpy()).all()
+
+
+def test_fractions_and_flags():
+    post = PostProcessor(torch.device("cpu"), refine=lambda labels: labels, flag_classes={5: 0.25})
+    labels = torch.zeros((2, 4, 4), dtype=torch.long)
+    labels[0, :2] = 5   # Half agriculture
+    labels[1, 0, 0] = 5  # One pixel
+    results = post.run(_logits(labels))
+    assert results[0]["fractions"][5] == pytest.approx(0.5)
+    assert results[1]["fractions"][5] == pytest.approx(1 / 16)
+    assert [r["flagged"] for r in results] == [True, False]
@@ -0,0 +1,24 @@
+import time
+
+from process_control import ProcessExecutor
+
+
+def test_jobs_do_not_wait_for_a_free_worker():
+    executor = ProcessExecutor()
+    started = time.time()
+    jobs = [executor.submit(key, "Start", [("sleep", "sleep 0.5")], delay=0.2) for key in range(40)]
+    for job in jobs:
+        assert job.future.result(timeout=10) is job
+    # 40 jobs of 0.7 s: all at once, not in waves of a fixed pool size
+    assert time.time() - started < 1.5
+    assert all(job.timings[0][1] == 0 for job in jobs)
+
+
+def test_new_job_cancels_the_previous_one_for_its_key():
+    executor = ProcessExecutor()
+    first = executor.submit(1, "Start", [("sleep", "sleep 30")], delay=10.0)
+    second = executor.submit(1, "Stop", [("true", "true")])
+    assert first.future.result(timeout=5).cancelled.is_set()
+    assert first.timings == []
+    assert second.future.result(timeout=5).timings[0][1] == 0
+    executor.shutdown()
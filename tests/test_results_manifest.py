@@ -0,0 +1,75 @@
+import json
+import os
+
+from results_manifest import ResultsManifest, file_fingerprint, MANIFEST_NAME
+
+RESULT = {"fractions": [0.5, 0.0, 0.0, 0.0, 0.0, 0.5, 0.0], "flagged": True}
+
+
+def _frames_dir(tmp_path, names=("a.png", "b.png")):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for name in names:
+        (frames / name).write_bytes(name.encode())
+    return str(frames)
+
+
+def test_resume_keeps_finished_frames(tmp_path):
+    frames = _frames_dir(tmp_path)
+    manifest = ResultsManifest(str(tmp_path), frames, {"backend": "eager"})
+    manifest.record("a.png", 0, RESULT)
+    manifest.record_skip("b.png", 1, "duplicate")
+    resumed = ResultsManifest(str(tmp_path), frames, {"backend": "eager"})
+    assert resumed.done("a.png") and resumed.done("b.png")
+    assert [r["name"] for r in resumed.results()] == ["a.png"]
+
+
+def test_changed_params_start_over(tmp_path):
+    frames = _frames_dir(tmp_path)
+    ResultsManifest(str(tmp_path), frames, {"backend": "eager", "range": (1, 2)}).record("a.png", 0, RESULT)
+    same = ResultsManifest(str(tmp_path), frames, {"backend": "eager", "range": (1, 2)})  # Tuples survive the reload
+    assert same.done("a.png")
+    changed = ResultsManifest(str(tmp_path), frames, {"backend": "int8", "range": (1, 2)})
+    assert not changed.done("a.png")
+    with open(os.path.join(str(tmp_path), MANIFEST_NAME)) as f:
+        assert [json.loads(line)["type"] for line in f] == ["run"]
+
+
+def test_changed_image_is_recomputed_alone(tmp_path):
+    frames = _frames_dir(tmp_path)
+    manifest = ResultsManifest(str(tmp_path), frames, {})
+    manifest.record("a.png", 0, RESULT)
+    manifest.record("b.png", 1, RESULT)
+    with open(os.path.join(frames, "b.png"), "wb") as f:
+        f.write(b"a different, longer image")
+    resumed = ResultsManifest(str(tmp_path), frames, {})
+    assert resumed.done("a.png") and not resumed.done("b.png")
+
+
+def test_changed_video_invalidates_everything(tmp_path):
+    video = tmp_path / "flight.avi"
+    video.write_bytes(b"x" * 100)
+    ResultsManifest(str(tmp_path), str(video), {}).record("frame_000001.png", 0, RESULT)
+    assert ResultsManifest(str(tmp_path), str(video), {}).done("frame_000001.png")
+    video.write_bytes(b"y" * 120)
+    assert not ResultsManifest(str(tmp_path), str(video), {}).done("frame_000001.png")
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    frames = _frames_dir(tmp_path)
+    ResultsManifest(str(tmp_path), frames, {}).record("a.png", 0, RESULT)
+    with open(os.path.join(str(tmp_path), MANIFEST_NAME), "a") as f:
+        f.write('{"type": "frame", "name": "b.p')  # Crash mid-write
+    resumed = ResultsManifest(str(tmp_path), frames, {})
+    assert resumed.done("a.png") and not resumed.done("b.png")
+
+
+def test_fingerprint_sees_same_size_rewrites(tmp_path):
+    path = tmp_path / "model.pt"
+    path.write_bytes(b"a" * 64)
+    before = file_fingerprint(str(path))
+    stat = os.stat(path)
+    path.write_bytes(b"b" * 64)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # Same size and mtime
+    assert file_fingerprint(str(path)) != before
+    assert file_fingerprint(str(tmp_path / "missing")) is None
@@ -0,0 +1,71 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from results_store import ResultsStore, decode_mask, encode_mask
+
+
+@pytest.mark.parametrize("mask", [
+    np.zeros((1, 1), dtype=np.uint8),
+    np.full((4, 6), 5, dtype=np.uint8),
+    np.arange(24, dtype=np.uint8).reshape(4, 6),  # No run longer than one pixel
+    np.random.default_rng(0).integers(0, 7, (32, 48)).astype(np.uint8),
+])
+def test_rle_round_trip(mask):
+    values, lengths = encode_mask(mask)
+    assert values.dtype == np.uint8 and int(lengths.sum()) == mask.size
+    assert np.array_equal(decode_mask(values, lengths, mask.shape), mask)
+
+
+def test_runs_cross_rows():
+    values, lengths = encode_mask(np.full((2, 3), 4, dtype=np.uint8))
+    assert values.tolist() == [4] and lengths.tolist() == [6]
+
+
+def _frame(name, index, lat=None):
+    meta = None if lat is None else {"lat": lat, "lon": 30.0, "alt": 50.0, "capture_time": 1.0, "fix_age": 0.1}
+    return {"name": name, "index": index, "meta": meta}
+
+
+def _result(mask, agriculture):
+    fractions = [0.0] * 7
+    fractions[5], fractions[0] = agriculture, 1.0 - agriculture
+    return {"mask": mask, "fractions": fractions, "flagged": agriculture > 0}
+
+
+def test_store_query_and_masks(tmp_path):
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    store = ResultsStore(str(tmp_path / "store"), chunk_frames=2)
+    committed = []
+    masks = [np.full((4, 4), k, dtype=np.uint8) for k in range(3)]
+    for k, agriculture in enumerate((0.1, 0.5, 0.0)):
+        store.add(str(frames_dir), _frame(f"f{k}.png", k, lat=40.0 + k), _result(masks[k], agriculture),
+                  on_committed=lambda k=k: committed.append(k))
+    assert committed == [0, 1]  # Callbacks only once the chunk is on disk
+    assert len(store.query()) == 2
+    store.flush()
+    assert committed == [0, 1, 2]
+
+    rows = store.query(min_fraction={5: 0.3})
+    assert [row["name"] for row in rows] == ["f1.png"]
+    assert rows[0]["original"].endswith("f1.png") and rows[0]["original_index"] is None
+    assert [row["name"] for row in store.query(bbox=(39.5, 29.0, 41.5, 31.0))] == ["f0.png", "f1.png"]
+    assert [row["name"] for row in store.query(flagged=False)] == ["f2.png"]
+    for row, mask in store.masks(store.query()):
+        assert np.array_equal(mask, masks[row["frame_index"]])
+    store.close()
+
+
+def test_rerun_replaces_the_row_and_reopen_continues_chunks(tmp_path):
+    video = str(tmp_path / "flight.avi")
+    store = ResultsStore(str(tmp_path / "store"), chunk_frames=1)
+    store.add(video, _frame("frame_000001.png", 0), _result(np.zeros((2, 2), dtype=np.uint8), 0.0))
+    store.close()
+    store = ResultsStore(str(tmp_path / "store"), chunk_frames=1)
+    store.add(video, _frame("frame_000001.png", 0), _result(np.full((2, 2), 5, dtype=np.uint8), 1.0))
+    rows = store.query()
+    assert len(rows) == 1 and rows[0]["original_index"] == 0 and rows[0]["lat"] is None
+    (row, mask), = store.masks(rows)
+    assert (mask == 5).all()
+    store.close()
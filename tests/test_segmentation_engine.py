@@ -0,0 +1,33 @@
+import types
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("cv2")
+Image = pytest.importorskip("PIL.Image")
+np = pytest.importorskip("numpy")
+
+from frame_sources import directory_frames
+from segmentation_engine import BatchedSegmenter
+
+
+class _BlankModel:
+    def __call__(self, inputs):
+        return types.SimpleNamespace(logits=torch.zeros((inputs.shape[0], 7, 16, 16)))
+
+
+def test_corrupt_frame_fails_after_the_frames_before_it(tmp_path):
+    for k in range(40):
+        Image.fromarray(np.zeros((32, 32, 3), dtype=np.uint8)).save(tmp_path / f"frame_{k:04d}.png")
+    (tmp_path / "frame_0010.png").write_bytes(b"not a png")
+
+    segmenter = BatchedSegmenter(_BlankModel(), torch.device("cpu"), batch_size=4, workers=2, tta=False,
+                                 refine=lambda labels: labels)
+    names = []
+    try:
+        with pytest.raises(Exception):
+            for frame, _, _ in segmenter.segment(directory_frames(str(tmp_path))):
+                names.append(frame["name"])
+    finally:
+        segmenter.close()
+    assert names == [f"frame_{k:04d}.png" for k in range(10)]
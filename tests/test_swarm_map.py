@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from geo import LocalProjection
+from swarm_map import SwarmMapView, SwarmTracks
+
+
+def _view():
+    # Only the projection state; no Tk window is needed for _project_trail
+    view = SwarmMapView.__new__(SwarmMapView)
+    view.projection = LocalProjection(40.0, 29.0)
+    view.center = (0.0, 0.0)
+    view.px_per_m = 2.0
+    view._trails = {}
+    return view
+
+
+def test_trail_projection_is_extended_and_shifted():
+    tracks = SwarmTracks(trail_length=5, trail_min_step_m=0.0)
+    view, size = _view(), (400, 300)
+    for k in range(12):
+        tracks.record(1, {"latitude": 40.0 + k * 1e-5, "longitude": 29.0}, k)
+        _, _, _, _, trail, appended = tracks.changed_since({})[1]
+        coords = view._project_trail(1, trail, appended, size)
+        full = []
+        for lat, lon in trail:
+            full.extend(view._to_canvas(*view.projection.to_local(lat, lon), size))
+        assert coords == pytest.approx(full)
+    assert len(coords) == 2 * 5
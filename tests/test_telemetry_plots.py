@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+from telemetry_plots import RollingSeries, decimate_minmax
+
+
+def test_minmax_per_bucket():
+    times = [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+    values = [3, 1, 4, 1, 5, 9]
+    assert decimate_minmax(times, values, 0.0, 3.0, 3) == [(0, 1, 3), (1, 1, 4), (2, 5, 9)]
+
+
+def test_empty_buckets_are_left_out():
+    assert decimate_minmax([0.0, 2.9], [1, 2], 0.0, 3.0, 3) == [(0, 1, 1), (2, 2, 2)]
+
+
+def test_samples_before_the_window_are_ignored():
+    assert decimate_minmax([-5.0, 0.5], [100, 7], 0.0, 1.0, 1) == [(0, 7, 7)]
+
+
+@pytest.mark.parametrize("times, t0, t1, buckets", [([], 0.0, 1.0, 4), ([0.5], 0.0, 1.0, 0), ([0.5], 1.0, 1.0, 4)])
+def test_degenerate_input(times, t0, t1, buckets):
+    assert decimate_minmax(times, [1] * len(times), t0, t1, buckets) == []
+
+
+def test_rolling_series_keeps_the_newest_points():
+    series = RollingSeries(max_points=3)
+    for t in range(10):
+        series.append(float(t), t * 10)
+    times, values = series.since(0.0)
+    assert times[-3:] == [7.0, 8.0, 9.0] and values[-1] == 90
+    assert len(times) <= 6
+    assert series.since(8.5) == ([8.5, 9.0], [80, 90])
+
+
+def test_unchanging_value_stays_in_the_window():
+    series = RollingSeries(max_points=10)
+    series.append(0.0, 42.0)  # Never changes again, so no further diffs arrive
+    times, values = series.since(500.0)
+    assert (times, values) == ([500.0], [42.0])
+    assert decimate_minmax(times, values, 500.0, 680.0, 4) == [(0, 42.0, 42.0)]
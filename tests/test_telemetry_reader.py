@@ -0,0 +1,107 @@
+import json
+import multiprocessing.shared_memory as shm
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from telemetry_reader import TelemetryReader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write(segment, telemetry):
+    payload = json.dumps(telemetry).encode()
+    segment.buf[:len(payload) + 1] = payload + b"\x00"
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def telemetry_segment():
+    segment = shm.SharedMemory(name=f"swarmind_test_tel_{os.getpid()}", create=True, size=4096)
+    _write(segment, {"1": {"latitude": 1.0}})
+    yield segment
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@pytest.fixture
+def reader(telemetry_segment):
+    reader = TelemetryReader(telemetry_segment.name, 4096, interval=0.01, reattach_after=0.3)
+    reader.start()
+    yield reader
+    reader.stop()
+    reader.join(timeout=2.0)
+
+
+def test_diffs_carry_only_the_changed_fields(telemetry_segment, reader):
+    assert _wait_for(lambda: reader.snapshot(1))
+    _write(telemetry_segment, {"1": {"latitude": 1.0, "speed": 3.0}, "2": {"yaw": 90.0}})
+    assert _wait_for(lambda: reader.snapshot(2))
+    reader.drain()
+
+    _write(telemetry_segment, {"1": {"latitude": 1.5, "speed": 3.0}, "2": {"yaw": 90.0}})
+    assert _wait_for(lambda: reader.snapshot(1)["latitude"] == 1.5)
+    diffs, present, available = reader.drain()
+    assert diffs == {1: {"latitude": 1.5}}
+    assert present == {1, 2} and available
+
+
+def test_drain_merges_pending_diffs_and_clears_them(telemetry_segment, reader):
+    assert _wait_for(lambda: reader.snapshot(1))
+    _write(telemetry_segment, {"1": {"latitude": 2.0, "speed": 1.0}})
+    assert _wait_for(lambda: reader.snapshot(1).get("speed") == 1.0)
+    _write(telemetry_segment, {"1": {"latitude": 2.0, "speed": 4.0}})
+    assert _wait_for(lambda: reader.snapshot(1)["speed"] == 4.0)
+
+    diffs, _, _ = reader.drain()
+    assert diffs == {1: {"latitude": 2.0, "speed": 4.0}}  # Both updates, newest value wins
+    assert reader.drain()[0] == {}
+
+
+def test_snapshot_is_the_full_latest_state(telemetry_segment, reader):
+    _write(telemetry_segment, {"1": {"latitude": 1.0, "battery_percent": 80}})
+    assert _wait_for(lambda: reader.snapshot(1).get("battery_percent") == 80)
+    _write(telemetry_segment, {"1": {"latitude": 1.0, "battery_percent": 79}})
+    assert _wait_for(lambda: reader.snapshot(1)["battery_percent"] == 79)
+    snapshot = reader.snapshot(1)
+    assert snapshot == {"latitude": 1.0, "battery_percent": 79}
+    snapshot["latitude"] = 0.0  # A copy: the reader's state is not touched
+    assert reader.snapshot(1)["latitude"] == 1.0
+    assert reader.snapshot(7) == {}
+
+
+def test_frozen_segment_is_mapped_again(telemetry_segment, reader):
+    assert _wait_for(lambda: reader.snapshot(1).get("latitude") == 1.0)
+    # The writer restarts: it unlinks its segment and creates a new one under the same name
+    telemetry_segment.unlink()
+    restarted = shm.SharedMemory(name=telemetry_segment.name, create=True, size=4096)
+    try:
+        _write(restarted, {"1": {"latitude": 5.0}})
+        assert _wait_for(lambda: reader.snapshot(1)["latitude"] == 5.0)
+    finally:
+        restarted.close()
+        restarted.unlink()
+
+
+def test_reader_exit_does_not_unlink_the_segment(telemetry_segment):
+    # The drones own the segment: a logger or GUI exiting must leave it in place
+    code = ("import sys; from telemetry_reader import TelemetryReader; "
+            "r = TelemetryReader(sys.argv[1], 4096); assert r._attach(); r._detach()")
+    subprocess.run([sys.executable, "-c", code, telemetry_segment.name], cwd=ROOT, check=True)
+    time.sleep(1.0)  # The child's resource tracker cleans up after the child has exited
+    attached = shm.SharedMemory(name=telemetry_segment.name, create=False)
+    attached.close()
@@ -0,0 +1,21 @@
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from frame_bus import ENCODING_JPEG
+from video_feed import LiveFeedWorker
+
+
+def _jpeg_frame(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (90, 120, 40)).save(buffer, "JPEG")
+    return {"encoding": ENCODING_JPEG, "payload": buffer.getvalue(), "width": width, "height": height}
+
+
+@pytest.mark.parametrize("size", [(320, 180), (160, 240), (640, 480), (100, 100)])
+def test_jpeg_draft_keeps_the_card_resolution(size):
+    image = LiveFeedWorker._decode(_jpeg_frame(1280, 960), size)
+    scale = max(size[0] / 1280, size[1] / 960)
+    assert image.size[0] >= 1280 * scale and image.size[1] >= 960 * scale
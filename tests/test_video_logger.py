@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+import video_logger
+from frame_metadata import FrameMetadata, sidecar_path
+
+
+class _Gps:
+    def covers(self, t):
+        return True
+
+    def sample_at(self, t):
+        return t, -t, 10.0, 0.0, 0.0
+
+
+class _Writer:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame)
+
+    def release(self):
+        pass
+
+
+def test_meta_rows_follow_the_written_frames(tmp_path, monkeypatch):
+    writers = {}
+    monkeypatch.setattr(video_logger, "open_video_writer",
+                        lambda path, codec, fps, size: writers.setdefault(path, _Writer()))
+    recording = video_logger.SegmentedRecording(str(tmp_path / "video"), "XVID", 30, (4, 4), _Gps(),
+                                                segment_frames=3)
+    for capture_number in range(8):
+        if capture_number == 2:
+            continue  # Dropped by the annotate stage: neither numbered nor written
+        recording.add_meta(float(capture_number))
+        recording.write(capture_number)
+    recording.close()
+
+    assert recording.written == recording.numbered == 7
+    for segment, path in enumerate(recording.paths):
+        metadata = FrameMetadata(sidecar_path(path))
+        for local_number, frame in enumerate(writers[path].frames):
+            # The sidecar row of every written frame carries that frame's capture time
+            assert metadata.frame(local_number)["capture_time"] == float(frame)
+        assert len(metadata) == len(writers[path].frames)
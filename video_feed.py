@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import io
+import math
+import threading
+import time
+from PIL import Image, ImageOps
+
+from frame_bus import FrameRingReader, frame_ring_name, ENCODING_JPEG, ENCODING_RAW_BGR
+
+
+class LiveFeedWorker(threading.Thread):
+    """
+    Decodes and downscales the newest frame of every drone card on screen.
+    Each drone keeps only one undisplayed frame: a newer one replaces it
+    (latest-frame-wins) and the replaced one is counted as dropped.
+    """
+
+    def __init__(self, max_fps=15, stale_after=2.0, retry_interval=2.0):
+        super().__init__(name="LiveFeedWorker", daemon=True)
+        self.period = 1.0 / max_fps
+        self.stale_after = stale_after
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._targets = {}       # drone_id -> (width, height) of its card feed
+        self._readers = {}       # drone_id -> FrameRingReader
+        self._next_attach = {}   # drone_id -> time of the next attach attempt
+        self._latest = {}        # drone_id -> PIL image waiting for the UI
+        self._last_frame_time = {}
+        self._stats_by_drone = {}  # drone_id -> {"displayed": n, "dropped": n}
+
+    # ---------- Tk thread API ----------
+    def set_targets(self, targets):
+        with self._lock:
+            self._targets = dict(targets)
+
+    def take(self, drone_id):
+        """Returns the newest undisplayed frame for drone_id (or None) and counts it as displayed."""
+        with self._lock:
+            image = self._latest.pop(drone_id, None)
+            if image is not None:
+                self._stats(drone_id)["displayed"] += 1
+            return image
+
+    def is_live(self, drone_id):
+        with self._lock:
+            return time.time() - self._last_frame_time.get(drone_id, 0.0) < self.stale_after
+
+    def stats_for(self, drone_id):
+        with self._lock:
+            return dict(self._stats(drone_id))
+
+    def stop(self):
+        self._stop_event.set()
+
+    # ---------- worker ----------
+    def _stats(self, drone_id):
+        return self._stats_by_drone.setdefault(drone_id, {"displayed": 0, "dropped": 0})
+
+    def _reader(self, drone_id, now):
+        reader = self._readers.get(drone_id)
+        if reader is None and now >= self._next_attach.get(drone_id, 0.0):
+            try:
+                reader = self._readers[drone_id] = FrameRingReader(frame_ring_name(drone_id))
+            except (FileNotFoundError, ValueError):
+                self._next_attach[drone_id] = now + self.retry_interval
+        return reader
+
+    @staticmethod
+    def _decode(frame, size):
+        if frame["encoding"] == ENCODING_JPEG:
+            image = Image.open(io.BytesIO(frame["payload"]))
+            # fit() crops to the card's aspect, so the limiting side has to keep the card's size
+            scale = max(size[0] / frame["width"], size[1] / frame["height"])
+            # Let libjpeg downscale while decoding (by 1/2, 1/4 or 1/8, never below the requested size)
+            image.draft("RGB", (math.ceil(frame["width"] * scale), math.ceil(frame["height"] * scale)))
+            return image.convert("RGB")
+        if frame["encoding"] == ENCODING_RAW_BGR:
+            return Image.frombuffer("RGB", (frame["width"], frame["height"]), frame["payload"], "raw", "BGR", 0, 1)
+        raise ValueError(f"unknown frame encoding {frame['encoding']}")
+
+    def run(self):
+        while not self._stop_event.is_set():
+            started = time.time()
+            with self._lock:
+                targets = dict(self._targets)
+            for drone_id, size in targets.items():
+                reader = self._reader(drone_id, started)
+                if reader is None:
+                    continue
+                try:
+                    frame, skipped = reader.latest()
+                except Exception as e:
+                    print(f"ERROR: Live feed of Drone {drone_id} lost: {e}")
+                    reader.close()
+                    del self._readers[drone_id]
+                    continue
+                if frame is None:
+                    if started - self._last_frame_time.get(drone_id, 0.0) > self.stale_after:
+                        # Logger may have restarted with a fresh segment; map it again
+                        reader.close()
+                        del self._readers[drone_id]
+                    continue
+                try:
+                    image = ImageOps.fit(self._decode(frame, size), size, Image.Resampling.BILINEAR)
+                except Exception as e:
+                    print(f"ERROR: Could not decode frame {frame['seq']} of Drone {drone_id}: {e}")
+                    continue
+                with self._lock:
+                    stats = self._stats(drone_id)
+                    stats["dropped"] += skipped + (1 if drone_id in self._latest else 0)
+                    self._latest[drone_id] = image
+                    self._last_frame_time[drone_id] = time.time()
+            self._stop_event.wait(max(0.0, self.period - (time.time() - started)))
+        for reader in self._readers.values():
+            reader.close()
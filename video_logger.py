@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from frame_bus import FrameRingWriter, frame_ring_name, ENCODING_JPEG, ANALYSIS_RING_SLOTS
+from frame_metadata import SidecarWriter, sidecar_path
+from gps_cache import BusGpsFeed
+from swarm_manifest import load_swarm_manifest
+from telemetry_reader import TelemetryReader
+from video_pipeline import VideoPipeline
+
+# Tek süreçte N drone'un videosunu kaydeden servis.
+# Drone listesi drone*_config.ini manifestinden gelir; konumlar drone betiklerinin
+# zaten yayınladığı telemetri veriyolundan okunur (logger ayrı MAVSDK bağlantısı açmaz).
+# Her drone'un yakalama/yazı aşamaları kendi iş parçacıklarında, kodlama ise ortak
+# bir iş parçacığı havuzunda çalışır; üçüncü bir drone yeni bir süreç eklemez.
+
+CONFIG_DIR = "~/Masaüstü/SP-494"
+OUTPUT_DIR = "/home/arda/Masaüstü/SP-494/Video_Output"
+INPUT_VIDEO = "/home/arda/Masaüstü/SP-494/Video_Output/Models_video_02.mp4"  # Manifestte Video anahtarı yoksa
+OUTPUT_NAME = "output_video_with_gps_{id}"
+TELEMETRY_SHM_NAME = "telemetry_shared"
+TELEMETRY_SHM_SIZE = 4096
+
+FPS = 30
+FLIGHT_DURATION = 30     # Hareket başladıktan sonraki kayıt süresi (s)
+MOTION_THRESHOLD = 0.5   # Kaydı başlatan yatay hız (m/s)
+PREVIEW_WIDTH = 640      # GUI kartı için yayınlanan canlı önizleme genişliği
+PREVIEW_JPEG_QUALITY = 80
+QUEUE_SIZE = 16          # Aşamalar arası kuyruk boyu (kare)
+STATS_INTERVAL = 5.0     # Aşama istatistiklerinin yazdırılma aralığı (s)
+BURN_IN_GPS = True       # GPS yazısını kareye bas; konum her durumda <video>.meta dosyasına yazılır
+# Akış modu (double_eye.sh stream): örneklenen kareler segmentasyon işçisine paylaşımlı bellekle aktarılır
+STREAM_ANALYSIS = os.environ.get("SWARMIND_STREAM") == "1"
+ANALYSIS_FPS = float(os.environ.get("SWARMIND_ANALYSIS_FPS", "2"))
+ANALYSIS_WIDTH = 1280
+ANALYSIS_JPEG_QUALITY = 92
+# Ekran yoksa (veya HEADLESS=1) imshow önizlemesi atlanır
+SHOW_PREVIEW = os.environ.get("HEADLESS") != "1" and bool(os.environ.get("DISPLAY"))
+
+# Kodek adı -> (denenecek FourCC'ler, uzantı)
+#   MJPG / raw: en az CPU, H264: en az disk, XVID: eski varsayılan
+CODECS = {
+    "XVID": (("XVID",), ".avi"),
+    "MJPG": (("MJPG",), ".avi"),
+    "raw": ((None,), ".avi"),  # Sıkıştırmasız
+    "H264": (("avc1", "H264", "mp4v"), ".mp4"),
+}
+
+
+def publish_jpeg(ring, frame, size, quality, frame_number, capture_time, lat, lon, alt, backpressure=False):
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA) if size != (frame.shape[1], frame.shape[0]) else frame
+    ok, jpeg = cv2.imencode(".jpg", small, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if ok:
+        ring.publish(jpeg, size[0], size[1], 3, ENCODING_JPEG, frame_number=frame_number,
+                     timestamp=capture_time, lat=lat, lon=lon, alt=alt, backpressure=backpressure)
+
+
+def open_video_writer(path, codec, fps, size):
+    fourccs, _ = CODECS[codec]
+    for fourcc in fourccs:
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc) if fourcc else 0, fps, size)
+        if writer.isOpened():
+            return writer
+        writer.release()
+    raise RuntimeError(f"'{codec}' kodeki ile video yazılamıyor: {path}")
+
+
+class SegmentedRecording:
+    """
+    Video dosyası + <video>.meta yan dosyası, isteğe bağlı parçalama ile.
+    segment_frames verilirse her parça ayrı dosyadır (<base>_part001.avi ...) ve
+    kendi meta dosyasında parça içi kare numaralarını taşır; keep_segments
+    verilirse en eski parçalar silinir (döngüsel kayıt).
+      add_meta(t) -> kare no.            yazı aşamasında, kodlamaya giden her kare için bir kez
+      write(frame)                       kodlama havuzunda, sırayla
+      flush()                            ana döngüde
+    Video ve meta satırları aynı sayaçtan numaralanır: add_meta kareye video
+    içindeki sırasını verir, write aynı sırayla yazar. Yazı aşamasında düşen
+    kare iki tarafta da sayılmaz, böylece meta satırları kaymaz.
+    """
+
+    def __init__(self, base_path, codec, fps, size, gps, segment_frames=None, keep_segments=None):
+        self.base_path = base_path
+        self.codec = codec
+        self.fps = fps
+        self.size = size
+        self.gps = gps
+        self.segment_frames = segment_frames
+        self.keep_segments = keep_segments
+        self.written = 0
+        self.numbered = 0  # add_meta ile numara alan kareler
+        self.paths = []
+        self.meta_rows = 0
+        self._writer = None
+        self._writer_segment = None
+        self._sidecars = {}  # parça -> (SidecarWriter, ilk karesinin yakalanma zamanı)
+        self._sidecar_lock = threading.Lock()
+
+    def segment_path(self, segment):
+        extension = CODECS[self.codec][1]
+        if not self.segment_frames:
+            return self.base_path + extension
+        return f"{self.base_path}_part{segment + 1:03d}{extension}"
+
+    def _split(self, frame_number):
+        if not self.segment_frames:
+            return 0, frame_number
+        return divmod(frame_number, self.segment_frames)
+
+    def write(self, frame):
+        segment, _ = self._split(self.written)
+        if segment != self._writer_segment:
+            if self._writer is not None:
+                self._writer.release()
+            path = self.segment_path(segment)
+            self._writer = open_video_writer(path, self.codec, self.fps, self.size)
+            self._writer_segment = segment
+            self.paths.append(path)
+            if self.keep_segments and len(self.paths) > self.keep_segments:
+                self._remove(self.paths.pop(0))
+        try:
+            self._writer.write(frame)
+        finally:
+            self.written += 1  # Kodlama hatasında da: numara add_meta'da verildi
+
+    @staticmethod
+    def _remove(path):
+        for old in (path, sidecar_path(path)):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def add_meta(self, capture_time):
+        frame_number = self.numbered
+        self.numbered += 1
+        segment, local_number = self._split(frame_number)
+        with self._sidecar_lock:
+            if segment not in self._sidecars:
+                self._sidecars[segment] = (SidecarWriter(sidecar_path(self.segment_path(segment)), self.gps), capture_time)
+            sidecar = self._sidecars[segment][0]
+        sidecar.add(local_number, capture_time)
+        return frame_number
+
+    def flush(self, force=False):
+        with self._sidecar_lock:
+            sidecars = sorted(self._sidecars.items())
+        if not sidecars:
+            return
+        newest, (_, newest_opened) = sidecars[-1]
+        for segment, (sidecar, _) in sidecars:
+            sidecar.flush(force)
+            # Önceki parçanın bekleyen satırları en geç max_wait sonra yazılmış olur; dosya kapanır
+            if segment != newest and time.time() - newest_opened > sidecar.max_wait:
+                self._close_sidecar(segment, sidecar)
+
+    def _close_sidecar(self, segment, sidecar):
+        sidecar.close()
+        self.meta_rows += sidecar.rows
+        with self._sidecar_lock:
+            self._sidecars.pop(segment, None)
+
+    def close(self):
+        with self._sidecar_lock:
+            sidecars = sorted(self._sidecars.items())
+        for segment, (sidecar, _) in sidecars:
+            self._close_sidecar(segment, sidecar)
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+
+class DroneRecorder:
+    """Bir drone'un kaydı: kaynak -> GPS yazısı + GUI/analiz halkaları -> parçalı dosya."""
+
+    def __init__(self, drone_id, source, output_base, gps, encode_pool, codec="XVID",
+                 segment_frames=None, keep_segments=None, preview=False):
+        self.drone_id = drone_id
+        self.source = source
+        self.output_base = output_base
+        self.gps = gps
+        self.encode_pool = encode_pool
+        self.codec = codec
+        self.segment_frames = segment_frames
+        self.keep_segments = keep_segments
+        self.preview = preview
+        self.state = "waiting"  # waiting -> recording -> finishing -> done
+        self.started_at = None
+        self.pipeline = None
+        self._cap = self._ring = self._analysis = self._recording = None
+        self._last_analysis_time = 0.0
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.output_base) or ".", exist_ok=True)
+        self._cap = cv2.VideoCapture(self.source)
+        if not self._cap.isOpened():
+            print(f"[ERROR] Drone {self.drone_id}: video kaynağı açılamadı: {self.source}")
+            self.state = "done"
+            return False
+        width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._recording = SegmentedRecording(self.output_base, self.codec, FPS, (width, height), self.gps,
+                                             self.segment_frames, self.keep_segments)
+
+        # Canlı önizleme: GUI en yeni kareyi paylaşımlı bellek halkasından okur
+        self._ring = FrameRingWriter(frame_ring_name(self.drone_id))
+        self._ring_size = (PREVIEW_WIDTH, max(1, height * PREVIEW_WIDTH // max(width, 1)))
+        if STREAM_ANALYSIS:
+            self._analysis = FrameRingWriter(frame_ring_name(self.drone_id, "analysis"), slot_count=ANALYSIS_RING_SLOTS)
+            analysis_width = min(ANALYSIS_WIDTH, width)
+            self._analysis_size = (analysis_width, max(1, height * analysis_width // max(width, 1)))
+
+        self.pipeline = VideoPipeline(self._cap.read, self._annotate, self._recording.write,
+                                      queue_size=QUEUE_SIZE, preview=self.preview,
+                                      encode_pool=self.encode_pool, name=f"Drone{self.drone_id}").start()
+        self.started_at = time.time()
+        self.state = "recording"
+        print(f"[INFO] Drone {self.drone_id}: kayıt başladı ({self.codec}, {width}x{height}) -> {self._recording.segment_path(0)}")
+        return True
+
+    # Yazı iş parçacığında çalışır: GPS yazısı + GUI önizleme halkasına yayın + meta kaydı
+    def _annotate(self, frame, frame_number, capture_time):
+        lat, lon, alt, _ = self.gps.latest()
+        # Segmentasyon karesi yazı basılmadan önce alınır; işçi gerideyse yeni kare düşürülür (kayıt etkilenmez)
+        if self._analysis is not None and capture_time - self._last_analysis_time >= 1.0 / ANALYSIS_FPS:
+            publish_jpeg(self._analysis, frame, self._analysis_size, ANALYSIS_JPEG_QUALITY, frame_number,
+                         capture_time, lat, lon, alt, backpressure=True)
+            self._last_analysis_time = capture_time
+        if BURN_IN_GPS:
+            gps_text = f"Lat: {lat:.6f}, Lon: {lon:.6f}, Alt: {alt:.2f}m"
+            cv2.putText(frame, gps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
+                        1, (0, 255, 0), 2, cv2.LINE_AA)
+        publish_jpeg(self._ring, frame, self._ring_size, PREVIEW_JPEG_QUALITY, frame_number, capture_time, lat, lon, alt)
+        # Son adım: buradan sonra hata olmaz, numaralanan kare mutlaka kodlamaya gider
+        self._recording.add_meta(capture_time)
+        return frame
+
+    def stop(self):
+        if self.state == "recording":
+            self.pipeline.stop()  # Kuyruktaki kareler yine de kodlanır
+            self.state = "finishing"
+        elif self.state == "waiting":
+            self.state = "done"
+
+    def poll(self, flight_duration):
+        """Ana döngüden çağrılır; süre dolunca kaydı durdurur, bitince dosyaları kapatır."""
+        if self.state not in ("recording", "finishing"):
+            return
+        if self.state == "recording" and time.time() - self.started_at > flight_duration and not self.pipeline.end_of_stream:
+            print(f"[INFO] Drone {self.drone_id}: belirtilen uçuş süresi doldu.")
+            self.stop()
+        self._recording.flush()
+        if not self.pipeline.running():
+            self._finish()
+
+    def _finish(self):
+        self.pipeline.join()
+        self._recording.close()
+        if self.pipeline.end_of_stream:
+            print(f"[INFO] Drone {self.drone_id}: video kaynağının sonuna ulaşıldı.")
+        print(f"[INFO] Drone {self.drone_id}: {self.pipeline.report()}")
+        print(f"[INFO] Drone {self.drone_id}: {self._recording.written} kare, {len(self._recording.paths)} dosya, "
+              f"{self._recording.meta_rows} meta satırı yazıldı.")
+        self._cap.release()
+        self._ring.close()
+        if self._analysis is not None:
+            print(f"[INFO] Drone {self.drone_id}: akış {self._analysis.count} kare aktardı, "
+                  f"{self._analysis.backpressure_drops} kare işçi geride olduğu için düşürüldü.")
+            self._analysis.close()
+        self.state = "done"
+
+
+def _video_source(entry, default):
+    source = entry.get("video", default)
+    return int(source) if source.isdigit() else source  # Sayı: kamera aygıtı
+
+
+def record(drone_ids, manifest, output_dir, codec, segment_seconds=None, keep_segments=None,
+           flight_duration=FLIGHT_DURATION, wait_for_motion=True, encode_workers=None):
+    reader = TelemetryReader(TELEMETRY_SHM_NAME, TELEMETRY_SHM_SIZE, interval=0.02)
+    feed = BusGpsFeed(reader, drone_ids)
+    reader.start()
+    encode_pool = ThreadPoolExecutor(max_workers=encode_workers or max(2, len(drone_ids)),
+                                     thread_name_prefix="VideoEncode")
+    segment_frames = int(segment_seconds * FPS) if segment_seconds else None
+    recorders = [
+        DroneRecorder(drone_id, _video_source(manifest.get(drone_id, {}), INPUT_VIDEO),
+                      os.path.join(output_dir, OUTPUT_NAME.format(id=drone_id)), feed.histories[drone_id],
+                      encode_pool, codec, segment_frames, keep_segments, preview=SHOW_PREVIEW)
+        for drone_id in drone_ids
+    ]
+    if wait_for_motion:
+        print("[INFO] QGroundControl üzerinden kalkış yapabilirsiniz.")
+        print(f"[INFO] Drone'lar hareket ettiğinde ({MOTION_THRESHOLD} m/s) kayıt otomatik başlatılacak...")
+    if not SHOW_PREVIEW:
+        print("[INFO] Ekran yok, önizleme kapalı.")
+
+    last_report = time.time()
+    try:
+        while any(recorder.state != "done" for recorder in recorders):
+            now = time.time()
+            for recorder in recorders:
+                if recorder.state == "waiting":
+                    speed = feed.speeds[recorder.drone_id]
+                    if not wait_for_motion or speed >= MOTION_THRESHOLD:
+                        if wait_for_motion:
+                            print(f"[INFO] Drone {recorder.drone_id} hareket etti! Hız: {speed:.2f} m/s")
+                        recorder.start()
+                recorder.poll(flight_duration)
+                if SHOW_PREVIEW and recorder.state == "recording":
+                    frame = recorder.pipeline.take_preview()
+                    if frame is not None:
+                        cv2.imshow(f"Drone {recorder.drone_id} - Video with GPS", frame)
+            if SHOW_PREVIEW and cv2.waitKey(1) & 0xFF == ord('q'):
+                print("[INFO] 'q' ile çıkış yapıldı.")
+                for recorder in recorders:
+                    recorder.stop()
+            if now - last_report >= STATS_INTERVAL:
+                for recorder in recorders:
+                    if recorder.state in ("recording", "finishing"):
+                        print(f"[INFO] Drone {recorder.drone_id}: {recorder.pipeline.report()}")
+                last_report = now
+            time.sleep(0.01)
+    except KeyboardInterrupt:
+        print("[INFO] Kesildi, kuyruktaki kareler yazılıyor...")
+        for recorder in recorders:
+            recorder.stop()
+        while any(recorder.state != "done" for recorder in recorders):
+            for recorder in recorders:
+                recorder.poll(flight_duration)
+            time.sleep(0.01)
+    finally:
+        encode_pool.shutdown(wait=True)
+        reader.stop()
+        if SHOW_PREVIEW:
+            cv2.destroyAllWindows()
+    print("[INFO] Video kaydı tamamlandı.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="N drone'un video akışlarını tek süreçte kaydeder.")
+    parser.add_argument("--drones", nargs="+", type=int, default=None,
+                        help="Kaydedilecek drone ID'leri (varsayılan: manifestteki tüm drone'lar)")
+    parser.add_argument("--config-dir", default=CONFIG_DIR, help="drone*_config.ini dosyalarının dizini")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Video ve .meta dosyalarının yazılacağı dizin")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="XVID",
+                        help="MJPG/raw: en az CPU, H264: en az disk")
+    parser.add_argument("--segment-seconds", type=float, default=None,
+                        help="Her N saniyelik videoda yeni bir çıktı dosyası başlat")
+    parser.add_argument("--keep-segments", type=int, default=None,
+                        help="--segment-seconds ile: yalnızca en yeni N dosyayı tut (döngüsel kayıt)")
+    parser.add_argument("--duration", type=float, default=FLIGHT_DURATION, help="Drone başına kayıt süresi (s)")
+    parser.add_argument("--no-wait", action="store_true", help="Hareket beklemeden kayda başla")
+    parser.add_argument("--encode-workers", type=int, default=None,
+                        help="Tüm drone'ların paylaştığı kodlama iş parçacıkları (varsayılan: drone başına bir, en az 2)")
+    args = parser.parse_args(argv)
+
+    manifest = load_swarm_manifest(args.config_dir)
+    drone_ids = args.drones or sorted(manifest)
+    if not drone_ids:
+        print(f"[ERROR] {args.config_dir} altında drone yapılandırması bulunamadı.")
+        return 1
+    missing = [drone_id for drone_id in drone_ids if drone_id not in manifest]
+    if missing:
+        print(f"[WARNING] Manifestte olmayan drone(lar): {missing}; varsayılan video kaynağı kullanılacak.")
+    if args.keep_segments and not args.segment_seconds:
+        print("[WARNING] --keep-segments yalnızca --segment-seconds ile geçerlidir.")
+
+    record(drone_ids, manifest, args.output_dir, args.codec, args.segment_seconds, args.keep_segments,
+           args.duration, not args.no_wait, args.encode_workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
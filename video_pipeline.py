@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import queue
+import threading
+import time
+from collections import deque
+
+_END = object()  # End-of-stream marker passed down the stages
+
+# Queue policies when the next stage is behind:
+#   "block"       wait for room (nothing is lost; used in front of the encoder)
+#   "drop_oldest" discard the oldest queued frame (live capture and preview keep the newest)
+#   "drop_newest" discard the incoming frame
+QUEUE_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.frames = 0
+        self.dropped = 0
+        self.busy = 0.0  # Seconds spent inside the stage function
+        self.started = time.time()
+
+    def fps(self):
+        elapsed = time.time() - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+
+class EncodeLane:
+    """
+    Serial lane on a shared ThreadPoolExecutor: the frames of one writer are
+    written in order, while several writers share the pool's threads instead of
+    owning one each. put() blocks while max_pending frames wait ("block" policy).
+    A lane gives its thread back after `batch` frames so busy writers take turns.
+    """
+
+    def __init__(self, pool, write, max_pending=16, batch=8):
+        self.pool = pool
+        self.write = write
+        self.batch = batch
+        self._pending = deque()
+        self._slots = threading.Semaphore(max_pending)
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def put(self, item):
+        self._slots.acquire()
+        with self._lock:
+            self._pending.append(item)
+            self._idle.clear()
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.pool.submit(self._drain)
+
+    def _drain(self):
+        for _ in range(self.batch):
+            with self._lock:
+                if not self._pending:
+                    self._scheduled = False
+                    self._idle.set()
+                    return
+                item = self._pending.popleft()
+            self._slots.release()
+            self.write(item)
+        with self._lock:
+            if not self._pending:
+                self._scheduled = False
+                self._idle.set()
+                return
+        self.pool.submit(self._drain)  # Back of the pool queue, still scheduled
+
+    def qsize(self):
+        return len(self._pending)
+
+    def busy(self):
+        return not self._idle.is_set()
+
+    def join(self, timeout=None):
+        return self._idle.wait(timeout)
+
+
+class VideoPipeline:
+    """
+    capture -> annotate -> encode, each on its own thread and connected by
+    bounded queues, plus an optional latest-frame preview slot that the
+    caller's (main) thread shows with imshow. The caller's asyncio loop stays
+    free for MAVSDK telemetry while frames are processed.
+
+      read_frame()                          -> (ok, frame), e.g. cap.read
+      annotate(frame, frame_number, t)      -> frame to encode
+      write_frame(frame)                    -> e.g. out.write
+
+    With encode_pool (a ThreadPoolExecutor shared by several pipelines) the
+    encode stage runs as an EncodeLane on the pool instead of its own thread.
+    """
+
+    def __init__(self, read_frame, annotate, write_frame, queue_size=16,
+                 capture_policy="block", preview=False, encode_pool=None, name="Video"):
+        if capture_policy not in QUEUE_POLICIES:
+            raise ValueError(f"unknown queue policy '{capture_policy}'")
+        self.read_frame = read_frame
+        self.annotate = annotate
+        self.write_frame = write_frame
+        self.capture_policy = capture_policy
+        self.preview = preview
+
+        self.capture_queue = queue.Queue(maxsize=queue_size)  # capture -> annotate
+        self.encode_queue = queue.Queue(maxsize=queue_size)   # annotate -> encode
+        self.preview_queue = queue.Queue(maxsize=1)           # annotate -> caller, newest only
+        self.stats = {name: StageStats(name) for name in ("capture", "annotate", "encode", "preview")}
+        self.end_of_stream = False  # True when read_frame ran out, False when stopped by the caller
+        self._stop_capture = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._capture, name=f"{name}Capture", daemon=True),
+            threading.Thread(target=self._annotate, name=f"{name}Annotate", daemon=True),
+        ]
+        self._lane = None
+        if encode_pool is not None:
+            self._lane = EncodeLane(encode_pool, self._write, max_pending=queue_size)
+        else:
+            self._threads.append(threading.Thread(target=self._encode, name=f"{name}Encode", daemon=True))
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stops capturing; frames already queued are still annotated and encoded."""
+        self._stop_capture.set()
+
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads) or (self._lane is not None and self._lane.busy())
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._lane is not None:
+            self._lane.join(timeout)
+
+    def take_preview(self):
+        """Returns the newest annotated frame not shown yet, or None."""
+        try:
+            frame = self.preview_queue.get_nowait()
+        except queue.Empty:
+            return None
+        self.stats["preview"].frames += 1
+        return frame
+
+    def report(self):
+        parts = []
+        for name, stats in self.stats.items():
+            if name == "preview" and not self.preview:
+                continue
+            part = f"{name} {stats.fps():.1f} fps"
+            if stats.dropped:
+                part += f" ({stats.dropped} dropped)"
+            parts.append(part)
+        encode_depth = self._lane.qsize() if self._lane is not None else self.encode_queue.qsize()
+        return ", ".join(parts) + f" | queues capture {self.capture_queue.qsize()}, encode {encode_depth}"
+
+    # ---------- stages ----------
+    @staticmethod
+    def _put(q, item, policy, stats):
+        if policy == "block" or item is _END:
+            q.put(item)
+            return
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            stats.dropped += 1
+        if policy == "drop_oldest":
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            q.put(item)
+
+    def _capture(self):
+        stats = self.stats["capture"]
+        frame_number = 0
+        try:
+            while not self._stop_capture.is_set():
+                started = time.time()
+                ok, frame = self.read_frame()
+                if not ok:
+                    self.end_of_stream = True
+                    break
+                stats.busy += time.time() - started
+                stats.frames += 1
+                self._put(self.capture_queue, (frame_number, started, frame), self.capture_policy, stats)
+                frame_number += 1
+        except Exception as e:
+            print(f"[ERROR] Capture stage failed: {e}")
+        finally:
+            self._put(self.capture_queue, _END, "block", stats)
+
+    def _annotate(self):
+        stats = self.stats["annotate"]
+        while True:
+            item = self.capture_queue.get()
+            if item is _END:
+                break
+            frame_number, capture_time, frame = item
+            started = time.time()
+            try:
+                frame = self.annotate(frame, frame_number, capture_time)
+            except Exception as e:
+                print(f"[ERROR] Annotate stage failed on frame {frame_number}: {e}")
+                continue
+            stats.busy += time.time() - started
+            stats.frames += 1
+            if self._lane is not None:
+                self._lane.put(frame)
+            else:
+                self._put(self.encode_queue, frame, "block", stats)
+            if self.preview:
+                self._put(self.preview_queue, frame, "drop_oldest", self.stats["preview"])
+        if self._lane is None:
+            self._put(self.encode_queue, _END, "block", stats)
+
+    def _encode(self):
+        while True:
+            frame = self.encode_queue.get()
+            if frame is _END:
+                break
+            self._write(frame)
+
+    def _write(self, frame):
+        stats = self.stats["encode"]
+        started = time.time()
+        try:
+            self.write_frame(frame)
+        except Exception as e:
+            print(f"[ERROR] Encode stage failed: {e}")
+            return
+        stats.busy += time.time() - started
+        stats.frames += 1
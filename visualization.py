@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Segmentation output images without matplotlib. Masks are colorized through a
+# palette lookup table, the input | mask | legend panel is composed with NumPy
+# and OpenCV around a legend strip rendered once, and files are written on a
+# background thread pool.
+#   off    no images (agriculture originals are still saved)
+#   masks  palette-mode PNG of the mask (<name>_mask.png); the palette is the colour map
+#   full   input | refined mask | legend panel (<name>_viz.png)
+
+VISUALIZATION_MODES = ("off", "masks", "full")
+TITLE_HEIGHT = 40
+LEGEND_WIDTH = 220
+
+
+def build_palette(label_colors):
+    """(256, 3) uint8 lookup table; unknown labels stay black."""
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    for cls_id, color in label_colors.items():
+        palette[cls_id] = color
+    return palette
+
+
+def render_legend(label_colors, label_names, height):
+    legend = np.full((height, LEGEND_WIDTH, 3), 255, dtype=np.uint8)
+    cv2.putText(legend, "Legend", (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2, cv2.LINE_AA)
+    row = 36
+    top = max(TITLE_HEIGHT + 10, (height - row * len(label_colors)) // 2)
+    for k, (cls_id, color) in enumerate(label_colors.items()):
+        y = top + k * row
+        cv2.rectangle(legend, (12, y), (40, y + 24), tuple(int(c) for c in color), -1)
+        cv2.rectangle(legend, (12, y), (40, y + 24), (0, 0, 0), 1)
+        cv2.putText(legend, label_names[cls_id], (52, y + 19), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1, cv2.LINE_AA)
+    return legend
+
+
+def _titled(image, title):
+    header = np.full((TITLE_HEIGHT, image.shape[1], 3), 255, dtype=np.uint8)
+    cv2.putText(header, title, (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2, cv2.LINE_AA)
+    return np.vstack([header, image])
+
+
+class Visualizer:
+    """
+    save(...) queues the colorizing and file writes and returns right away; the
+    arrays passed in must not be reused by the caller. It blocks once
+    max_pending frames are waiting, so a slow disk holds back inference instead
+    of filling memory. close() waits for the pending writes.
+    """
+
+    def __init__(self, label_colors, label_names, mode="full", workers=2, size=512, max_pending=16):
+        if mode not in VISUALIZATION_MODES:
+            raise ValueError(f"unknown visualization mode '{mode}'")
+        self.mode = mode
+        self.size = size
+        self.palette = build_palette(label_colors)
+        self._palette_flat = self.palette.flatten().tolist()
+        self.legend = render_legend(label_colors, label_names, size + TITLE_HEIGHT)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Visualize")
+        self.written = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def colorize(self, mask):
+        return self.palette[mask]
+
+    def compose(self, image_rgb, mask, image_name):
+        """input | mask | legend panel as one RGB array."""
+        return np.hstack([_titled(image_rgb, f"Input: {image_name}"),
+                          _titled(self.colorize(mask), "Refined Prediction"),
+                          self.legend])
+
+    def save(self, image_name, image_rgb, mask, output_dir, save_original=None,
+             agriculture_detect_dir=None, frames_original_dir=None, agriculture=False, on_written=None):
+        """
+        image_rgb: uint8 (H, W, 3) network input, mask: uint8 labels at any
+        resolution (upsampled with nearest neighbour to the output size here).
+        Agriculture frames get their image copied to agriculture_detect_dir and
+        their original saved to frames_original_dir. on_written() runs on the
+        writer thread once every file of the frame is on disk.
+        """
+        self._slots.acquire()
+        return self.pool.submit(self._write, image_name, image_rgb, mask, output_dir, save_original,
+                                agriculture_detect_dir, frames_original_dir, agriculture, on_written)
+
+    def _write(self, image_name, image_rgb, mask, output_dir, save_original,
+               agriculture_detect_dir, frames_original_dir, agriculture, on_written):
+        stem = os.path.splitext(image_name)[0]
+        save_path = None
+        try:
+            if self.mode != "off" and mask.shape != (self.size, self.size):
+                mask = cv2.resize(mask, (self.size, self.size), interpolation=cv2.INTER_NEAREST)
+            if self.mode == "full":
+                save_path = os.path.join(output_dir, f"{stem}_viz.png")
+                panel = self.compose(image_rgb, mask, image_name)
+                cv2.imwrite(save_path, cv2.cvtColor(panel, cv2.COLOR_RGB2BGR))
+            elif self.mode == "masks":
+                save_path = os.path.join(output_dir, f"{stem}_mask.png")
+                image = Image.fromarray(mask)  # putpalette turns the "L" image into "P"
+                image.putpalette(self._palette_flat)
+                image.save(save_path)
+            if save_path is not None:
+                print(f"[INFO] Kayıt yapıldı: {save_path}")
+            if agriculture and agriculture_detect_dir is not None and frames_original_dir is not None:
+                if save_path is not None:
+                    shutil.copy(save_path, os.path.join(agriculture_detect_dir, os.path.basename(save_path)))
+                if save_original is not None:
+                    save_original(frames_original_dir)
+            self.written += 1
+            if on_written is not None:
+                on_written()
+        except Exception as e:
+            print(f"[ERROR] Could not write the outputs of {image_name}: {e}")
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self.pool.shutdown(wait=True)